@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark exact pairwise dedupe against MinHash/LSH dedupe.
+
+Builds a synthetic batch of Reddit items (default 10,000) in which ~10% are
+lightly edited copies of other titles, then runs dedupe.find_duplicates in
+both modes and reports time and how many exact pairs the LSH mode found.
+
+Usage:
+    python3 benchmarks/bench_dedupe.py [--items N] [--skip-exact]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import dedupe, schema
+
+WORDS = (
+    "claude code skills agent prompt model release update python rust api "
+    "workflow cursor editor bug fix benchmark latency memory cache reddit "
+    "thread launch review tutorial guide open source local llm gpu token "
+    "context window plugin terminal feature request pricing plan team "
+    "database schema migration docker kubernetes deploy server client "
+    "browser extension mobile app android ios design system component "
+    "react vue svelte typescript javascript golang java kotlin swift "
+    "startup funding hiring remote salary interview career advice "
+    "security vulnerability patch exploit privacy policy license "
+    "performance regression profiling trace metrics dashboard alert "
+    "question answer discussion opinion announcement roadmap changelog"
+).split()
+
+
+def make_items(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    titles = []
+    for i in range(n):
+        if titles and rng.random() < 0.1:
+            base = rng.choice(titles).split()
+            # Light edit: drop or append a word
+            if len(base) > 4 and rng.random() < 0.5:
+                base.pop(rng.randrange(len(base)))
+            else:
+                base.append(rng.choice(WORDS))
+            titles.append(" ".join(base))
+        else:
+            titles.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 12))))
+    return [
+        schema.RedditItem(id=f"R{i}", title=t, url="", subreddit="", score=100 - i % 100)
+        for i, t in enumerate(titles)
+    ]
+
+
+def timed(method, items):
+    start = time.perf_counter()
+    pairs = dedupe.find_duplicates(items, method=method)
+    return pairs, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--skip-exact", action="store_true")
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    print(f"{len(items)} items")
+
+    lsh_pairs, lsh_time = timed("minhash", items)
+    print(f"minhash  {lsh_time:8.2f} s  {len(lsh_pairs)} pairs")
+
+    if not args.skip_exact:
+        exact_pairs, exact_time = timed("exact", items)
+        found = len(set(lsh_pairs) & set(exact_pairs))
+        print(f"exact    {exact_time:8.2f} s  {len(exact_pairs)} pairs")
+        print(f"recall   {found}/{len(exact_pairs)}, speedup {exact_time / lsh_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark pooled keep-alive requests against one-connection-per-request.
+
+Starts a local stand-in server and issues a --deep sized run of Reddit-style
+GETs (default 100) through lib.http, first with fresh connections via
+urllib.request.urlopen (the old behavior) and then through the shared pool.
+
+Usage:
+    python3 benchmarks/bench_http_pool.py [--requests N] [--workers N]
+        [--handshake-ms MS] [--cert CERT --key KEY]
+
+--handshake-ms adds a delay to every new connection to model the TCP+TLS
+round trips of a real remote host. --cert/--key serve HTTPS instead of HTTP.
+"""
+
+import argparse
+import json
+import ssl
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import http
+
+PAYLOAD = json.dumps([{"kind": "Listing", "data": {"children": []}}] * 20).encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    handshake_delay = 0.0
+    connections = 0
+    tls_context = None
+
+    def get_request(self):
+        sock, addr = super().get_request()
+        self.connections += 1
+        return sock, addr
+
+    def finish_request(self, request, client_address):
+        # Runs in the per-connection thread, so the delay doesn't serialize accepts
+        if self.handshake_delay:
+            time.sleep(self.handshake_delay)
+        if self.tls_context:
+            request = self.tls_context.wrap_socket(request, server_side=True)
+        super().finish_request(request, client_address)
+
+
+def run(label, fetch, urls, workers, server):
+    server.connections = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(fetch, urls))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed * 1000:8.1f} ms  {server.connections:4d} connections")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--handshake-ms", type=float, default=0.0)
+    parser.add_argument("--cert")
+    parser.add_argument("--key")
+    args = parser.parse_args()
+
+    server = Server(("127.0.0.1", 0), Handler)
+    server.handshake_delay = args.handshake_ms / 1000
+    scheme = "http"
+    client_context = None
+    if args.cert:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(args.cert, args.key)
+        server.tls_context = context
+        scheme = "https"
+        client_context = ssl.create_default_context(cafile=args.cert)
+        http._ssl_context = client_context
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    port = server.server_address[1]
+    urls = [f"{scheme}://127.0.0.1:{port}/r/test/comments/{i}/thread.json" for i in range(args.requests)]
+
+    def fresh(url):
+        req = urllib.request.Request(url, headers={"User-Agent": http.USER_AGENT})
+        with urllib.request.urlopen(req, timeout=30, context=client_context) as response:
+            return json.loads(response.read())
+
+    def pooled(url):
+        return http.get(url)
+
+    # Local benchmark: don't let the Reddit rate limiter dominate the timings
+    http.RATE_LIMITS.clear()
+
+    print(f"{args.requests} GETs, {args.workers} workers, {args.handshake_ms:.0f} ms handshake, {scheme}")
+    run("urlopen", fresh, urls, args.workers, server)
+    run("pooled", pooled, urls, args.workers, server)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Measure memory held by normalized items and peak RSS of a --deep run.
+
+Two measurements:
+
+1. Synthetic: build N raw Reddit and X item dicts shaped like enriched API
+   output, normalize them, drop the raw dicts, and report the memory still
+   held by the normalized items (tracemalloc) plus the process peak RSS.
+2. CLI: run `last30days.py <topic> --mock --deep --emit=compact` in a child
+   process and report its peak RSS.
+
+Usage:
+    python3 benchmarks/bench_memory.py [--items N] [--skip-cli]
+"""
+
+import argparse
+import gc
+import random
+import resource
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from lib import dates, normalize
+
+SUBREDDITS = ["ClaudeAI", "LocalLLaMA", "programming", "Python", "MachineLearning", "webdev"]
+HANDLES = [f"user{i}" for i in range(200)]
+
+
+def make_raw(n: int, seed: int = 5):
+    rng = random.Random(seed)
+    day_strs = [dates.get_date_range(d)[0] for d in range(0, 31)]
+    reddit, x = [], []
+    for i in range(n):
+        reddit.append({
+            "id": f"R{i}",
+            "title": f"Thread about topic number {i} with some words",
+            # Fresh string objects, as json.loads would produce
+            "subreddit": "".join(rng.choice(SUBREDDITS)),
+            "date": "".join(rng.choice(day_strs)),
+            "url": f"https://www.reddit.com/r/x/comments/{i:x}/slug/",
+            "engagement": {"score": rng.randint(0, 5000), "num_comments": rng.randint(0, 500), "upvote_ratio": 0.9},
+            "top_comments": [
+                {"score": rng.randint(0, 300), "date": "".join(rng.choice(day_strs)),
+                 "author": "".join(rng.choice(HANDLES)), "excerpt": "a comment excerpt", "url": ""}
+                for _ in range(3)
+            ],
+            "comment_insights": ["insight one", "insight two"],
+            "relevance": rng.random(),
+            "why_relevant": "mentions the topic",
+        })
+        x.append({
+            "id": f"X{i}",
+            "text": f"Post about topic number {i} with some words",
+            "url": f"https://x.com/u/status/{i}",
+            "author_handle": "".join(rng.choice(HANDLES)),
+            "date": "".join(rng.choice(day_strs)),
+            "engagement": {"likes": rng.randint(0, 9000), "reposts": rng.randint(0, 900),
+                           "replies": rng.randint(0, 300), "quotes": rng.randint(0, 50)},
+            "relevance": rng.random(),
+            "why_relevant": "mentions the topic",
+        })
+    return reddit, x
+
+
+def synthetic(n: int):
+    from_date, to_date = dates.get_date_range(30)
+    raw_reddit, raw_x = make_raw(n)
+    gc.collect()
+    tracemalloc.start()
+    reddit = normalize.normalize_reddit_items(raw_reddit, from_date, to_date)
+    x = normalize.normalize_x_items(raw_x, from_date, to_date)
+    _, peak = tracemalloc.get_traced_memory()
+    del raw_reddit, raw_x
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"synthetic n={n:,}: normalized items hold {held / 2**20:.1f} MiB "
+          f"(peak during normalize {peak / 2**20:.1f} MiB), process peak RSS {rss_mb:.1f} MiB")
+    return reddit, x
+
+
+def cli():
+    cmd = [sys.executable, str(SCRIPTS_DIR / "last30days.py"), "benchmark topic",
+           "--mock", "--deep", "--emit=compact", "--no-cache"]
+    subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    rss_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(f"cli --mock --deep: child peak RSS {rss_mb:.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=50_000)
+    parser.add_argument("--skip-cli", action="store_true")
+    args = parser.parse_args()
+    if not args.skip_cli:
+        cli()
+    synthetic(args.items)
+
+
+if __name__ == "__main__":
+    main()
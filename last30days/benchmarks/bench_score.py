@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark per-item scoring against the columnar batch scoring path.
+
+Builds synthetic Reddit and X items (default 10,000 and 100,000) with dates
+spread over the 30-day window and a mix of missing engagement, scores them
+with the original per-item loop and with score.score_*_items, checks that
+every subscore and score matches, and reports timings.
+
+Usage:
+    python3 benchmarks/bench_score.py [--items N ...]
+"""
+
+import argparse
+import copy
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import dates, schema, score
+
+
+def make_items(n: int, seed: int = 11):
+    rng = random.Random(seed)
+    day_strs = [dates.get_date_range(d)[0] for d in range(0, 31)]
+    reddit, x = [], []
+    for i in range(n):
+        date = rng.choice(day_strs + [None])
+        conf = rng.choice(["high", "med", "low"])
+        rel = round(rng.random(), 2)
+        eng = None
+        if rng.random() > 0.1:
+            eng = schema.Engagement(
+                score=rng.randint(0, 5000), num_comments=rng.randint(0, 800),
+                upvote_ratio=round(rng.uniform(0.5, 1.0), 2),
+            )
+        reddit.append(schema.RedditItem(
+            id=f"R{i}", title="t", url="", subreddit="s", date=date,
+            date_confidence=conf, engagement=eng, relevance=rel,
+        ))
+        eng = None
+        if rng.random() > 0.1:
+            eng = schema.Engagement(
+                likes=rng.randint(0, 20000), reposts=rng.randint(0, 3000),
+                replies=rng.randint(0, 900), quotes=rng.choice([None, rng.randint(0, 100)]),
+            )
+        x.append(schema.XItem(
+            id=f"X{i}", text="t", url="", author_handle="h", date=date,
+            date_confidence=conf, engagement=eng, relevance=rel,
+        ))
+    return reddit, x
+
+
+def score_per_item(items, raw_fn):
+    """The original per-item scoring loop, kept as the reference."""
+    eng_raw = [raw_fn(item.engagement) for item in items]
+    eng_normalized = score.normalize_to_100(eng_raw)
+    for i, item in enumerate(items):
+        rel_score = int(item.relevance * 100)
+        rec_score = dates.recency_score(item.date)
+        eng_score = int(eng_normalized[i]) if eng_normalized[i] is not None else score.DEFAULT_ENGAGEMENT
+        item.subs = schema.SubScores(relevance=rel_score, recency=rec_score, engagement=eng_score)
+        overall = (
+            score.WEIGHT_RELEVANCE * rel_score +
+            score.WEIGHT_RECENCY * rec_score +
+            score.WEIGHT_ENGAGEMENT * eng_score
+        )
+        if eng_raw[i] is None:
+            overall -= score.UNKNOWN_ENGAGEMENT_PENALTY
+        if item.date_confidence == "low":
+            overall -= 5
+        elif item.date_confidence == "med":
+            overall -= 2
+        item.score = max(0, min(100, int(overall)))
+    return items
+
+
+def timed(fn, items):
+    start = time.perf_counter()
+    fn(items)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    for n in args.items:
+        reddit, x = make_items(n)
+        for label, items, raw_fn, batch_fn in (
+            ("reddit", reddit, score.compute_reddit_engagement_raw, score.score_reddit_items),
+            ("x", x, score.compute_x_engagement_raw, score.score_x_items),
+        ):
+            ref = copy.deepcopy(items)
+            ref_ms = timed(lambda its: score_per_item(its, raw_fn), ref)
+            batch_ms = timed(batch_fn, items)
+            same = all(
+                a.score == b.score and a.subs == b.subs for a, b in zip(ref, items)
+            )
+            print(f"{label:6s} n={n:>7,}  per-item {ref_ms:8.1f} ms  batch {batch_ms:8.1f} ms  "
+                  f"speedup {ref_ms / batch_ms:4.1f}x  identical={same}")
+
+
+if __name__ == "__main__":
+    main()
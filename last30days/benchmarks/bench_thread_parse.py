@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark full vs trimmed Reddit thread fetch/parse.
+
+Builds a synthetic thread listing (default 2,000 top-level comments, each
+with a chain of replies) and compares:
+
+- full:    the whole listing, parse_thread_data() then get_top_comments()
+- trimmed: what Reddit returns for reddit_enrich.THREAD_FETCH_PARAMS
+           (top-level only, best first, limited), parsed with top_k
+
+Reports payload bytes and json.loads + parse time, and checks that both
+paths select the same top comments.
+
+Usage:
+    python3 benchmarks/bench_thread_parse.py [--comments N] [--replies N]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import reddit_enrich
+
+
+def make_comment(rng, i, depth, replies):
+    data = {
+        "id": f"c{i}_{depth}",
+        "score": rng.randint(-20, 3000),
+        "created_utc": 1768478400 + i,
+        "author": rng.choice(["[deleted]"] + [f"user{n}" for n in range(50)]),
+        "body": "Some comment text that says something useful about the topic. " * rng.randint(1, 6),
+        "permalink": f"/r/a/comments/t/x/c{i}_{depth}/",
+        "replies": "",
+    }
+    if depth < replies:
+        data["replies"] = {"kind": "Listing", "data": {"children": [make_comment(rng, i, depth + 1, replies)]}}
+    return {"kind": "t1", "data": data}
+
+
+def make_thread(comments, replies, seed=3):
+    rng = random.Random(seed)
+    submission = {"kind": "Listing", "data": {"children": [{"kind": "t3", "data": {
+        "score": 1200, "num_comments": comments * (replies + 1), "upvote_ratio": 0.95,
+        "created_utc": 1768478400, "permalink": "/r/a/comments/t/x/", "title": "Thread", "selftext": "",
+    }}]}}
+    children = [make_comment(rng, i, 0, replies) for i in range(comments)]
+    full = [submission, {"kind": "Listing", "data": {"children": children}}]
+
+    # Server-side trim: sort=top, depth=1, limit
+    top = sorted(children, key=lambda c: c["data"]["score"], reverse=True)
+    top = top[:reddit_enrich.THREAD_FETCH_PARAMS["limit"]]
+    top = [{"kind": "t1", "data": dict(c["data"], replies="")} for c in top]
+    trimmed = [submission, {"kind": "Listing", "data": {"children": top}}]
+    return json.dumps(full).encode(), json.dumps(trimmed).encode()
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--comments", type=int, default=2000)
+    parser.add_argument("--replies", type=int, default=3)
+    args = parser.parse_args()
+
+    full_bytes, trimmed_bytes = make_thread(args.comments, args.replies)
+
+    def full_path():
+        parsed = reddit_enrich.parse_thread_data(json.loads(full_bytes))
+        return reddit_enrich.get_top_comments(parsed["comments"])
+
+    def trimmed_path():
+        parsed = reddit_enrich.parse_thread_data(json.loads(trimmed_bytes), top_k=reddit_enrich.TOP_COMMENTS)
+        return reddit_enrich.get_top_comments(parsed["comments"])
+
+    full_top, full_ms = timed(full_path)
+    trimmed_top, trimmed_ms = timed(trimmed_path)
+
+    print(f"full:    {len(full_bytes) / 1024:9.1f} KiB  {full_ms:7.2f} ms")
+    print(f"trimmed: {len(trimmed_bytes) / 1024:9.1f} KiB  {trimmed_ms:7.2f} ms")
+    print(f"same top comments: {full_top == trimmed_top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,15 +12,41 @@ Options:
     --quick             Faster research with fewer sources (8-12 each)
     --deep              Comprehensive research with more sources (50-70 Reddit, 40-60 X)
     --debug             Enable verbose debug logging
+    --enrich-workers=N  Concurrent Reddit thread fetches (default: 8)
+    --enrich-max-items=N
+                        Max full Reddit thread fetches, highest priority first (default: 30)
+    --enrich-time-budget=SECONDS
+                        Stop starting Reddit thread fetches after this long
+    --stream            Stream OpenAI/xAI responses; start Reddit thread fetches as items arrive
+    --hedge             Send a duplicate of slow Reddit thread fetches (tail-latency hedging)
+    --budget=SECONDS    Overall time budget; skips optional phases and marks the report partial
+    --refresh           Bypass the report cache and fetch fresh data
+    --no-cache          Don't read or write the report cache
+    --stale-while-revalidate
+                        Serve a stale cached report and refresh it in the background
+    --incremental       Only fetch items newer than the topic's last run and merge them into it
+    --history           Record engagement snapshots; use engagement velocity in scoring
+    --batch=FILE        Research every topic in FILE (one per line or NDJSON; - for stdin)
+    --batch-concurrency=N
+                        Topics researched at once in batch mode (default: 4)
+    --out-dir=DIR       Parent directory for per-topic batch/service outputs
+    --serve=[HOST:]PORT Run as a local JSON research service (see SPEC.md)
 """
 
 import argparse
+import hashlib
 import json
 import os
+import re
+import subprocess
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
 
 # Add lib to path
 SCRIPT_DIR = Path(__file__).parent.resolve()
@@ -28,18 +54,24 @@ sys.path.insert(0, str(SCRIPT_DIR))
 
 from lib import (
     bird_x,
+    budget,
+    cache,
     dates,
     dedupe,
     entity_extract,
     env,
+    history,
     http,
+    incremental,
     models,
     normalize,
     openai_reddit,
     reddit_enrich,
     render,
+    runstate,
     schema,
     score,
+    service,
     ui,
     websearch,
     xai_x,
@@ -55,6 +87,46 @@ def load_fixture(name: str) -> dict:
     return {}
 
 
+# Phase 1 Reddit fallbacks: retry with the core subject below this many
+# items, then try a subreddit-targeted query below the second threshold
+CORE_RETRY_BELOW = 5
+SUBREDDIT_FALLBACK_BELOW = 3
+
+# Topics researched at once in --batch mode
+BATCH_CONCURRENCY = 4
+
+# --serve listens on localhost unless given HOST:PORT
+SERVICE_HOST = "127.0.0.1"
+
+
+def _speculate(fn, *args) -> Future:
+    """Start fn(*args) on a daemon thread and return its Future.
+
+    Unlike an executor thread, an abandoned speculative call does not hold
+    up interpreter exit.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=runstate.bind(run), daemon=True).start()
+    return future
+
+
+def _merge_by_url(reddit_items: list, new_items: list):
+    """Append items whose URL isn't already in reddit_items."""
+    existing_urls = {item.get("url") for item in reddit_items}
+    for item in new_items:
+        if item.get("url") not in existing_urls:
+            reddit_items.append(item)
+
+
 def _search_reddit(
     topic: str,
     config: dict,
@@ -63,15 +135,43 @@ def _search_reddit(
     to_date: str,
     depth: str,
     mock: bool,
+    on_item=None,
 ) -> tuple:
     """Search Reddit via OpenAI (runs in thread).
 
+    With on_item, the primary search is streamed and on_item is called
+    with each item as it arrives (see openai_reddit.search_reddit).
+
+    If the primary search comes back thin, retries with the core subject
+    and then a subreddit-targeted query. For verbose topics, which are
+    likely to come back thin, those fallback queries start at the same
+    time as the primary. Their results are used only if the primary
+    turns out thin, so the items returned are the same either way.
+
     Returns:
         Tuple of (reddit_items, raw_openai, error)
     """
     raw_openai = None
     reddit_error = None
 
+    def search(query):
+        raw = openai_reddit.search_reddit(
+            config["OPENAI_API_KEY"],
+            selected_models["openai"],
+            query,
+            from_date, to_date,
+            depth=depth,
+        )
+        return openai_reddit.parse_reddit_response(raw)
+
+    core = openai_reddit._extract_core_subject(topic)
+    core_future = None
+    sub_future = None
+    if not mock and openai_reddit._likely_thin_topic(topic) and budget.allows("fallback"):
+        if core.lower() != topic.lower():
+            core_future = _speculate(search, core)
+        sub_future = _speculate(search, openai_reddit._build_subreddit_query(topic))
+
     if mock:
         raw_openai = load_fixture("openai_sample.json")
     else:
@@ -83,6 +183,7 @@ def _search_reddit(
                 from_date,
                 to_date,
                 depth=depth,
+                on_item=on_item,
             )
         except http.HTTPError as e:
             raw_openai = {"error": str(e)}
@@ -94,45 +195,40 @@ def _search_reddit(
     # Parse response
     reddit_items = openai_reddit.parse_reddit_response(raw_openai or {})
 
+    if mock or reddit_error:
+        # Fallbacks never run after an error; drop any speculative ones
+        for future in (core_future, sub_future):
+            if future:
+                future.cancel()
+        return reddit_items, raw_openai, reddit_error
+
+    def fallback_allowed(future):
+        # Already-running speculative queries are collected; new ones need budget
+        if future or budget.allows("fallback"):
+            return True
+        budget.mark_partial("Reddit fallback searches skipped (run budget)")
+        return False
+
     # Quick retry with simpler query if few results
-    if len(reddit_items) < 5 and not mock and not reddit_error:
-        core = openai_reddit._extract_core_subject(topic)
-        if core.lower() != topic.lower():
-            try:
-                retry_raw = openai_reddit.search_reddit(
-                    config["OPENAI_API_KEY"],
-                    selected_models["openai"],
-                    core,
-                    from_date, to_date,
-                    depth=depth,
-                )
-                retry_items = openai_reddit.parse_reddit_response(retry_raw)
-                # Add items not already found (by URL)
-                existing_urls = {item.get("url") for item in reddit_items}
-                for item in retry_items:
-                    if item.get("url") not in existing_urls:
-                        reddit_items.append(item)
-            except Exception:
-                pass
-
-    # Subreddit-targeted fallback if still < 3 results
-    if len(reddit_items) < 3 and not mock and not reddit_error:
-        sub_query = openai_reddit._build_subreddit_query(topic)
+    if (len(reddit_items) < CORE_RETRY_BELOW and core.lower() != topic.lower()
+            and fallback_allowed(core_future)):
         try:
-            sub_raw = openai_reddit.search_reddit(
-                config["OPENAI_API_KEY"],
-                selected_models["openai"],
-                sub_query,
-                from_date, to_date,
-                depth=depth,
-            )
-            sub_items = openai_reddit.parse_reddit_response(sub_raw)
-            existing_urls = {item.get("url") for item in reddit_items}
-            for item in sub_items:
-                if item.get("url") not in existing_urls:
-                    reddit_items.append(item)
+            retry_items = core_future.result() if core_future else search(core)
+            _merge_by_url(reddit_items, retry_items)
+        except Exception:
+            pass
+    elif core_future:
+        core_future.cancel()
+
+    # Subreddit-targeted fallback if still too few results
+    if len(reddit_items) < SUBREDDIT_FALLBACK_BELOW and fallback_allowed(sub_future):
+        try:
+            sub_items = sub_future.result() if sub_future else search(openai_reddit._build_subreddit_query(topic))
+            _merge_by_url(reddit_items, sub_items)
         except Exception:
             pass
+    elif sub_future:
+        sub_future.cancel()
 
     return reddit_items, raw_openai, reddit_error
 
@@ -146,11 +242,13 @@ def _search_x(
     depth: str,
     mock: bool,
     x_source: str = "xai",
+    on_item=None,
 ) -> tuple:
     """Search X via Bird CLI or xAI (runs in thread).
 
     Args:
         x_source: 'bird' or 'xai' - which backend to use
+        on_item: Stream the xAI response, calling this with each item
 
     Returns:
         Tuple of (x_items, raw_response, error)
@@ -193,6 +291,7 @@ def _search_x(
             from_date,
             to_date,
             depth=depth,
+            on_item=on_item,
         )
     except http.HTTPError as e:
         raw_response = {"error": str(e)}
@@ -206,127 +305,301 @@ def _search_x(
     return x_items, raw_response, x_error
 
 
-def _run_supplemental(
+def _comment_targets(reddit_items: list, from_date: str, to_date: str, limit: int) -> list:
+    """Indexes of the items that will rank in the top `limit` of the report.
+
+    Runs the same normalize/date-filter/score/sort steps as main() on
+    throwaway copies. Engagement and dates are already current from the
+    bulk refresh at this point, so the ranking matches the final one
+    apart from dedupe.
+    """
+    normalized = normalize.normalize_reddit_items(reddit_items, from_date, to_date)
+    index_of = {id(item): i for i, item in enumerate(normalized)}
+    in_range = normalize.filter_by_date_range(normalized, from_date, to_date)
+    ranked = score.sort_items(score.score_reddit_items(in_range))
+    return [index_of[id(item)] for item in ranked[:limit]]
+
+
+def _enrich_reddit(
+    reddit_items: list,
+    mock: bool,
+    progress: ui.ProgressDisplay = None,
+    max_workers: int = reddit_enrich.DEFAULT_WORKERS,
+    from_date: str = None,
+    to_date: str = None,
+    comment_limit: int = reddit_enrich.COMMENT_FETCH_LIMIT,
+    max_items: Optional[int] = reddit_enrich.DEFAULT_MAX_ITEMS,
+    time_budget: Optional[float] = reddit_enrich.DEFAULT_TIME_BUDGET,
+) -> list:
+    """Enrich Reddit items with real engagement data in two tiers.
+
+    Tier 1 refreshes engagement and dates for every item with bulk
+    /api/info requests (100 posts each). Tier 2 fetches full threads
+    (for comments) for the top `comment_limit` items by score and for
+    any item the bulk request missed. Mock runs, or calls without a date
+    range, make every item a tier 2 candidate.
+
+    Tier 2 candidates are fetched on a bounded pool in priority order
+    (model relevance + recency, see score.priority_scores). Fetching stops
+    at max_items or time_budget. Candidates skipped by the budget that have
+    no engagement from tier 1 get engagement=None, so scoring applies the
+    unknown-engagement penalty; if the max_items cap left any, the run is
+    marked partial.
+
+    Items are updated in place and keep their original order. A failure on
+    one item leaves that item unenriched without affecting the others.
+
+    Args:
+        reddit_items: Raw Reddit item dicts (modified in place)
+        mock: Use the fixture thread instead of fetching
+        progress: Optional progress display
+        max_workers: Maximum concurrent thread fetches
+        from_date: Start of the research window (for ranking)
+        to_date: End of the research window (for ranking)
+        comment_limit: Items that get a full thread fetch for comments
+        max_items: Maximum full thread fetches (None for no limit)
+        time_budget: Seconds after which no new fetches start (None for no limit)
+
+    Returns:
+        List of enriched item dicts, in input order
+    """
+    info = {}
+    if mock or not from_date or not to_date:
+        candidates = list(range(len(reddit_items)))
+    else:
+        info = reddit_enrich.refresh_engagement(reddit_items)
+        missed = [
+            i for i, item in enumerate(reddit_items)
+            if reddit_enrich.extract_post_id(item.get("url", "")) not in info
+        ]
+        candidates = list(set(_comment_targets(reddit_items, from_date, to_date, comment_limit)) | set(missed))
+
+    # Highest priority first; ties keep discovery order
+    priority = score.priority_scores(reddit_items)
+    candidates.sort(key=lambda i: (-priority[i], i))
+    targets = candidates if max_items is None else candidates[:max(0, max_items)]
+    skipped = candidates[len(targets):]
+    capped = set(skipped)
+    timed_out = 0
+
+    total = len(targets)
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+
+    if progress and total:
+        progress.start_reddit_enrich(1, total)
+
+    def enrich(item):
+        if deadline is not None and time.monotonic() >= deadline:
+            return None  # Out of time; leave the item as is
+        if mock:
+            mock_thread = load_fixture("reddit_thread_sample.json")
+            return reddit_enrich.enrich_reddit_item(item, mock_thread)
+        enriched = reddit_enrich.enrich_reddit_item(item)
+        # Bulk info is fresher than a possibly cached thread
+        post_id = reddit_enrich.extract_post_id(item.get("url", ""))
+        if post_id in info:
+            reddit_enrich.apply_submission(enriched, info[post_id])
+        return enriched
+
+    # The pool's queue is FIFO, so fetches start in priority order
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(runstate.bind(enrich), reddit_items[i]): i
+            for i in targets
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            try:
+                result = future.result()
+                if result is None:
+                    skipped.append(i)
+                    timed_out += 1
+                else:
+                    reddit_items[i] = result
+            except Exception as e:
+                # Log but don't crash - keep the unenriched item
+                if progress:
+                    progress.show_error(f"Enrich failed for {reddit_items[i].get('url', 'unknown')}: {e}")
+            if progress and done < total:
+                progress.update_reddit_enrich(done + 1, total)
+
+    if progress and total:
+        progress.end_reddit_enrich()
+
+    if timed_out and budget.remaining() is not None:
+        budget.mark_partial("Reddit enrichment cut short (run budget)")
+
+    # Over budget: mark engagement unknown unless tier 1 already has it
+    unenriched = 0
+    unenriched_capped = 0
+    for i in skipped:
+        if reddit_enrich.extract_post_id(reddit_items[i].get("url", "")) not in info:
+            reddit_items[i]["engagement"] = None
+            unenriched += 1
+            unenriched_capped += i in capped
+    if unenriched_capped:
+        budget.mark_partial(
+            f"Reddit enrichment capped at {max_items} threads ({unenriched_capped} items without engagement)"
+        )
+    http.log(f"Reddit enrichment: {total - timed_out} of {len(candidates)} thread fetches made, "
+             f"{unenriched} items left unenriched")
+    reddit_enrich.log_cache_stats()
+    http.log_hedge_stats()
+
+    return list(reddit_items)
+
+
+def _phase2_caps(depth: str) -> tuple:
+    """Depth-dependent Phase 2 caps: (max_entities, count_per_entity)."""
+    if depth == "default":
+        return 3, 3
+    return 5, 5  # deep
+
+
+def _supplement_reddit(
     topic: str,
     reddit_items: list,
-    x_items: list,
     from_date: str,
     to_date: str,
     depth: str,
-    x_source: str,
-    progress: ui.ProgressDisplay = None,
-) -> tuple:
-    """Run Phase 2 supplemental searches based on entities from Phase 1.
-
-    Extracts handles/subreddits from initial results, then runs targeted
-    searches to find additional content the broad search missed.
+) -> list:
+    """Phase 2 for Reddit: search the subreddits that Phase 1 surfaced.
 
     Args:
         topic: Original search topic
         reddit_items: Phase 1 Reddit items (raw dicts)
-        x_items: Phase 1 X items (raw dicts)
         from_date: Start date
         to_date: End date
         depth: Research depth
-        x_source: 'bird' or 'xai'
-        progress: Optional progress display
 
     Returns:
-        Tuple of (supplemental_reddit, supplemental_x)
+        Supplemental Reddit items not already in reddit_items
     """
-    # Depth-dependent caps
-    if depth == "default":
-        max_handles = 3
-        max_subs = 3
-        count_per = 3
-    else:  # deep
-        max_handles = 5
-        max_subs = 5
-        count_per = 5
-
-    # Extract entities from Phase 1 results
-    entities = entity_extract.extract_entities(
-        reddit_items, x_items,
-        max_handles=max_handles,
-        max_subreddits=max_subs,
-    )
+    max_subs, count_per = _phase2_caps(depth)
+    subreddits = entity_extract.extract_entities(reddit_items, [], max_subreddits=max_subs)["reddit_subreddits"]
+    if not subreddits:
+        return []
 
-    has_handles = entities["x_handles"] and x_source == "bird"
-    has_subs = entities["reddit_subreddits"]
+    sys.stderr.write(f"[Phase 2] Drilling into r/{', r/'.join(subreddits[:3])}\n")
+    sys.stderr.flush()
 
-    if not has_handles and not has_subs:
-        return [], []
+    existing_urls = {item.get("url", "") for item in reddit_items}
+    try:
+        raw_reddit = openai_reddit.search_subreddits(subreddits, topic, from_date, to_date, count_per)
+    except Exception as e:
+        sys.stderr.write(f"[Phase 2] Supplemental Reddit error: {e}\n")
+        return []
 
-    parts = []
-    if has_handles:
-        parts.append(f"@{', @'.join(entities['x_handles'][:3])}")
-    if has_subs:
-        parts.append(f"r/{', r/'.join(entities['reddit_subreddits'][:3])}")
-    sys.stderr.write(f"[Phase 2] Drilling into {' + '.join(parts)}\n")
-    sys.stderr.flush()
+    # Filter out URLs already found in Phase 1
+    supplemental = [item for item in raw_reddit if item.get("url", "") not in existing_urls]
+    if supplemental:
+        sys.stderr.write(f"[Phase 2] +{len(supplemental)} Reddit\n")
+        sys.stderr.flush()
+    return supplemental
 
-    supplemental_reddit = []
-    supplemental_x = []
 
-    # Collect existing URLs to avoid adding duplicates before dedupe
-    existing_urls = set()
-    for item in reddit_items:
-        existing_urls.add(item.get("url", ""))
-    for item in x_items:
-        existing_urls.add(item.get("url", ""))
+def _supplement_x(
+    topic: str,
+    x_items: list,
+    from_date: str,
+    depth: str,
+    x_source: str,
+) -> list:
+    """Phase 2 for X: search the handles that Phase 1 surfaced (Bird only).
 
-    # Run supplemental searches in parallel
-    reddit_future = None
-    x_future = None
+    Args:
+        topic: Original search topic
+        x_items: Phase 1 X items (raw dicts)
+        from_date: Start date
+        depth: Research depth
+        x_source: 'bird' or 'xai'
 
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        if has_subs:
-            reddit_future = executor.submit(
-                openai_reddit.search_subreddits,
-                entities["reddit_subreddits"],
-                topic,
-                from_date,
-                to_date,
-                count_per,
-            )
+    Returns:
+        Supplemental X items not already in x_items
+    """
+    if x_source != "bird":
+        return []
 
-        if has_handles:
-            x_future = executor.submit(
-                bird_x.search_handles,
-                entities["x_handles"],
-                topic,
-                from_date,
-                count_per,
-            )
+    max_handles, count_per = _phase2_caps(depth)
+    handles = entity_extract.extract_entities([], x_items, max_handles=max_handles)["x_handles"]
+    if not handles:
+        return []
 
-        if reddit_future:
-            try:
-                raw_reddit = reddit_future.result()
-                # Filter out URLs already found in Phase 1
-                supplemental_reddit = [
-                    item for item in raw_reddit
-                    if item.get("url", "") not in existing_urls
-                ]
-            except Exception as e:
-                sys.stderr.write(f"[Phase 2] Supplemental Reddit error: {e}\n")
+    sys.stderr.write(f"[Phase 2] Drilling into @{', @'.join(handles[:3])}\n")
+    sys.stderr.flush()
 
-        if x_future:
-            try:
-                raw_x = x_future.result()
-                supplemental_x = [
-                    item for item in raw_x
-                    if item.get("url", "") not in existing_urls
-                ]
-            except Exception as e:
-                sys.stderr.write(f"[Phase 2] Supplemental X error: {e}\n")
+    existing_urls = {item.get("url", "") for item in x_items}
+    try:
+        raw_x = bird_x.search_handles(handles, topic, from_date, count_per)
+    except Exception as e:
+        sys.stderr.write(f"[Phase 2] Supplemental X error: {e}\n")
+        return []
 
-    if supplemental_reddit or supplemental_x:
-        sys.stderr.write(
-            f"[Phase 2] +{len(supplemental_reddit)} Reddit, +{len(supplemental_x)} X\n"
-        )
+    supplemental = [item for item in raw_x if item.get("url", "") not in existing_urls]
+    if supplemental:
+        sys.stderr.write(f"[Phase 2] +{len(supplemental)} X\n")
         sys.stderr.flush()
+    return supplemental
+
+
+def _enrich_time_budget(time_budget: Optional[float]) -> Optional[float]:
+    """Enrichment time budget, leaving room in the run budget for Phase 2."""
+    left = budget.remaining()
+    if left is None:
+        return time_budget
+    share = max(0.0, left - budget.PHASE_MIN_SECONDS["phase2"])
+    return share if time_budget is None else min(time_budget, share)
+
+
+def _phase2_allowed() -> bool:
+    if budget.allows("phase2"):
+        return True
+    budget.mark_partial("Phase 2 supplemental search skipped (run budget)")
+    return False
+
+
+def _streamed(label: str, handler=None):
+    """on_item callback for a streamed search.
+
+    Logs when the first item arrives, then passes each item to handler.
+    """
+    start = time.monotonic()
+    seen = 0
+
+    def on_item(item):
+        nonlocal seen
+        seen += 1
+        if seen == 1:
+            http.log(f"{label}: first streamed item after {time.monotonic() - start:.1f}s")
+        if handler:
+            handler(item)
+
+    return on_item
+
+
+def _prefetch_streamed(from_date: str, limit: int):
+    """Streamed Reddit item handler: prefetch threads for the first `limit` in range.
+
+    The model lists its best matches first, so these are the likeliest
+    tier 2 enrichment targets; their fetches overlap the rest of discovery.
+    """
+    started = 0
 
-    return supplemental_reddit, supplemental_x
+    def handle(item):
+        nonlocal started
+        if started >= limit or (item.get("date") and item["date"] < from_date):
+            return
+        if reddit_enrich.prefetch_thread(item["url"]):
+            started += 1
+
+    return handle
+
+
+def _source_down(url: str, mock: bool) -> Optional[str]:
+    """Error message if the URL's host has an open circuit breaker, else None."""
+    if mock or http.host_available(url):
+        return None
+    return f"{urlparse(url).hostname} is failing (circuit open), skipped"
 
 
 def run_research(
@@ -340,23 +613,31 @@ def run_research(
     mock: bool = False,
     progress: ui.ProgressDisplay = None,
     x_source: str = "xai",
+    enrich_workers: int = reddit_enrich.DEFAULT_WORKERS,
+    enrich_max_items: Optional[int] = reddit_enrich.DEFAULT_MAX_ITEMS,
+    enrich_time_budget: Optional[float] = reddit_enrich.DEFAULT_TIME_BUDGET,
+    stream: bool = False,
 ) -> tuple:
     """Run the research pipeline.
 
+    Reddit and X run as two independent chains so neither waits on the
+    other: Reddit search -> enrichment -> subreddit drill-down, and
+    X search -> handle drill-down. Wall time is the slower chain rather
+    than the sum of both.
+
+    With stream, the OpenAI and xAI searches are streamed. Reddit threads
+    are prefetched for enrichment as items arrive, while the search is
+    still running.
+
+    A source whose API host has an open circuit breaker (see
+    http.CircuitBreaker) is skipped with an error instead of being retried.
+
     Returns:
         Tuple of (reddit_items, x_items, web_needed, raw_openai, raw_xai, raw_reddit_enriched, reddit_error, x_error)
 
     Note: web_needed is True when WebSearch should be performed by Claude.
     The script outputs a marker and Claude handles WebSearch in its session.
     """
-    reddit_items = []
-    x_items = []
-    raw_openai = None
-    raw_xai = None
-    raw_reddit_enriched = []
-    reddit_error = None
-    x_error = None
-
     # Check if WebSearch is needed (always needed in web-only mode)
     web_needed = sources in ("all", "web", "reddit-web", "x-web")
 
@@ -365,99 +646,137 @@ def run_research(
         if progress:
             progress.start_web_only()
             progress.end_web_only()
-        return reddit_items, x_items, True, raw_openai, raw_xai, raw_reddit_enriched, reddit_error, x_error
+        return [], [], True, None, None, [], None, None
 
     # Determine which searches to run
     run_reddit = sources in ("both", "reddit", "all", "reddit-web")
     run_x = sources in ("both", "x", "all", "x-web")
 
-    # Run Reddit and X searches in parallel
-    reddit_future = None
-    x_future = None
+    # Phase 2 is skipped on --quick (speed matters) and mock mode
+    run_phase2 = depth != "quick" and not mock
 
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        # Submit both searches
-        if run_reddit:
+    # Streaming only applies to live API searches
+    stream = stream and not mock
+
+    def reddit_chain():
+        reddit_items, raw_openai, reddit_error, raw_enriched = [], None, None, []
+        reddit_error = _source_down(openai_reddit.OPENAI_RESPONSES_URL, mock)
+        if reddit_error:
             if progress:
-                progress.start_reddit()
-            reddit_future = executor.submit(
-                _search_reddit, topic, config, selected_models,
-                from_date, to_date, depth, mock
+                progress.show_error(f"Reddit error: {reddit_error}")
+                progress.end_reddit(0)
+            return reddit_items, raw_openai, reddit_error, raw_enriched
+        on_item = None
+        if stream:
+            prefetch_limit = reddit_enrich.COMMENT_FETCH_LIMIT
+            if enrich_max_items is not None:
+                prefetch_limit = min(prefetch_limit, enrich_max_items)
+            on_item = _streamed("Reddit", _prefetch_streamed(from_date, prefetch_limit))
+        try:
+            reddit_items, raw_openai, reddit_error = _search_reddit(
+                topic, config, selected_models, from_date, to_date, depth, mock, on_item
             )
-
-        if run_x:
+            if reddit_error and progress:
+                progress.show_error(f"Reddit error: {reddit_error}")
+        except Exception as e:
+            reddit_error = f"{type(e).__name__}: {e}"
             if progress:
-                progress.start_x()
-            x_future = executor.submit(
-                _search_x, topic, config, selected_models,
-                from_date, to_date, depth, mock, x_source
+                progress.show_error(f"Reddit error: {e}")
+        if progress:
+            progress.end_reddit(len(reddit_items))
+
+        # Enrich as soon as discovery is done (concurrent, per-item error handling)
+        if reddit_items and not budget.allows("enrichment"):
+            budget.mark_partial("Reddit enrichment skipped (run budget)")
+        elif reddit_items and _source_down(reddit_enrich.INFO_URL, mock):
+            budget.mark_partial("Reddit enrichment skipped (reddit.com failing)")
+        elif reddit_items:
+            raw_enriched = _enrich_reddit(
+                reddit_items, mock, progress, enrich_workers, from_date, to_date,
+                max_items=enrich_max_items, time_budget=_enrich_time_budget(enrich_time_budget),
             )
-
-        # Collect results
-        if reddit_future:
-            try:
-                reddit_items, raw_openai, reddit_error = reddit_future.result()
-                if reddit_error and progress:
-                    progress.show_error(f"Reddit error: {reddit_error}")
-            except Exception as e:
-                reddit_error = f"{type(e).__name__}: {e}"
+        if stream:
+            unused = reddit_enrich.discard_prefetched()
+            if unused:
+                http.log(f"Reddit: {unused} prefetched threads went unused")
+        if reddit_items and run_phase2 and _phase2_allowed():
+            reddit_items.extend(_supplement_reddit(topic, reddit_items, from_date, to_date, depth))
+        return reddit_items, raw_openai, reddit_error, raw_enriched
+
+    def x_chain():
+        x_items, raw_xai, x_error = [], None, None
+        if x_source == "xai":
+            x_error = _source_down(xai_x.XAI_RESPONSES_URL, mock)
+            if x_error:
                 if progress:
-                    progress.show_error(f"Reddit error: {e}")
-            if progress:
-                progress.end_reddit(len(reddit_items))
-
-        if x_future:
-            try:
-                x_items, raw_xai, x_error = x_future.result()
-                if x_error and progress:
                     progress.show_error(f"X error: {x_error}")
-            except Exception as e:
-                x_error = f"{type(e).__name__}: {e}"
-                if progress:
-                    progress.show_error(f"X error: {e}")
+                    progress.end_x(0)
+                return x_items, raw_xai, x_error
+        try:
+            x_items, raw_xai, x_error = _search_x(
+                topic, config, selected_models, from_date, to_date, depth, mock, x_source,
+                _streamed("X") if stream else None,
+            )
+            if x_error and progress:
+                progress.show_error(f"X error: {x_error}")
+        except Exception as e:
+            x_error = f"{type(e).__name__}: {e}"
             if progress:
-                progress.end_x(len(x_items))
-
-    # Enrich Reddit items with real data (sequential, but with error handling per-item)
-    if reddit_items:
+                progress.show_error(f"X error: {e}")
         if progress:
-            progress.start_reddit_enrich(1, len(reddit_items))
+            progress.end_x(len(x_items))
 
-        for i, item in enumerate(reddit_items):
-            if progress and i > 0:
-                progress.update_reddit_enrich(i + 1, len(reddit_items))
+        if x_items and run_phase2 and _phase2_allowed():
+            x_items.extend(_supplement_x(topic, x_items, from_date, depth, x_source))
+        return x_items, raw_xai, x_error
 
-            try:
-                if mock:
-                    mock_thread = load_fixture("reddit_thread_sample.json")
-                    reddit_items[i] = reddit_enrich.enrich_reddit_item(item, mock_thread)
-                else:
-                    reddit_items[i] = reddit_enrich.enrich_reddit_item(item)
-            except Exception as e:
-                # Log but don't crash - keep the unenriched item
-                if progress:
-                    progress.show_error(f"Enrich failed for {item.get('url', 'unknown')}: {e}")
+    reddit_items, raw_openai, reddit_error, raw_reddit_enriched = [], None, None, []
+    x_items, raw_xai, x_error = [], None, None
 
-            raw_reddit_enriched.append(reddit_items[i])
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        reddit_future = None
+        x_future = None
+        if run_reddit:
+            if progress:
+                progress.start_reddit()
+            reddit_future = executor.submit(runstate.bind(reddit_chain))
+        if run_x:
+            if progress:
+                progress.start_x()
+            x_future = executor.submit(runstate.bind(x_chain))
 
-        if progress:
-            progress.end_reddit_enrich()
-
-    # Phase 2: Supplemental search based on entities from Phase 1
-    # Skip on --quick (speed matters) and mock mode
-    if depth != "quick" and not mock and (reddit_items or x_items):
-        sup_reddit, sup_x = _run_supplemental(
-            topic, reddit_items, x_items,
-            from_date, to_date, depth, x_source, progress,
-        )
-        if sup_reddit:
-            reddit_items.extend(sup_reddit)
-        if sup_x:
-            x_items.extend(sup_x)
+        if reddit_future:
+            reddit_items, raw_openai, reddit_error, raw_reddit_enriched = reddit_future.result()
+        if x_future:
+            x_items, raw_xai, x_error = x_future.result()
 
     return reddit_items, x_items, web_needed, raw_openai, raw_xai, raw_reddit_enriched, reddit_error, x_error
 
 
+def _spawn_background_refresh():
+    """Re-run this command detached with --refresh to update the cache."""
+    argv = []
+    skip_next = False
+    for arg in sys.argv[1:]:
+        if skip_next:
+            skip_next = False
+        elif arg == "--emit":
+            skip_next = True
+        elif arg != "--stale-while-revalidate" and not arg.startswith("--emit="):
+            argv.append(arg)
+    argv += ["--refresh", "--emit=path"]
+    try:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve())] + argv,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        sys.stderr.write(f"[CACHE] Background refresh failed to start: {e}\n")
+
+
 def main():
     # Fix Unicode output on Windows (cp1252 can't encode emoji)
     if sys.platform == "win32":
@@ -501,6 +820,69 @@ def main():
         action="store_true",
         help="Include general web search alongside Reddit/X (lower weighted)",
     )
+    parser.add_argument(
+        "--enrich-workers",
+        type=int,
+        default=reddit_enrich.DEFAULT_WORKERS,
+        metavar="N",
+        help=f"Concurrent Reddit thread fetches during enrichment (default: {reddit_enrich.DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--enrich-max-items",
+        type=int,
+        default=reddit_enrich.DEFAULT_MAX_ITEMS,
+        metavar="N",
+        help=f"Max full Reddit thread fetches, highest priority first (default: {reddit_enrich.DEFAULT_MAX_ITEMS})",
+    )
+    parser.add_argument(
+        "--enrich-time-budget",
+        type=float,
+        default=reddit_enrich.DEFAULT_TIME_BUDGET,
+        metavar="SECONDS",
+        help="Stop starting Reddit thread fetches after this many seconds",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream OpenAI/xAI search responses and start Reddit enrichment as items arrive",
+    )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Duplicate Reddit thread fetches slower than the recent p95 and use the first response",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Bypass the report cache and fetch fresh data",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or write the report cache",
+    )
+    parser.add_argument(
+        "--stale-while-revalidate",
+        action="store_true",
+        help="Serve a stale cached report immediately and refresh it in the background",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch items newer than the topic's last run and merge them into it",
+    )
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="Record engagement snapshots per item and use engagement velocity in scoring",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Overall time budget; optional phases are skipped and the report is marked partial when it runs short",
+    )
     parser.add_argument(
         "--days",
         type=int,
@@ -510,8 +892,37 @@ def main():
         help="Number of days to look back (1-30, default: 30)",
     )
 
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Research every topic in FILE (one per line, or NDJSON objects; - for stdin) in one process",
+    )
+    parser.add_argument(
+        "--batch-concurrency",
+        type=int,
+        default=BATCH_CONCURRENCY,
+        metavar="N",
+        help=f"Topics researched at once in --batch mode (default: {BATCH_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--out-dir",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Where --batch/--serve write one report directory per topic (default: <output dir>/batch or /service)",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="[HOST:]PORT",
+        help="Run a long-lived local research service with a JSON API instead of one topic",
+    )
+
     args = parser.parse_args()
 
+    # Start the run budget before any network call (model selection included)
+    budget.start(args.budget)
+    http.set_hedging(args.hedge)
+
     # Enable debug logging if requested
     if args.debug:
         os.environ["LAST30DAYS_DEBUG"] = "1"
@@ -519,6 +930,14 @@ def main():
         from lib import http as http_module
         http_module.DEBUG = True
 
+    # Fresh or uncached runs shouldn't reuse cached thread data either
+    if args.refresh or args.no_cache:
+        reddit_enrich.THREAD_CACHE_TTL_MINUTES = 0
+
+    if args.incremental and args.no_cache:
+        print("Error: --incremental needs the cache (drop --no-cache)", file=sys.stderr)
+        sys.exit(1)
+
     # Determine depth
     if args.quick and args.deep:
         print("Error: Cannot use both --quick and --deep", file=sys.stderr)
@@ -530,75 +949,258 @@ def main():
     else:
         depth = "default"
 
+    if args.serve:
+        if args.topic or args.batch:
+            print("Error: --serve takes no topic or --batch", file=sys.stderr)
+            sys.exit(1)
+        if args.budget is not None or args.stale_while_revalidate:
+            print("Error: --budget and --stale-while-revalidate are not supported with --serve", file=sys.stderr)
+            sys.exit(1)
+        host, _, port = args.serve.rpartition(":")
+        try:
+            address = (host or SERVICE_HOST, int(port))
+        except ValueError:
+            print(f"Error: Invalid --serve address: {args.serve}", file=sys.stderr)
+            sys.exit(1)
+        run_service(RunContext(args), address, depth, args.out_dir or render.OUTPUT_DIR / "service")
+        return
+
+    if args.batch:
+        if args.topic:
+            print("Error: Give either a topic or --batch, not both", file=sys.stderr)
+            sys.exit(1)
+        if args.stale_while_revalidate:
+            print("Error: --stale-while-revalidate is not supported with --batch", file=sys.stderr)
+            sys.exit(1)
+        try:
+            entries = read_batch(args.batch)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read batch file: {e}", file=sys.stderr)
+            sys.exit(1)
+        out_dir = args.out_dir or render.OUTPUT_DIR / "batch"
+        failures = run_batch(RunContext(args), entries, depth, out_dir, args.batch_concurrency)
+        sys.exit(1 if failures else 0)
+
     # Validate topic first (matches original NUX)
     if not args.topic:
         print("Error: Please provide a topic to research.", file=sys.stderr)
         print("Usage: python3 last30days.py <topic> [options]", file=sys.stderr)
         sys.exit(1)
 
-    # Load config
-    config = env.get_config()
-
-    # Auto-detect Bird (no prompts - just use it if available)
-    x_source_status = env.get_x_source_status(config)
-    x_source = x_source_status["source"]  # 'bird', 'xai', or None
+    # Load config and auto-detect Bird (no prompts - just use it if available)
+    ctx = RunContext(args)
 
     # Initialize progress display with topic
     progress = ui.ProgressDisplay(args.topic, show_banner=True)
 
-    # Check available sources (accounting for Bird auto-detection)
-    available = env.get_available_sources(config)
+    sources, error = ctx.resolve_sources(args.sources)
+    if error:
+        # If it's a warning about WebSearch fallback, print but continue
+        if "WebSearch fallback" in error:
+            print(f"Note: {error}", file=sys.stderr)
+        else:
+            print(f"Error: {error}", file=sys.stderr)
+            sys.exit(1)
 
-    # Override available if Bird is ready
-    if x_source == 'bird':
-        if available == 'reddit':
-            available = 'both'  # Now have both Reddit + X (via Bird)
-        elif available == 'web':
-            available = 'x'  # Now have X via Bird
+    # Show promo for missing keys BEFORE research
+    if ctx.missing_keys != 'none':
+        progress.show_promo(ctx.missing_keys)
 
-    # Mock mode can work without keys
-    if args.mock:
-        if args.sources == "auto":
-            sources = "both"
-        else:
-            sources = args.sources
-    else:
-        # Validate requested sources against available
-        sources, error = env.validate_sources(args.sources, available, args.include_web)
-        if error:
-            # If it's a warning about WebSearch fallback, print but continue
-            if "WebSearch fallback" in error:
-                print(f"Note: {error}", file=sys.stderr)
-            else:
-                print(f"Error: {error}", file=sys.stderr)
-                sys.exit(1)
+    report, web_needed, from_date, to_date = research_topic(
+        ctx, args.topic, sources, depth, args.days, progress,
+    )
+
+    # Output result
+    output_result(report, args.emit, web_needed, args.topic, from_date, to_date, ctx.missing_keys, args.days)
+
+
+class RunContext:
+    """Setup shared by every topic researched in one process.
+
+    Config, X source detection (which may shell out to `bird whoami`) and
+    the source/key checks happen once; model selection happens on first
+    use and is then reused. HTTP connections, rate limiters and caches are
+    module-level and so shared as well.
+    """
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.config = env.get_config()
+
+        x_source_status = env.get_x_source_status(self.config)
+        self.x_source = x_source_status["source"]  # 'bird', 'xai', or None
+
+        # Check available sources (accounting for Bird auto-detection)
+        available = env.get_available_sources(self.config)
+        if self.x_source == 'bird':
+            if available == 'reddit':
+                available = 'both'  # Now have both Reddit + X (via Bird)
+            elif available == 'web':
+                available = 'x'  # Now have X via Bird
+        self.available = available
+
+        # Check what keys are missing for promo messaging
+        self.missing_keys = env.get_missing_keys(self.config)
+
+        self._models = None
+        self._models_lock = threading.Lock()
+
+    def resolve_sources(self, requested: str) -> tuple:
+        """Validate requested sources against what's available.
+
+        Returns:
+            Tuple of (sources, error_or_note)
+        """
+        # Mock mode can work without keys
+        if self.args.mock:
+            return ("both" if requested == "auto" else requested), None
+        return env.validate_sources(requested, self.available, self.args.include_web)
+
+    def selected_models(self) -> dict:
+        """Select models once per process."""
+        with self._models_lock:
+            if self._models is None:
+                if self.args.mock:
+                    # Use mock models
+                    mock_openai_models = load_fixture("models_openai_sample.json").get("data", [])
+                    mock_xai_models = load_fixture("models_xai_sample.json").get("data", [])
+                    self._models = models.get_models(
+                        {
+                            "OPENAI_API_KEY": "mock",
+                            "XAI_API_KEY": "mock",
+                            **self.config,
+                        },
+                        mock_openai_models,
+                        mock_xai_models,
+                    )
+                else:
+                    self._models = models.get_models(self.config)
+            return self._models
+
+
+def research_topic(
+    ctx: RunContext,
+    topic: str,
+    sources: str,
+    depth: str,
+    days: int,
+    progress: Optional[ui.ProgressDisplay] = None,
+    output_dir: Optional[Path] = None,
+) -> tuple:
+    """Research one topic: serve it from the report cache or run the pipeline.
+
+    Args:
+        ctx: Shared setup for this process
+        topic: Topic to research
+        sources: Validated source mode (see RunContext.resolve_sources)
+        depth: 'quick', 'default' or 'deep'
+        days: Days to look back
+        progress: Progress display, or None (batch mode)
+        output_dir: Where to write outputs (default: render.OUTPUT_DIR)
+
+    Returns:
+        Tuple of (report, web_needed, from_date, to_date)
+    """
+    args = ctx.args
 
     # Get date range
-    from_date, to_date = dates.get_date_range(args.days)
+    from_date, to_date = dates.get_date_range(days)
+
+    # Serve from the report cache when possible
+    web_needed = sources in ("all", "web", "reddit-web", "x-web")
+    use_cache = not args.mock and not args.no_cache
+    cache_key = cache.get_cache_key(topic, from_date, to_date, sources, depth)
+    if use_cache and not args.refresh:
+        cached, age_hours = cache.load_cache_with_age(cache_key, cache.DEFAULT_TTL_HOURS)
+        report = _cached_report(cached, age_hours, progress, output_dir)
+        if report:
+            return report, web_needed, from_date, to_date
+
+        # Stale-while-revalidate: serve the latest report for an earlier
+        # day's window now and refresh today's in the background
+        if args.stale_while_revalidate:
+            cached, age_hours = cache.load_stale_report(topic, days, sources, depth)
+            report = _cached_report(cached, age_hours, progress, output_dir)
+            if report:
+                _spawn_background_refresh()
+                return report, web_needed, report.range_from, report.range_to
+
+    # Another process researching the same key: wait for its report
+    # instead of repeating every API call
+    lock = None
+    if use_cache:
+        wait = cache.LOCK_WAIT_SECONDS
+        left = budget.remaining()
+        if left is not None:
+            wait = min(wait, left)
+        lock, cached, age_hours = cache.claim_report(cache_key, wait)
+        report = _cached_report(cached, age_hours, progress, output_dir)
+        if report:
+            return report, web_needed, from_date, to_date
+
+    # Topics researched side by side (--batch, --serve) each get their own
+    # partial-report reasons and Reddit prefetches, under the same deadline
+    try:
+        with runstate.activate(runstate.current().child()):
+            report, web_needed = _run_topic(
+                ctx, topic, sources, depth, from_date, to_date,
+                progress, output_dir, cache_key if use_cache else None,
+            )
+    finally:
+        if lock:
+            lock.release()
+    return report, web_needed, from_date, to_date
 
-    # Check what keys are missing for promo messaging
-    missing_keys = env.get_missing_keys(config)
 
-    # Show promo for missing keys BEFORE research
-    if missing_keys != 'none':
-        progress.show_promo(missing_keys)
+def _cached_report(
+    cached: Optional[dict],
+    age_hours: Optional[float],
+    progress: Optional[ui.ProgressDisplay],
+    output_dir: Optional[Path],
+) -> Optional[schema.Report]:
+    """Turn a cached report dict into a Report and write its outputs.
+
+    Returns:
+        The report, or None if there is none or it can't be parsed
+    """
+    if not cached:
+        return None
+    try:
+        report = schema.Report.from_dict(cached)
+    except (KeyError, TypeError):
+        return None
+    report.from_cache = True
+    report.cache_age_hours = age_hours
+    if progress:
+        progress.show_cached(age_hours)
+    render.write_outputs(report, output_dir=output_dir)
+    return report
+
+
+def _run_topic(
+    ctx: RunContext,
+    topic: str,
+    sources: str,
+    depth: str,
+    from_date: str,
+    to_date: str,
+    progress: Optional[ui.ProgressDisplay],
+    output_dir: Optional[Path],
+    cache_key: Optional[str],
+) -> tuple:
+    """Run the research pipeline for one topic (research_topic minus caching).
+
+    Args:
+        cache_key: Report cache key to save a complete report under, or
+            None to skip caching
+
+    Returns:
+        Tuple of (report, web_needed)
+    """
+    args = ctx.args
 
     # Select models
-    if args.mock:
-        # Use mock models
-        mock_openai_models = load_fixture("models_openai_sample.json").get("data", [])
-        mock_xai_models = load_fixture("models_xai_sample.json").get("data", [])
-        selected_models = models.get_models(
-            {
-                "OPENAI_API_KEY": "mock",
-                "XAI_API_KEY": "mock",
-                **config,
-            },
-            mock_openai_models,
-            mock_xai_models,
-        )
-    else:
-        selected_models = models.get_models(config)
+    selected_models = ctx.selected_models()
 
     # Determine mode string
     if sources == "all":
@@ -618,81 +1220,425 @@ def main():
     else:
         mode = sources
 
+    # Incremental: search only from the stored report's end date, and
+    # carry over its items still inside the window (Reddit engagement is
+    # refreshed in the background while the searches run)
+    baseline = None
+    if args.incremental and cache_key:
+        baseline = incremental.load_baseline(topic, sources, depth, from_date)
+    search_from = incremental.fetch_from(baseline, from_date)
+    carried = None
+    stale_urls = set()  # Carried-over items whose engagement wasn't re-fetched
+    if baseline:
+        http.log(f"Incremental: searching from {search_from}, "
+                 f"{len(baseline.reddit)} Reddit and {len(baseline.x)} X items stored")
+        carry_pool = ThreadPoolExecutor(max_workers=1)
+        carried = carry_pool.submit(
+            runstate.bind(incremental.carry_over), baseline, from_date,
+            refresh=not _source_down(reddit_enrich.INFO_URL, args.mock),
+            stale=stale_urls,
+        )
+        carry_pool.shutdown(wait=False)
+
     # Run research
     reddit_items, x_items, web_needed, raw_openai, raw_xai, raw_reddit_enriched, reddit_error, x_error = run_research(
-        args.topic,
+        topic,
         sources,
-        config,
+        ctx.config,
         selected_models,
-        from_date,
+        search_from,
         to_date,
         depth,
         args.mock,
         progress,
-        x_source=x_source or "xai",
+        x_source=ctx.x_source or "xai",
+        enrich_workers=args.enrich_workers,
+        enrich_max_items=args.enrich_max_items,
+        enrich_time_budget=args.enrich_time_budget,
+        stream=args.stream,
     )
+    http.log_transfer_stats()
+
+    if carried:
+        stored_reddit, stored_x = carried.result()
+        stale_urls -= {item.get("url") for item in reddit_items + x_items}
+        reddit_items = incremental.merge_items(reddit_items, stored_reddit, "R")
+        x_items = incremental.merge_items(x_items, stored_x, "X")
 
     # Processing phase
-    progress.start_processing()
+    if progress:
+        progress.start_processing()
 
     # Normalize items
     normalized_reddit = normalize.normalize_reddit_items(reddit_items, from_date, to_date)
     normalized_x = normalize.normalize_x_items(x_items, from_date, to_date)
 
+    # Raw dicts are only needed for the raw_*.json outputs; write them now
+    # and release them rather than holding them through scoring and render
+    render.write_raw_outputs(raw_openai, raw_xai, raw_reddit_enriched, output_dir=output_dir)
+    del reddit_items, x_items, raw_openai, raw_xai, raw_reddit_enriched
+
+    # Engagement history: append this run's snapshots, then score with
+    # each item's velocity since its earlier snapshots. Carried-over items
+    # with stored engagement are left out: a repeat snapshot would give
+    # them a velocity of zero and drag their recency down.
+    velocity = None
+    if args.history and not args.mock:
+        fresh_reddit = [item for item in normalized_reddit if item.url not in stale_urls]
+        fresh_x = [item for item in normalized_x if item.url not in stale_urls]
+        store = history.get_store()
+        store.record(topic, fresh_reddit, fresh_x)
+        velocity = store.velocity([item.url for item in fresh_reddit + fresh_x])
+
+    deduped_reddit, deduped_x, _ = process_items(normalized_reddit, normalized_x, from_date, to_date, velocity)
+
+    if progress:
+        progress.end_processing()
+
+    # Create report
+    report = schema.create_report(
+        topic,
+        from_date,
+        to_date,
+        mode,
+        selected_models.get("openai"),
+        selected_models.get("xai"),
+    )
+    report.reddit = deduped_reddit
+    report.x = deduped_x
+    report.reddit_error = reddit_error
+    report.x_error = x_error
+    report.partial_reasons = budget.partial_reasons()
+
+    # Generate context snippet
+    report.context_snippet_md = render.render_context_snippet(report)
+
+    # Cache the report (but never a failed or partial run)
+    if cache_key and not reddit_error and not x_error and not report.partial_reasons:
+        cache.save_cache(cache_key, report.to_dict())
+        if args.incremental:
+            incremental.save_baseline(report, sources, depth)
+
+    # Write outputs
+    render.write_outputs(report, output_dir=output_dir)
+
+    # Show completion
+    if progress:
+        if sources == "web":
+            progress.show_web_only_complete()
+        else:
+            progress.show_complete(len(deduped_reddit), len(deduped_x))
+
+    return report, web_needed
+
+
+def process_items(
+    normalized_reddit: list,
+    normalized_x: list,
+    from_date: str,
+    to_date: str,
+    velocity: Optional[dict] = None,
+    normalized_web: Optional[list] = None,
+) -> tuple:
+    """Filter, score, sort and dedupe normalized items.
+
+    Args:
+        normalized_reddit: RedditItems from normalize.normalize_reddit_items
+        normalized_x: XItems from normalize.normalize_x_items
+        from_date: Start of the date range (YYYY-MM-DD)
+        to_date: End of the date range (YYYY-MM-DD)
+        velocity: Optional engagement velocity by URL (history.HistoryStore.velocity)
+        normalized_web: Optional WebSearchItems from websearch.normalize_websearch_items
+
+    Returns:
+        Tuple of (reddit_items, x_items, web_items) ready for the report
+    """
+    normalized_web = normalized_web or []
+
     # Hard date filter: exclude items with verified dates outside the range
     # This is the safety net - even if prompts let old content through, this filters it
     filtered_reddit = normalize.filter_by_date_range(normalized_reddit, from_date, to_date)
     filtered_x = normalize.filter_by_date_range(normalized_x, from_date, to_date)
+    filtered_web = normalize.filter_by_date_range(normalized_web, from_date, to_date)
 
     # Score items
-    scored_reddit = score.score_reddit_items(filtered_reddit)
-    scored_x = score.score_x_items(filtered_x)
+    scored_reddit = score.score_reddit_items(filtered_reddit, velocity)
+    scored_x = score.score_x_items(filtered_x, velocity)
+    scored_web = score.score_websearch_items(filtered_web)
 
     # Sort items
     sorted_reddit = score.sort_items(scored_reddit)
     sorted_x = score.sort_items(scored_x)
+    sorted_web = score.sort_items(scored_web)
 
-    # Dedupe items
+    # Dedupe items within each source
     deduped_reddit = dedupe.dedupe_reddit(sorted_reddit)
     deduped_x = dedupe.dedupe_x(sorted_x)
+    deduped_web = websearch.dedupe_websearch(sorted_web)
 
     # Minimum result guarantee: if all Reddit results were filtered out but
-    # we had raw results, keep top 3 by relevance regardless of score
+    # we had raw results, keep top 3 by relevance regardless of score. This
+    # comes before the cross-source pass, so a story already covered on X
+    # or the web isn't brought back as a duplicate.
     if not deduped_reddit and normalized_reddit:
         print("[REDDIT WARNING] All results scored below threshold, keeping top 3 by relevance", file=sys.stderr)
         by_relevance = sorted(normalized_reddit, key=lambda item: item.relevance, reverse=True)
         deduped_reddit = by_relevance[:3]
 
-    progress.end_processing()
+    return dedupe.dedupe_cross_source(deduped_reddit, deduped_x, deduped_web)
 
-    # Create report
-    report = schema.create_report(
-        args.topic,
-        from_date,
-        to_date,
-        mode,
-        selected_models.get("openai"),
-        selected_models.get("xai"),
-    )
-    report.reddit = deduped_reddit
-    report.x = deduped_x
-    report.reddit_error = reddit_error
-    report.x_error = x_error
 
-    # Generate context snippet
-    report.context_snippet_md = render.render_context_snippet(report)
+def service_routes(ctx: RunContext, default_depth: str, out_dir: Path) -> dict:
+    """JSON API routes for --serve.
 
-    # Write outputs
-    render.write_outputs(report, raw_openai, raw_xai, raw_reddit_enriched)
+    POST /research runs a topic end to end (cache, pipeline, report) and
+    returns the report. Identical requests already in flight are
+    coalesced into one run. POST /process runs normalize -> score ->
+    dedupe on raw items, and POST /render renders a report dict.
 
-    # Show completion
-    if sources == "web":
-        progress.show_web_only_complete()
+    Concurrent /research requests for different topics each record their
+    own partial-report reasons (research_topic runs every topic under its
+    own runstate.RunState).
+    """
+    args = ctx.args
+    flights = service.SingleFlight()
+
+    def options(body):
+        try:
+            return check_options(body.get("depth", default_depth), body.get("days", args.days))
+        except ValueError as e:
+            raise service.ServiceError(str(e)) from None
+
+    def research(body):
+        topic = str(body.get("topic") or "").strip()
+        if not topic:
+            raise service.ServiceError("Missing \"topic\"")
+        depth, days = options(body)
+        sources, error = ctx.resolve_sources(body.get("sources", args.sources))
+        if error and "WebSearch fallback" not in error:
+            raise service.ServiceError(error)
+        # Runs that may overlap must not share an output directory: name
+        # it after the whole coalescing key, not just the topic's slug
+        key = (topic, sources, depth, days)
+        key_hash = hashlib.sha256(json.dumps(key).encode()).hexdigest()[:8]
+        topic_dir = out_dir / f"{topic_dir_name(topic)}-{key_hash}"
+
+        def run():
+            report, web_needed, from_date, to_date = research_topic(
+                ctx, topic, sources, depth, days, output_dir=topic_dir,
+            )
+            return {
+                "report": report.to_dict(),
+                "web_needed": web_needed,
+                "from_date": from_date,
+                "to_date": to_date,
+                "output_dir": str(topic_dir),
+            }
+
+        result, shared = flights.do(key, run)
+        return {**result, "coalesced": shared}
+
+    def process(body):
+        topic = str(body.get("topic") or "").strip()
+        _, days = options(body)
+        from_date = body.get("from_date")
+        to_date = body.get("to_date")
+        if not (from_date and to_date):
+            from_date, to_date = dates.get_date_range(days)
+        reddit_raw = body.get("reddit") or []
+        x_raw = body.get("x") or []
+        web_raw = body.get("web") or []
+        if not all(isinstance(raw, list) for raw in (reddit_raw, x_raw, web_raw)):
+            raise service.ServiceError("reddit, x and web must be lists of items")
+
+        normalized_reddit = normalize.normalize_reddit_items(reddit_raw, from_date, to_date)
+        normalized_x = normalize.normalize_x_items(x_raw, from_date, to_date)
+        normalized_web = websearch.normalize_websearch_items(
+            websearch.parse_websearch_results(web_raw, topic, from_date, to_date), from_date, to_date,
+        )
+        reddit_items, x_items, web_items = process_items(
+            normalized_reddit, normalized_x, from_date, to_date, normalized_web=normalized_web,
+        )
+
+        report = schema.create_report(topic, from_date, to_date, body.get("mode", "both"))
+        report.reddit = reddit_items
+        report.x = x_items
+        report.web = web_items
+        report.context_snippet_md = render.render_context_snippet(report)
+        return {"report": report.to_dict()}
+
+    def render_report(body):
+        try:
+            report = schema.Report.from_dict(body.get("report") or {})
+        except (KeyError, TypeError, ValueError) as e:
+            raise service.ServiceError(f"Invalid report: {e}") from None
+        fmt = body.get("format", "compact")
+        if fmt == "compact":
+            text = render.render_compact(report, missing_keys=ctx.missing_keys)
+        elif fmt == "md":
+            text = render.render_full_report(report)
+        elif fmt == "context":
+            text = render.render_context_snippet(report)
+        else:
+            raise service.ServiceError(f"Invalid format: {fmt}")
+        return {"text": text}
+
+    return {
+        ("POST", "/research"): research,
+        ("POST", "/process"): process,
+        ("POST", "/render"): render_report,
+    }
+
+
+def run_service(ctx: RunContext, address: tuple, default_depth: str, out_dir: Path):
+    """Run the --serve research service until it is shut down.
+
+    Model selection happens up front, and parsed Reddit threads are kept
+    in memory, so requests start warm.
+    """
+    reddit_enrich.enable_memory_cache()
+    ctx.selected_models()
+    server = service.JSONService(address, service_routes(ctx, default_depth, out_dir))
+    service.serve(server)
+
+
+def read_batch(path: str) -> list:
+    """Read batch topics from a file, or stdin for "-".
+
+    Each non-empty line is either a plain topic or a JSON object with a
+    "topic" key and optional "days", "depth" and "sources" overrides.
+    Lines starting with # are skipped.
+
+    Returns:
+        List of entry dicts, each with at least "topic"
+
+    Raises:
+        ValueError: On a malformed JSON line or an entry without a topic
+    """
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
     else:
-        progress.show_complete(len(deduped_reddit), len(deduped_x))
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+    entries = []
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("{"):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"line {lineno}: {e}") from None
+            if not str(entry.get("topic", "")).strip():
+                raise ValueError(f"line {lineno}: missing \"topic\"")
+        else:
+            entry = {"topic": line}
+        entries.append(entry)
+    return entries
 
-    # Output result
-    output_result(report, args.emit, web_needed, args.topic, from_date, to_date, missing_keys, args.days)
+
+def check_options(depth, days) -> tuple:
+    """Validate a per-topic depth and days (from a batch line or request).
+
+    Returns:
+        Tuple of (depth, days as int)
+
+    Raises:
+        ValueError: If depth is unknown or days isn't an integer from 1 to 30
+    """
+    if depth not in ("quick", "default", "deep"):
+        raise ValueError(f"Invalid depth: {depth}")
+    try:
+        days = int(days)
+    except (TypeError, ValueError):
+        raise ValueError("days must be an integer") from None
+    if not 1 <= days <= 30:
+        raise ValueError("days must be between 1 and 30")
+    return depth, days
+
+
+def topic_dir_name(topic: str) -> str:
+    """Filesystem-safe directory name for a topic."""
+    slug = re.sub(r"[^a-z0-9]+", "-", topic.lower()).strip("-")[:60].rstrip("-")
+    return slug or "topic"
+
+
+def run_batch(
+    ctx: RunContext,
+    entries: list,
+    depth: str,
+    out_dir: Path,
+    concurrency: int = BATCH_CONCURRENCY,
+) -> int:
+    """Research many topics in this process, `concurrency` at a time.
+
+    Topics share the RunContext plus the process-wide HTTP connection
+    pool, rate limiters, circuit breakers and caches. Each topic's outputs
+    go to its own directory under out_dir, and one JSON status line per
+    topic is printed to stdout as it finishes. A --budget applies to the
+    whole batch.
+
+    Args:
+        ctx: Shared setup
+        entries: Entries from read_batch
+        depth: Default depth for entries that don't set one
+        out_dir: Parent directory for the per-topic output directories
+        concurrency: Topics researched at once
+
+    Returns:
+        Number of topics that failed
+    """
+    args = ctx.args
+
+    # One directory per topic; repeated topics get a numeric suffix
+    used = {}
+    jobs = []
+    for entry in entries:
+        name = topic_dir_name(entry["topic"])
+        used[name] = used.get(name, 0) + 1
+        if used[name] > 1:
+            name = f"{name}-{used[name]}"
+        jobs.append((entry, out_dir / name))
+
+    print_lock = threading.Lock()
+
+    def run_one(entry, topic_dir):
+        topic = str(entry["topic"]).strip()
+        topic_depth, days = check_options(entry.get("depth", depth), entry.get("days", args.days))
+        sources, error = ctx.resolve_sources(entry.get("sources", args.sources))
+        if error and "WebSearch fallback" not in error:
+            raise ValueError(error)
+        report, web_needed, _, _ = research_topic(
+            ctx, topic, sources, topic_depth, days, output_dir=topic_dir,
+        )
+        return {
+            "topic": topic,
+            "status": "ok",
+            "output_dir": str(topic_dir),
+            "reddit": len(report.reddit),
+            "x": len(report.x),
+            "web_needed": web_needed,
+            "from_cache": report.from_cache,
+            "errors": [e for e in (report.reddit_error, report.x_error) if e],
+            "partial": bool(report.partial_reasons),
+        }
+
+    failures = 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {executor.submit(runstate.bind(run_one), entry, topic_dir): entry for entry, topic_dir in jobs}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                failures += 1
+                result = {"topic": futures[future]["topic"], "status": "error", "error": f"{type(e).__name__}: {e}"}
+            with print_lock:
+                print(json.dumps(result), flush=True)
+
+    sys.stderr.write(f"[BATCH] {len(jobs) - failures} of {len(jobs)} topics done, output in {out_dir}\n")
+    return failures
 
 
 def output_result(
@@ -7,6 +7,8 @@ import sys
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
+from . import budget, fanout
+
 # Depth configurations: number of results to request
 DEPTH_CONFIG = {
     "quick": 12,
@@ -99,7 +101,7 @@ def is_bird_authenticated() -> Optional[str]:
             ["bird", "whoami"],
             capture_output=True,
             text=True,
-            timeout=10,
+            timeout=budget.clamp(10),
         )
         if result.returncode == 0 and result.stdout.strip():
             # Output is typically the username
@@ -181,12 +183,16 @@ def _run_bird_search(query: str, count: int, timeout: int) -> Dict[str, Any]:
         "--json",
     ]
 
+    if budget.expired():
+        budget.mark_partial("run budget exhausted")
+        return {"error": "Run budget exhausted", "items": []}
+
     try:
         result = subprocess.run(
             cmd,
             capture_output=True,
             text=True,
-            timeout=timeout,
+            timeout=budget.clamp(timeout),
         )
 
         if result.returncode != 0:
@@ -239,7 +245,9 @@ def search_x(
 
     # Retry with fewer keywords if 0 results and query has 3+ words
     core_words = core_topic.split()
-    if not items and len(core_words) > 2:
+    if not items and len(core_words) > 2 and not budget.allows("fallback"):
+        budget.mark_partial("X retry search skipped (run budget)")
+    elif not items and len(core_words) > 2:
         shorter = ' '.join(core_words[:2])
         _log(f"0 results for '{core_topic}', retrying with '{shorter}'")
         query = f"{shorter} since:{from_date}"
@@ -253,65 +261,88 @@ def search_handles(
     topic: str,
     from_date: str,
     count_per: int = 5,
+    max_workers: int = fanout.DEFAULT_MAX_WORKERS,
+    timeout: float = fanout.DEFAULT_REQUEST_TIMEOUT,
+    deadline: float = fanout.DEFAULT_DEADLINE,
 ) -> List[Dict[str, Any]]:
     """Search specific X handles for topic-related content.
 
     Runs targeted Bird searches using `from:handle topic` syntax.
     Used in Phase 2 supplemental search after entity extraction.
+    Handles are searched concurrently; results keep handle order.
 
     Args:
         handles: List of X handles to search (without @)
         topic: Search topic (core subject, not full verbose query)
         from_date: Start date (YYYY-MM-DD)
         count_per: Results to request per handle
+        max_workers: Maximum concurrent bird processes
+        timeout: Per-handle timeout in seconds
+        deadline: Overall time budget in seconds; slower handles are dropped
 
     Returns:
         List of raw item dicts (same format as parse_bird_response output).
     """
-    all_items = []
     core_topic = _extract_core_subject(topic)
+    per_handle = fanout.fan_out(
+        lambda handle, t: _search_handle(handle, core_topic, from_date, count_per, t),
+        [handle.lstrip("@") for handle in handles],
+        max_workers=max_workers,
+        request_timeout=timeout,
+        deadline=deadline,
+    )
 
-    for handle in handles:
-        handle = handle.lstrip("@")
-        query = f"from:{handle} {core_topic} since:{from_date}"
-
-        cmd = [
-            "bird", "search",
-            query,
-            "-n", str(count_per),
-            "--json",
-        ]
-
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=15,  # Short timeout per handle
-            )
-
-            if result.returncode != 0:
-                _log(f"Handle search failed for @{handle}: {result.stderr.strip()}")
-                continue
-
-            output = result.stdout.strip()
-            if not output:
-                continue
-
-            response = json.loads(output)
-            items = parse_bird_response(response)
-            all_items.extend(items)
-
-        except subprocess.TimeoutExpired:
-            _log(f"Handle search timed out for @{handle}")
-        except json.JSONDecodeError:
-            _log(f"Invalid JSON from handle search for @{handle}")
-        except Exception as e:
-            _log(f"Handle search error for @{handle}: {e}")
-
+    all_items = []
+    for items in per_handle:
+        all_items.extend(items or [])
     return all_items
 
 
+def _search_handle(
+    handle: str,
+    core_topic: str,
+    from_date: str,
+    count_per: int,
+    timeout: float,
+) -> List[Dict[str, Any]]:
+    """Run one `from:handle` Bird search. Returns [] on any error."""
+    query = f"from:{handle} {core_topic} since:{from_date}"
+
+    cmd = [
+        "bird", "search",
+        query,
+        "-n", str(count_per),
+        "--json",
+    ]
+
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+
+        if result.returncode != 0:
+            _log(f"Handle search failed for @{handle}: {result.stderr.strip()}")
+            return []
+
+        output = result.stdout.strip()
+        if not output:
+            return []
+
+        response = json.loads(output)
+        return parse_bird_response(response)
+
+    except subprocess.TimeoutExpired:
+        _log(f"Handle search timed out for @{handle}")
+    except json.JSONDecodeError:
+        _log(f"Invalid JSON from handle search for @{handle}")
+    except Exception as e:
+        _log(f"Handle search error for @{handle}: {e}")
+    return []
+
+
 def parse_bird_response(response: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Parse Bird response to match xai_x output format.
 
@@ -0,0 +1,91 @@
+"""Run-wide time budget for last30days skill.
+
+main() sets one deadline for the whole run (--budget). HTTP calls and
+subprocesses clamp their timeouts to the time left, and optional phases
+check whether enough time remains before starting. Whatever gets
+skipped or cut short is recorded so the report can be marked partial.
+Both live in the active runstate.RunState, so topics researched side by
+side (--batch, --serve) keep their partial reasons apart.
+"""
+
+import time
+from typing import List, Optional
+
+from . import runstate
+
+# Never hand a network call or subprocess less than this, even when the
+# deadline is closer; a near-zero timeout fails without doing anything
+MIN_TIMEOUT = 1.0
+
+# Seconds an optional phase needs to be worth starting
+PHASE_MIN_SECONDS = {
+    "fallback": 20.0,    # Extra Reddit search queries (multi-second LLM calls)
+    "enrichment": 5.0,   # Reddit thread fetches
+    "phase2": 10.0,      # Supplemental subreddit/handle searches
+}
+
+
+def start(seconds: Optional[float]):
+    """Start the process-wide run budget, or clear it with None.
+
+    Topics researched afterwards (see runstate.RunState.child) share
+    this deadline but record their own partial reasons.
+    """
+    runstate.set_default(runstate.RunState.with_budget(seconds))
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the active run's budget, or None if there is no budget."""
+    deadline = runstate.current().deadline
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def expired() -> bool:
+    """Whether the budget has run out."""
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def clamp(timeout: float) -> float:
+    """Clamp a timeout to the remaining budget (but not below MIN_TIMEOUT).
+
+    Args:
+        timeout: The caller's own timeout in seconds
+
+    Returns:
+        Timeout to use in seconds
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    return max(MIN_TIMEOUT, min(timeout, left))
+
+
+def allows(phase: str) -> bool:
+    """Whether an optional phase should start given the remaining budget.
+
+    Args:
+        phase: Key of PHASE_MIN_SECONDS
+
+    Returns:
+        True if there is no budget or enough of it is left
+    """
+    left = remaining()
+    return left is None or left >= PHASE_MIN_SECONDS.get(phase, 0.0)
+
+
+def mark_partial(reason: str):
+    """Record that part of the active run was skipped or cut short."""
+    state = runstate.current()
+    with state.lock:
+        if reason not in state.partial:
+            state.partial.append(reason)
+
+
+def partial_reasons() -> List[str]:
+    """Reasons recorded by mark_partial for the active run, in order."""
+    state = runstate.current()
+    with state.lock:
+        return list(state.partial)
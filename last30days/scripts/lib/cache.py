@@ -3,13 +3,70 @@
 import hashlib
 import json
 import os
-from datetime import datetime, timezone
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 CACHE_DIR = Path.home() / ".cache" / "last30days"
 DEFAULT_TTL_HOURS = 24
 MODEL_CACHE_TTL_DAYS = 7
+# Reddit thread data goes stale quickly; TTL is configured in minutes
+THREAD_CACHE_TTL_HOURS = float(os.environ.get("LAST30DAYS_THREAD_CACHE_TTL", "60")) / 60
+# How old a report may be and still be served in stale-while-revalidate mode
+STALE_TTL_HOURS = 7 * 24
+
+# Incremental baselines are useless once they no longer overlap a window
+BASELINE_TTL_DAYS = 30
+
+# Per-namespace TTLs (the sqlite backend also purges entries past these)
+NAMESPACE_TTL_HOURS = {
+    "report": STALE_TTL_HOURS,
+    "model": MODEL_CACHE_TTL_DAYS * 24,
+    "thread": THREAD_CACHE_TTL_HOURS,
+    "baseline": BASELINE_TTL_DAYS * 24,
+}
+
+# Backend: 'json' (one file per key) or 'sqlite' (single WAL database with
+# compressed entries and LRU eviction past LAST30DAYS_CACHE_MAX_MB)
+CACHE_BACKEND = os.environ.get("LAST30DAYS_CACHE_BACKEND", "json").lower()
+CACHE_DB_FILE = CACHE_DIR / "cache.sqlite3"
+CACHE_MAX_BYTES = int(float(os.environ.get("LAST30DAYS_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+# JSON backend bounds: writes sweep their namespace (at most once per
+# JSON_SWEEP_INTERVAL seconds per process), deleting entries past the
+# namespace TTL and then the oldest beyond JSON_MAX_ENTRIES
+JSON_MAX_ENTRIES = int(os.environ.get("LAST30DAYS_CACHE_MAX_ENTRIES", "5000"))
+JSON_SWEEP_INTERVAL = 300
+
+# Cross-process single-flight for reports: an OS file lock (flock, or
+# msvcrt.locking on Windows) per report key. The OS drops the lock when
+# its holder exits, so a crashed process can't leave a stale lock behind.
+LOCK_DIR = CACHE_DIR / "locks"
+# How long a process waits for another one researching the same key
+LOCK_WAIT_SECONDS = 600
+LOCK_POLL_SECONDS = 0.5
+
+_store = None
+_last_sweep: Dict[str, float] = {}
+_sweep_lock = threading.Lock()
+
+
+def get_store():
+    """Get the shared SQLite cache store."""
+    global _store
+    if _store is None:
+        from .cache_db import SQLiteCache
+        _store = SQLiteCache(CACHE_DB_FILE, CACHE_MAX_BYTES, NAMESPACE_TTL_HOURS)
+    return _store
 
 
 def ensure_cache_dir():
@@ -17,15 +74,39 @@ def ensure_cache_dir():
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def get_cache_key(topic: str, from_date: str, to_date: str, sources: str) -> str:
+def get_cache_key(topic: str, from_date: str, to_date: str, sources: str, depth: str = "default") -> str:
     """Generate a cache key from query parameters."""
-    key_data = f"{topic}|{from_date}|{to_date}|{sources}"
+    key_data = f"{topic}|{from_date}|{to_date}|{sources}|{depth}"
     return hashlib.sha256(key_data.encode()).hexdigest()[:16]
 
 
-def get_cache_path(cache_key: str) -> Path:
-    """Get path to cache file."""
-    return CACHE_DIR / f"{cache_key}.json"
+def load_stale_report(topic: str, days: int, sources: str, depth: str = "default",
+                      max_age_hours: float = STALE_TTL_HOURS) -> tuple:
+    """Find the most recent report for the same window length ending on an earlier day.
+
+    Report keys include the concrete dates, so a report from an earlier
+    day is stored under that day's key. Stale-while-revalidate looks
+    back one day at a time, up to max_age_hours.
+
+    Returns:
+        Tuple of (data, age_hours) or (None, None) if there is none
+    """
+    today = datetime.now(timezone.utc).date()
+    for back in range(1, int(max_age_hours // 24) + 1):
+        to_date = today - timedelta(days=back)
+        from_date = to_date - timedelta(days=days)
+        key = get_cache_key(topic, from_date.isoformat(), to_date.isoformat(), sources, depth)
+        data, age = load_cache_with_age(key, max_age_hours)
+        if data is not None:
+            return data, age
+    return None, None
+
+
+def get_cache_path(cache_key: str, namespace: str = "report") -> Path:
+    """Get path to cache file (json backend)."""
+    if namespace == "report":
+        return CACHE_DIR / f"{cache_key}.json"
+    return CACHE_DIR / namespace / f"{cache_key}.json"
 
 
 def is_cache_valid(cache_path: Path, ttl_hours: int = DEFAULT_TTL_HOURS) -> bool:
@@ -45,16 +126,8 @@ def is_cache_valid(cache_path: Path, ttl_hours: int = DEFAULT_TTL_HOURS) -> bool
 
 def load_cache(cache_key: str, ttl_hours: int = DEFAULT_TTL_HOURS) -> Optional[dict]:
     """Load data from cache if valid."""
-    cache_path = get_cache_path(cache_key)
-
-    if not is_cache_valid(cache_path, ttl_hours):
-        return None
-
-    try:
-        with open(cache_path, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError):
-        return None
+    data, _ = load_cache_with_age(cache_key, ttl_hours)
+    return data
 
 
 def get_cache_age_hours(cache_path: Path) -> Optional[float]:
@@ -76,7 +149,27 @@ def load_cache_with_age(cache_key: str, ttl_hours: int = DEFAULT_TTL_HOURS) -> t
     Returns:
         Tuple of (data, age_hours) or (None, None) if invalid
     """
-    cache_path = get_cache_path(cache_key)
+    return load_entry("report", cache_key, ttl_hours)
+
+
+def load_entry(namespace: str, cache_key: str, ttl_hours: Optional[float] = None) -> tuple:
+    """Load a namespaced cache entry with age info.
+
+    Args:
+        namespace: 'report', 'model' or 'thread'
+        cache_key: Key within the namespace
+        ttl_hours: Max age (defaults to the namespace TTL)
+
+    Returns:
+        Tuple of (data, age_hours) or (None, None) if invalid
+    """
+    if ttl_hours is None:
+        ttl_hours = NAMESPACE_TTL_HOURS.get(namespace, DEFAULT_TTL_HOURS)
+
+    if CACHE_BACKEND == "sqlite":
+        return get_store().get(namespace, cache_key, ttl_hours)
+
+    cache_path = get_cache_path(cache_key, namespace)
 
     if not is_cache_valid(cache_path, ttl_hours):
         return None, None
@@ -92,24 +185,112 @@ def load_cache_with_age(cache_key: str, ttl_hours: int = DEFAULT_TTL_HOURS) -> t
 
 def save_cache(cache_key: str, data: dict):
     """Save data to cache."""
-    ensure_cache_dir()
-    cache_path = get_cache_path(cache_key)
+    save_entry("report", cache_key, data)
+
+
+def save_entry(namespace: str, cache_key: str, data: Any):
+    """Save a namespaced cache entry."""
+    if CACHE_BACKEND == "sqlite":
+        get_store().set(namespace, cache_key, data)
+        return
 
     try:
-        with open(cache_path, 'w') as f:
-            json.dump(data, f)
+        write_json_atomic(get_cache_path(cache_key, namespace), data)
     except OSError:
-        pass  # Silently fail on cache write errors
+        return  # Silently fail on cache write errors
 
+    now = time.monotonic()
+    with _sweep_lock:
+        due = now - _last_sweep.get(namespace, float("-inf")) >= JSON_SWEEP_INTERVAL
+        if due:
+            _last_sweep[namespace] = now
+    if due:
+        prune_entries(namespace)
 
-def clear_cache():
-    """Clear all cache files."""
-    if CACHE_DIR.exists():
-        for f in CACHE_DIR.glob("*.json"):
+
+def _namespace_files(namespace: Optional[str]) -> List[Path]:
+    """JSON backend files of one namespace (all namespaces for None)."""
+    if not CACHE_DIR.exists():
+        return []
+    if namespace is None:
+        return list(CACHE_DIR.glob("*.json")) + list(CACHE_DIR.glob("*/*.json"))
+    if namespace == "report":
+        return [p for p in CACHE_DIR.glob("*.json") if p != MODEL_CACHE_FILE]
+    return list((CACHE_DIR / namespace).glob("*.json"))
+
+
+def prune_entries(namespace: str, max_entries: Optional[int] = None) -> int:
+    """Delete a JSON backend namespace's expired entries, then its oldest.
+
+    The sqlite backend evicts on its own, so this is a no-op there.
+
+    Args:
+        namespace: Namespace to sweep
+        max_entries: Entries to keep at most (default JSON_MAX_ENTRIES)
+
+    Returns:
+        Number of files deleted
+    """
+    if CACHE_BACKEND == "sqlite":
+        return 0
+    if max_entries is None:
+        max_entries = JSON_MAX_ENTRIES
+    max_age = NAMESPACE_TTL_HOURS.get(namespace, DEFAULT_TTL_HOURS) * 3600
+    now = time.time()
+
+    entries = []
+    for path in _namespace_files(namespace):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    entries.sort(reverse=True)  # Newest first
+
+    removed = 0
+    for i, (mtime, path) in enumerate(entries):
+        if i >= max_entries or now - mtime >= max_age:
             try:
-                f.unlink()
+                path.unlink()
+                removed += 1
             except OSError:
                 pass
+    return removed
+
+
+def write_json_atomic(path: Path, data: Any):
+    """Write JSON so readers see either the old file or the complete new one.
+
+    The data goes to a temporary file in the same directory, which then
+    replaces the target in one rename.
+
+    Raises:
+        OSError: If the file can't be written
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def clear_cache(namespace: Optional[str] = None):
+    """Clear all cache entries, or only those in one namespace."""
+    if CACHE_BACKEND == "sqlite":
+        get_store().clear(namespace)
+        return
+
+    for f in _namespace_files(namespace):
+        try:
+            f.unlink()
+        except OSError:
+            pass
 
 
 # Model selection cache (longer TTL)
@@ -118,6 +299,10 @@ MODEL_CACHE_FILE = CACHE_DIR / "model_selection.json"
 
 def load_model_cache() -> dict:
     """Load model selection cache."""
+    if CACHE_BACKEND == "sqlite":
+        data, _ = get_store().get("model", "selection")
+        return data or {}
+
     if not is_cache_valid(MODEL_CACHE_FILE, MODEL_CACHE_TTL_DAYS * 24):
         return {}
 
@@ -130,10 +315,12 @@ def load_model_cache() -> dict:
 
 def save_model_cache(data: dict):
     """Save model selection cache."""
-    ensure_cache_dir()
+    if CACHE_BACKEND == "sqlite":
+        get_store().set("model", "selection", data)
+        return
+
     try:
-        with open(MODEL_CACHE_FILE, 'w') as f:
-            json.dump(data, f)
+        write_json_atomic(MODEL_CACHE_FILE, data)
     except OSError:
         pass
 
@@ -150,3 +337,122 @@ def set_cached_model(provider: str, model: str):
     cache[provider] = model
     cache['updated_at'] = datetime.now(timezone.utc).isoformat()
     save_model_cache(cache)
+
+
+def _lock_file(fd: int) -> bool:
+    """Take an exclusive OS lock on an open file without blocking."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock_file(fd: int):
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+
+
+class ReportLock:
+    """OS lock marking one process as the one researching a report key.
+
+    The holder deletes the lock file on release while still holding the
+    lock. A process that locked a file which has since been deleted sees
+    a different inode at the path and retries on the new file, so two
+    processes can never both believe they hold the key.
+    """
+
+    def __init__(self, cache_key: str):
+        self.path = LOCK_DIR / f"{cache_key}.lock"
+        self.fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self.fd is not None
+
+    def try_acquire(self) -> bool:
+        """Take the lock if no live process holds it.
+
+        Raises:
+            OSError: If the lock directory isn't writable
+        """
+        if self.held:
+            return True
+        LOCK_DIR.mkdir(parents=True, exist_ok=True)
+        for _ in range(3):
+            fd = os.open(str(self.path), os.O_CREAT | os.O_RDWR, 0o644)
+            if not _lock_file(fd):
+                os.close(fd)
+                return False
+            try:
+                current = os.stat(str(self.path)).st_ino == os.fstat(fd).st_ino
+            except FileNotFoundError:
+                current = False
+            if current:
+                self.fd = fd
+                return True
+            # Locked a file its previous holder already deleted; use the new one
+            _unlock_file(fd)
+            os.close(fd)
+        return False
+
+    def release(self):
+        """Delete the lock file (where the OS allows it) and drop the lock."""
+        if not self.held:
+            return
+        fd, self.fd = self.fd, None
+        try:
+            self.path.unlink()
+        except OSError:
+            pass  # Windows can't delete an open file; the next holder reuses it
+        _unlock_file(fd)
+        os.close(fd)
+
+
+def claim_report(cache_key: str, wait_seconds: float = LOCK_WAIT_SECONDS) -> Tuple[Optional[ReportLock], Optional[dict], Optional[float]]:
+    """Single-flight across processes for one report key.
+
+    Either takes the key's lock, or waits for the process holding it and
+    picks up the report it cached. A report only counts if it was written
+    after this call started, so a holder that fails (and caches nothing)
+    hands the work to one of the waiters instead of an older report.
+
+    Args:
+        cache_key: Report key from get_cache_key
+        wait_seconds: Longest time to wait for another process
+
+    Returns:
+        (lock, None, None) if this process should do the work and release
+        the lock afterwards; (None, data, age_hours) if another process
+        produced the report meanwhile; (None, None, None) if the lock
+        can't be used or the wait timed out (do the work unlocked)
+    """
+    lock = ReportLock(cache_key)
+    started = time.monotonic()
+    waited = False
+    while True:
+        try:
+            acquired = lock.try_acquire()
+        except OSError:
+            return None, None, None
+        waited_hours = (time.monotonic() - started) / 3600
+        if acquired:
+            if waited:
+                data, age = load_cache_with_age(cache_key, waited_hours)
+                if data is not None:
+                    lock.release()
+                    return None, data, age
+            return lock, None, None
+        waited = True
+        if time.monotonic() - started >= wait_seconds:
+            return None, None, None
+        time.sleep(LOCK_POLL_SECONDS)
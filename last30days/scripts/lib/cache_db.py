@@ -0,0 +1,205 @@
+"""SQLite cache store for last30days skill.
+
+A single-file alternative to the one-JSON-file-per-key layout in cache.py.
+Entries live in namespaces (report, model, thread) with their own TTLs,
+are stored as zlib-compressed JSON, and the least recently used entries
+are evicted once the store grows past a byte cap. WAL mode plus a busy
+timeout lets several processes share the file safely.
+
+Writes stay cheap on a full store: triggers keep a running byte total,
+expired entries are found through a (namespace, created) index, and the
+LRU walk only happens once the total is over the cap. Reads refresh an
+entry's access time at most every ACCESS_TOUCH_SECONDS, so read-heavy
+runs rarely take the write lock.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+BUSY_TIMEOUT_SECONDS = 30
+
+# A read only rewrites an entry's access time once it is this stale
+ACCESS_TOUCH_SECONDS = 300
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE INDEX IF NOT EXISTS entries_namespace_created ON entries (namespace, created);
+
+CREATE TABLE IF NOT EXISTS stats (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total_bytes INTEGER NOT NULL
+);
+-- Seeds the total for stores created before it existed (no scan once seeded)
+INSERT OR IGNORE INTO stats (id, total_bytes)
+    SELECT 1, COALESCE(SUM(size), 0) FROM entries
+    WHERE NOT EXISTS (SELECT 1 FROM stats);
+
+CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries BEGIN
+    UPDATE stats SET total_bytes = total_bytes + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE stats SET total_bytes = total_bytes + NEW.size - OLD.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries BEGIN
+    UPDATE stats SET total_bytes = total_bytes - OLD.size;
+END;
+"""
+
+
+class SQLiteCache:
+    """Namespaced key/value cache backed by one SQLite file."""
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_hours: Optional[Dict[str, float]] = None,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl_hours = ttl_hours or {}
+        self.touch_seconds = ACCESS_TOUCH_SECONDS
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, creating the database if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path),
+                timeout=BUSY_TIMEOUT_SECONDS,
+                isolation_level=None,  # Explicit transactions below
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str, ttl_hours: Optional[float] = None) -> Tuple[Any, Optional[float]]:
+        """Load an entry if it is within its TTL.
+
+        Returns:
+            Tuple of (data, age_hours) or (None, None) if missing/expired
+        """
+        if ttl_hours is None:
+            ttl_hours = self.ttl_hours.get(namespace)
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT data, created, accessed FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            if row is None:
+                return None, None
+
+            now = time.time()
+            age_hours = (now - row[1]) / 3600
+            if ttl_hours is not None and age_hours >= ttl_hours:
+                return None, None
+
+            if now - row[2] >= self.touch_seconds:
+                conn.execute(
+                    "UPDATE entries SET accessed = ? WHERE namespace = ? AND key = ?",
+                    (now, namespace, key),
+                )
+            return json.loads(zlib.decompress(row[0])), age_hours
+        except (sqlite3.Error, zlib.error, ValueError):
+            return None, None
+
+    def set(self, namespace: str, key: str, data: Any):
+        """Store an entry, then evict expired and least recently used entries."""
+        blob = zlib.compress(json.dumps(data).encode("utf-8"))
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # An upsert (not INSERT OR REPLACE) so the size triggers fire
+                conn.execute(
+                    "INSERT INTO entries (namespace, key, data, size, created, accessed) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (namespace, key) DO UPDATE SET data = excluded.data, "
+                    "size = excluded.size, created = excluded.created, accessed = excluded.accessed",
+                    (namespace, key, blob, len(blob), now, now),
+                )
+                self._evict(conn, now)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            pass  # Silently fail on cache write errors
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then LRU entries until under max_bytes."""
+        for namespace, ttl_hours in self.ttl_hours.items():
+            conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND created < ?",
+                (namespace, now - ttl_hours * 3600),
+            )
+
+        total = self._total(conn)
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        victims = []
+        for namespace, key, size in conn.execute(
+            "SELECT namespace, key, size FROM entries ORDER BY accessed ASC"
+        ):
+            victims.append((namespace, key))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", victims)
+
+    def delete(self, namespace: str, key: str):
+        """Remove one entry."""
+        try:
+            self._connect().execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            )
+        except sqlite3.Error:
+            pass
+
+    def clear(self, namespace: Optional[str] = None):
+        """Remove all entries, or only those in one namespace."""
+        try:
+            conn = self._connect()
+            if namespace is None:
+                conn.execute("DELETE FROM entries")
+            else:
+                conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def _total(conn: sqlite3.Connection) -> int:
+        """Running total of entry sizes kept by the triggers."""
+        row = conn.execute("SELECT total_bytes FROM stats WHERE id = 1").fetchone()
+        return row[0] if row else 0
+
+    def total_bytes(self) -> int:
+        """Total compressed size of all entries."""
+        try:
+            return self._total(self._connect())
+        except sqlite3.Error:
+            return 0
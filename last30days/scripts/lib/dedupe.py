@@ -1,10 +1,30 @@
 """Near-duplicate detection for last30days skill."""
 
+import random
 import re
-from typing import List, Set, Tuple, Union
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlparse
 
 from . import schema
 
+# MinHash/LSH banding: 32 bands x 4 rows = 128 hash functions. A pair at the
+# 0.7 threshold becomes a candidate with probability 1 - (1 - 0.7**4)**32,
+# i.e. ~99.98%; pairs below ~0.3 almost never do. Candidates are always
+# verified with exact Jaccard, so LSH can only miss pairs, never add them.
+MINHASH_BANDS = 32
+MINHASH_ROWS = 4
+_MINHASH_PRIME = (1 << 61) - 1
+_rng = random.Random(1729)  # Fixed seed: signatures are stable across runs
+_MINHASH_PARAMS = [
+    (_rng.randrange(1, _MINHASH_PRIME), _rng.randrange(0, _MINHASH_PRIME))
+    for _ in range(MINHASH_BANDS * MINHASH_ROWS)
+]
+
+# Below this many items the exact pairwise scan is fast enough
+LSH_MIN_ITEMS = 200
+
 
 def normalize_text(text: str) -> str:
     """Normalize text for comparison.
@@ -36,23 +56,83 @@ def jaccard_similarity(set1: Set[str], set2: Set[str]) -> float:
     return intersection / union if union > 0 else 0.0
 
 
-def get_item_text(item: Union[schema.RedditItem, schema.XItem]) -> str:
+def get_item_text(item: Union[schema.RedditItem, schema.XItem, schema.WebSearchItem]) -> str:
     """Get comparable text from an item."""
-    if isinstance(item, schema.RedditItem):
+    if isinstance(item, (schema.RedditItem, schema.WebSearchItem)):
         return item.title
     else:
         return item.text
 
 
+def _ngram_hashes(ngram: str) -> Tuple[int, ...]:
+    """Hash one n-gram under every MinHash permutation."""
+    h = zlib.crc32(ngram.encode("utf-8"))
+    p = _MINHASH_PRIME
+    return tuple((a * h + b) % p for a, b in _MINHASH_PARAMS)
+
+
+def minhash_signature(ngrams: Set[str], hash_cache: Optional[Dict[str, Tuple[int, ...]]] = None) -> Tuple[int, ...]:
+    """Compute the MinHash signature of an n-gram set.
+
+    Args:
+        ngrams: N-gram set
+        hash_cache: Optional n-gram -> permuted hashes memo shared across
+            calls; n-grams repeat heavily across titles, so this makes the
+            signature an element-wise min over cached tuples
+
+    Returns:
+        Tuple of MINHASH_BANDS * MINHASH_ROWS ints
+    """
+    if not ngrams:
+        return tuple(0 for _ in _MINHASH_PARAMS)
+    if hash_cache is None:
+        hash_cache = {}
+    vectors = []
+    for g in ngrams:
+        vec = hash_cache.get(g)
+        if vec is None:
+            vec = hash_cache[g] = _ngram_hashes(g)
+        vectors.append(vec)
+    return tuple(map(min, zip(*vectors)))
+
+
+def lsh_candidate_pairs(
+    signatures: Sequence[Tuple[int, ...]],
+    bands: int = MINHASH_BANDS,
+    rows: int = MINHASH_ROWS,
+) -> Set[Tuple[int, int]]:
+    """Find candidate pairs that share at least one LSH band bucket.
+
+    Returns:
+        Set of (i, j) index pairs with i < j
+    """
+    candidates = set()
+    for band in range(bands):
+        start = band * rows
+        buckets = defaultdict(list)
+        for idx, sig in enumerate(signatures):
+            buckets[sig[start:start + rows]].append(idx)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            for a in range(len(members)):
+                for b in range(a + 1, len(members)):
+                    candidates.add((members[a], members[b]))
+    return candidates
+
+
 def find_duplicates(
     items: List[Union[schema.RedditItem, schema.XItem]],
     threshold: float = 0.7,
+    method: str = "auto",
 ) -> List[Tuple[int, int]]:
     """Find near-duplicate pairs in items.
 
     Args:
         items: List of items to check
         threshold: Similarity threshold (0-1)
+        method: 'exact' (all pairs), 'minhash' (LSH candidates verified
+            with exact Jaccard) or 'auto' (minhash from LSH_MIN_ITEMS up)
 
     Returns:
         List of (i, j) index pairs where i < j and items are similar
@@ -62,6 +142,14 @@ def find_duplicates(
     # Pre-compute n-grams
     ngrams = [get_ngrams(get_item_text(item)) for item in items]
 
+    if method == "minhash" or (method == "auto" and len(items) >= LSH_MIN_ITEMS):
+        hash_cache = {}
+        signatures = [minhash_signature(g, hash_cache) for g in ngrams]
+        for i, j in sorted(lsh_candidate_pairs(signatures)):
+            if jaccard_similarity(ngrams[i], ngrams[j]) >= threshold:
+                duplicates.append((i, j))
+        return duplicates
+
     for i in range(len(items)):
         for j in range(i + 1, len(items)):
             similarity = jaccard_similarity(ngrams[i], ngrams[j])
@@ -74,12 +162,14 @@ def find_duplicates(
 def dedupe_items(
     items: List[Union[schema.RedditItem, schema.XItem]],
     threshold: float = 0.7,
+    method: str = "auto",
 ) -> List[Union[schema.RedditItem, schema.XItem]]:
     """Remove near-duplicates, keeping highest-scored item.
 
     Args:
         items: List of items (should be pre-sorted by score descending)
         threshold: Similarity threshold
+        method: Pair finding method (see find_duplicates)
 
     Returns:
         Deduplicated items
@@ -88,7 +178,7 @@ def dedupe_items(
         return items
 
     # Find duplicate pairs
-    dup_pairs = find_duplicates(items, threshold)
+    dup_pairs = find_duplicates(items, threshold, method)
 
     # Mark indices to remove (always remove the lower-scored one)
     # Since items are pre-sorted by score, the second index is always lower
@@ -118,3 +208,170 @@ def dedupe_x(
 ) -> List[schema.XItem]:
     """Dedupe X items."""
     return dedupe_items(items, threshold)
+
+
+# Query parameters that never change which page a URL points to
+TRACKING_PARAMS = {"ref", "ref_src", "ref_url", "s", "t", "fbclid", "gclid", "si", "share_id"}
+URL_PATTERN = re.compile(r'https?://[^\s<>()"\']+')
+
+# Source names and tie-break priority (Reddit > X > WebSearch, as in score.sort_items)
+SOURCE_PRIORITY = {"reddit": 0, "x": 1, "web": 2}
+
+
+def canonicalize_url(url: str) -> Optional[str]:
+    """Canonicalize a URL so syndicated copies of a page compare equal.
+
+    Drops scheme, www/m/old/mobile subdomains, fragments, trailing slashes
+    and tracking parameters; maps twitter.com to x.com; reduces Reddit
+    threads to /r/<sub>/comments/<id> and X posts to /status/<id>.
+
+    Args:
+        url: URL to canonicalize
+
+    Returns:
+        Canonical 'host/path?query' string or None if not a web URL
+    """
+    try:
+        parsed = urlparse(url.strip())
+    except ValueError:
+        return None
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        return None
+
+    host = parsed.hostname.lower()
+    host = re.sub(r'^(www|m|old|mobile|new)\.', '', host)
+    if host == "twitter.com":
+        host = "x.com"
+    path = parsed.path.rstrip("/")
+
+    if host == "reddit.com":
+        match = re.match(r'^(/r/[^/]+/comments/[^/]+)', path)
+        if match:
+            return host + match.group(1).lower()
+    if host == "x.com":
+        match = re.search(r'/status(?:es)?/(\d+)', path)
+        if match:
+            return f"{host}/status/{match.group(1)}"
+
+    query = [
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    ]
+    canonical = host + path
+    if query:
+        canonical += "?" + urlencode(sorted(query))
+    return canonical
+
+
+def _item_source(item) -> str:
+    if isinstance(item, schema.RedditItem):
+        return "reddit"
+    if isinstance(item, schema.XItem):
+        return "x"
+    return "web"
+
+
+def get_item_urls(item: Union[schema.RedditItem, schema.XItem, schema.WebSearchItem]) -> Set[str]:
+    """Canonical URLs an item points to: its own URL, a Reddit link post's
+    target, and links embedded in X post text or web snippets."""
+    urls = [item.url]
+    if isinstance(item, schema.RedditItem) and item.link_url:
+        urls.append(item.link_url)
+    elif isinstance(item, schema.XItem):
+        urls.extend(URL_PATTERN.findall(item.text))
+    elif isinstance(item, schema.WebSearchItem):
+        urls.extend(URL_PATTERN.findall(item.snippet))
+    return {c for c in (canonicalize_url(u) for u in urls if u) if c}
+
+
+def _cross_ref(item) -> Dict[str, Any]:
+    """Summary of a merged duplicate, attached to its representative."""
+    engagement = getattr(item, "engagement", None)
+    return {
+        "source": _item_source(item),
+        "id": item.id,
+        "url": item.url,
+        "score": item.score,
+        "engagement": engagement.to_dict() if engagement else None,
+    }
+
+
+def dedupe_cross_source(
+    reddit_items: List[schema.RedditItem],
+    x_items: List[schema.XItem],
+    web_items: Optional[List[schema.WebSearchItem]] = None,
+    threshold: float = 0.7,
+) -> Tuple[List[schema.RedditItem], List[schema.XItem], List[schema.WebSearchItem]]:
+    """Cluster the same story across Reddit, X and web and keep one copy.
+
+    Builds one index over all items: items sharing a canonical URL, or
+    whose texts are near-duplicates (same n-gram Jaccard test as
+    dedupe_items), land in the same cluster. Each cluster keeps its
+    highest-scored item (Reddit > X > web on ties); the others are
+    removed and summarized in the representative's cross_refs, so their
+    engagement stays visible. Run this after per-source dedupe.
+
+    Args:
+        reddit_items: Scored Reddit items
+        x_items: Scored X items
+        web_items: Scored WebSearch items
+        threshold: Text similarity threshold
+
+    Returns:
+        Tuple of (reddit_items, x_items, web_items) with duplicates removed,
+        each in its original order
+    """
+    web_items = web_items or []
+    items = list(reddit_items) + list(x_items) + list(web_items)
+    if len(items) <= 1:
+        return reddit_items, x_items, web_items
+
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    sources = [_item_source(item) for item in items]
+
+    # Shared URL index
+    url_owner: Dict[str, int] = {}
+    for idx, item in enumerate(items):
+        for url in get_item_urls(item):
+            if url in url_owner:
+                union(url_owner[url], idx)
+            else:
+                url_owner[url] = idx
+
+    # Text similarity, only across sources (within-source is dedupe_items' job)
+    for i, j in find_duplicates(items, threshold):
+        if sources[i] != sources[j]:
+            union(i, j)
+
+    clusters: Dict[int, List[int]] = defaultdict(list)
+    for idx in range(len(items)):
+        clusters[find(idx)].append(idx)
+
+    removed = set()
+    for members in clusters.values():
+        if len(members) < 2:
+            continue
+        best = min(members, key=lambda idx: (-items[idx].score, SOURCE_PRIORITY[sources[idx]], idx))
+        for idx in members:
+            if idx != best:
+                items[best].cross_refs.append(_cross_ref(items[idx]))
+                removed.add(idx)
+
+    kept = [item for idx, item in enumerate(items) if idx not in removed]
+    return (
+        [item for item in kept if isinstance(item, schema.RedditItem)],
+        [item for item in kept if isinstance(item, schema.XItem)],
+        [item for item in kept if isinstance(item, schema.WebSearchItem)],
+    )
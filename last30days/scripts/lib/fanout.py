@@ -0,0 +1,67 @@
+"""Bounded parallel fan-out for Phase 2 supplemental searches."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, List, Optional, Sequence
+
+from . import budget, runstate
+
+# Concurrent requests per fan-out (one per subreddit/handle, capped)
+DEFAULT_MAX_WORKERS = 5
+
+# Per-request timeout and overall deadline for one fan-out, in seconds
+DEFAULT_REQUEST_TIMEOUT = 15.0
+DEFAULT_DEADLINE = 30.0
+
+
+def fan_out(
+    fn: Callable[[Any, float], Any],
+    args: Sequence[Any],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    deadline: float = DEFAULT_DEADLINE,
+) -> List[Optional[Any]]:
+    """Call fn(arg, timeout) for each arg concurrently.
+
+    Each call gets a timeout of request_timeout, clamped to the time left
+    before the shared deadline (itself capped by the run budget), so no
+    call outlives the deadline by much.
+    Calls that have not finished by the deadline, or that raise, yield
+    None; fn is expected to log its own failures.
+
+    Args:
+        fn: Function taking (arg, timeout_seconds)
+        args: One argument per call
+        max_workers: Maximum concurrent calls
+        request_timeout: Timeout for each call in seconds
+        deadline: Overall time budget in seconds
+
+    Returns:
+        Results in the same order as args
+    """
+    if not args:
+        return []
+
+    left = budget.remaining()
+    if left is not None:
+        deadline = min(deadline, left)
+    deadline_at = time.monotonic() + deadline
+
+    def call(arg):
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            return None
+        return fn(arg, min(request_timeout, remaining))
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(args))))
+    try:
+        futures = [executor.submit(runstate.bind(call), arg) for arg in args]
+        done, _ = wait(futures, timeout=max(0.0, deadline_at - time.monotonic()))
+    finally:
+        # Don't block on stragglers; their own timeouts are clamped to the deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return [
+        f.result() if f in done and f.exception() is None else None
+        for f in futures
+    ]
@@ -0,0 +1,229 @@
+"""Engagement history store for last30days skill.
+
+Reports in render.OUTPUT_DIR are overwritten on every run. With
+--history, each run also appends one engagement snapshot per Reddit/X
+item to a local SQLite file, keyed by topic, capture day and URL. The
+snapshots answer "how did this item's engagement evolve" and give an
+engagement velocity that score.py can use as a recency signal without
+any extra fetches.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from . import score
+
+HISTORY_DB_FILE = Path(os.environ.get(
+    "LAST30DAYS_HISTORY_DB",
+    str(Path.home() / ".local" / "share" / "last30days" / "history.sqlite3"),
+))
+BUSY_TIMEOUT_SECONDS = 30
+
+# Velocity compares an item's latest snapshot with the most recent one at
+# least VELOCITY_MIN_SPAN_HOURS older, looking back VELOCITY_WINDOW_DAYS
+VELOCITY_MIN_SPAN_HOURS = 6
+VELOCITY_WINDOW_DAYS = 7
+
+# URLs per SELECT (SQLite's bound parameter limit is 999 on old builds)
+QUERY_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    topic TEXT NOT NULL,
+    day TEXT NOT NULL,
+    url TEXT NOT NULL,
+    source TEXT NOT NULL,
+    captured REAL NOT NULL,
+    item_date TEXT,
+    score INTEGER,
+    num_comments INTEGER,
+    upvote_ratio REAL,
+    likes INTEGER,
+    reposts INTEGER,
+    replies INTEGER,
+    quotes INTEGER,
+    engagement_raw REAL
+);
+CREATE INDEX IF NOT EXISTS snapshots_topic_day ON snapshots (topic, day);
+CREATE INDEX IF NOT EXISTS snapshots_url_captured ON snapshots (url, captured);
+"""
+
+COLUMNS = (
+    "topic", "day", "url", "source", "captured", "item_date",
+    "score", "num_comments", "upvote_ratio", "likes", "reposts", "replies", "quotes",
+    "engagement_raw",
+)
+
+
+def topic_key(topic: str) -> str:
+    """Topic as stored (case and surrounding whitespace ignored)."""
+    return " ".join(topic.lower().split())
+
+
+class HistoryStore:
+    """Append-only engagement snapshots in one SQLite file."""
+
+    def __init__(self, path: Path = HISTORY_DB_FILE):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, creating the database if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path),
+                timeout=BUSY_TIMEOUT_SECONDS,
+                isolation_level=None,  # Explicit transactions below
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def record(
+        self,
+        topic: str,
+        reddit_items: Iterable[Any] = (),
+        x_items: Iterable[Any] = (),
+        captured: Optional[float] = None,
+    ) -> int:
+        """Append one snapshot per item that has engagement.
+
+        Args:
+            topic: Research topic
+            reddit_items: schema.RedditItem objects
+            x_items: schema.XItem objects
+            captured: Capture time (epoch seconds, default now)
+
+        Returns:
+            Number of snapshots written (0 if the store can't be written)
+        """
+        if captured is None:
+            captured = time.time()
+        day = datetime.fromtimestamp(captured, tz=timezone.utc).strftime("%Y-%m-%d")
+        key = topic_key(topic)
+
+        reddit_items = [item for item in reddit_items if item.engagement and item.url]
+        x_items = [item for item in x_items if item.engagement and item.url]
+        reddit_raw = score.reddit_engagement_raw_batch([item.engagement for item in reddit_items])
+        x_raw = score.x_engagement_raw_batch([item.engagement for item in x_items])
+
+        rows = []
+        for source, items, raws in (("reddit", reddit_items, reddit_raw), ("x", x_items, x_raw)):
+            for item, raw in zip(items, raws):
+                e = item.engagement
+                rows.append((
+                    key, day, item.url, source, captured, item.date,
+                    e.score, e.num_comments, e.upvote_ratio, e.likes, e.reposts, e.replies, e.quotes,
+                    raw,
+                ))
+        if not rows:
+            return 0
+
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    f"INSERT INTO snapshots ({', '.join(COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                    rows,
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            return 0
+        return len(rows)
+
+    def snapshots(self, topic: str, from_day: str, to_day: str) -> List[Dict[str, Any]]:
+        """Snapshots captured for a topic between two days (inclusive).
+
+        Args:
+            topic: Research topic
+            from_day: First capture day (YYYY-MM-DD)
+            to_day: Last capture day (YYYY-MM-DD)
+
+        Returns:
+            Snapshot dicts (keys as in COLUMNS), oldest first
+        """
+        try:
+            cursor = self._connect().execute(
+                f"SELECT {', '.join(COLUMNS)} FROM snapshots "
+                "WHERE topic = ? AND day BETWEEN ? AND ? ORDER BY captured, url",
+                (topic_key(topic), from_day, to_day),
+            )
+            return [dict(zip(COLUMNS, row)) for row in cursor]
+        except sqlite3.Error:
+            return []
+
+    def velocity(
+        self,
+        urls: Iterable[str],
+        min_span_hours: float = VELOCITY_MIN_SPAN_HOURS,
+        window_days: float = VELOCITY_WINDOW_DAYS,
+        now: Optional[float] = None,
+    ) -> Dict[str, float]:
+        """Engagement velocity per URL, in raw engagement units per day.
+
+        Raw engagement is score.py's log-scaled composite, so velocity
+        measures relative growth: a post going from 10 to 100 upvotes
+        moves as much as one going from 100 to 1000. Snapshots from any
+        topic count, since engagement belongs to the URL.
+
+        Args:
+            urls: Item URLs
+            min_span_hours: Minimum time between the two snapshots compared
+            window_days: How far back to look for snapshots
+            now: Reference time (epoch seconds, default now)
+
+        Returns:
+            Dict mapping URL to velocity, for URLs with enough history
+        """
+        if now is None:
+            now = time.time()
+        since = now - window_days * 86400
+        min_span = min_span_hours * 3600
+        unique = list(dict.fromkeys(urls))
+        result = {}
+        try:
+            conn = self._connect()
+            for start in range(0, len(unique), QUERY_BATCH_SIZE):
+                batch = unique[start:start + QUERY_BATCH_SIZE]
+                series: Dict[str, List[tuple]] = {}
+                for url, captured, raw in conn.execute(
+                    "SELECT url, captured, engagement_raw FROM snapshots "
+                    f"WHERE url IN ({', '.join('?' * len(batch))}) AND captured >= ? "
+                    "AND engagement_raw IS NOT NULL ORDER BY url, captured",
+                    (*batch, since),
+                ):
+                    series.setdefault(url, []).append((captured, raw))
+                for url, points in series.items():
+                    last_at, last_raw = points[-1]
+                    for at, raw in reversed(points[:-1]):
+                        if last_at - at >= min_span:
+                            result[url] = (last_raw - raw) / ((last_at - at) / 86400)
+                            break
+        except sqlite3.Error:
+            return result
+        return result
+
+
+_store = None
+
+
+def get_store() -> HistoryStore:
+    """Get the shared history store."""
+    global _store
+    if _store is None:
+        _store = HistoryStore(HISTORY_DB_FILE)
+    return _store
@@ -1,13 +1,25 @@
 """HTTP utilities for last30days skill (stdlib only)."""
 
+import http.client as http_client
+import io
 import json
 import os
+import queue
+import random
+import socket
+import ssl
 import sys
+import threading
 import time
 import urllib.error
 import urllib.request
-from typing import Any, Dict, Optional
-from urllib.parse import urlencode
+import zlib
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode, urljoin, urlparse
+
+from . import budget
 
 DEFAULT_TIMEOUT = 30
 DEBUG = os.environ.get("LAST30DAYS_DEBUG", "").lower() in ("1", "true", "yes")
@@ -19,9 +31,665 @@ def log(msg: str):
         sys.stderr.write(f"[DEBUG] {msg}\n")
         sys.stderr.flush()
 MAX_RETRIES = 3
-RETRY_DELAY = 1.0
+RETRY_DELAY = 1.0       # Base delay for exponential backoff
+RETRY_MAX_DELAY = 30.0  # Cap on one backoff; longer Retry-After values aren't waited out
 USER_AGENT = "last30days-skill/2.0 (Claude Code Skill)"
 
+# Compressed responses are decoded as they are read, READ_CHUNK_SIZE at a time
+ACCEPT_ENCODING = "gzip, deflate"
+READ_CHUNK_SIZE = 64 * 1024
+
+# Per-site request rate limits: site -> (requests per second, burst size).
+# Reddit's unauthenticated JSON endpoints start returning 429s quickly when
+# hit in parallel, so concurrent enrichment is throttled here. A site's
+# subdomains (www., old., ...) share its limit; see rate_limit_key.
+RATE_LIMITS = {
+    "reddit.com": (4.0, 4),
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+# rate_limit_key -> monotonic time before which no request should be sent,
+# set from Retry-After / x-ratelimit-* headers
+_host_pauses: Dict[str, float] = {}
+
+
+def rate_limit_key(host: str) -> str:
+    """Key a host's rate limit and pauses are tracked under.
+
+    Subdomains of a site in RATE_LIMITS map to that site, so traffic
+    spread over www.reddit.com, reddit.com and old.reddit.com shares one
+    bucket. Other hosts are their own key.
+    """
+    host = host.lower().rstrip(".")
+    for site in RATE_LIMITS:
+        if host == site or host.endswith("." + site):
+            return site
+    return host
+
+
+def host_pause_remaining(url: str) -> float:
+    """Seconds left on a rate-limit pause for the URL's host (0 if none)."""
+    host = rate_limit_key(urlparse(url).hostname or "")
+    with _buckets_lock:
+        resume_at = _host_pauses.get(host, 0.0)
+    return max(0.0, resume_at - time.monotonic())
+
+
+def pause_host(host: str, seconds: float):
+    """Hold back requests to a host for `seconds` (extends, never shortens)."""
+    resume_at = time.monotonic() + seconds
+    host = rate_limit_key(host)
+    with _buckets_lock:
+        if resume_at > _host_pauses.get(host, 0.0):
+            _host_pauses[host] = resume_at
+    log(f"Pausing {host} for {seconds:.1f}s (rate limited)")
+
+
+def throttle(url: str):
+    """Wait out any rate-limit pause and the rate limiter of the URL's host."""
+    host = rate_limit_key(urlparse(url).hostname or "")
+    with _buckets_lock:
+        resume_at = _host_pauses.get(host, 0.0)
+    wait = resume_at - time.monotonic()
+    if wait > 0:
+        log(f"Waiting {wait:.1f}s for {host} rate limit")
+        left = budget.remaining()
+        time.sleep(wait if left is None else min(wait, left))
+
+    limit = RATE_LIMITS.get(host)
+    if not limit:
+        return
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = _buckets[host] = TokenBucket(*limit)
+    bucket.acquire()
+
+
+def retry_after_seconds(headers) -> Optional[float]:
+    """How long a response asks us to wait, from its headers.
+
+    Reads Retry-After (seconds or HTTP date), then Reddit-style
+    x-ratelimit-remaining / x-ratelimit-reset (wait only when no
+    requests remain in the window).
+
+    Args:
+        headers: Response headers (http.client.HTTPMessage or dict-like)
+
+    Returns:
+        Seconds to wait, or None if the headers don't say
+    """
+    if headers is None:
+        return None
+    value = headers.get("Retry-After")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(value)
+                return max(0.0, retry_at.timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    remaining = headers.get("x-ratelimit-remaining")
+    reset = headers.get("x-ratelimit-reset")
+    if remaining is not None and reset is not None:
+        try:
+            if float(remaining) < 1:
+                return max(0.0, float(reset))
+        except ValueError:
+            pass
+    return None
+
+
+def _note_rate_limit(url: str, headers):
+    """Pause the host when a response says its rate limit is used up."""
+    wait = retry_after_seconds(headers)
+    if wait:
+        pause_host(urlparse(url).hostname or "", wait)
+
+
+# Circuit breaker: after this many consecutive failed attempts against a host
+# (5xx, 429, timeouts, connection errors) requests to it fail fast for
+# BREAKER_RESET_TIMEOUT seconds, then a single trial request is let through
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30.0
+
+
+class CircuitBreaker:
+    """Thread-safe closed/open/half-open circuit breaker for one host."""
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half-open'."""
+        with self.lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (claims the half-open trial)."""
+        with self.lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(url_or_host: str) -> CircuitBreaker:
+    """Get the shared circuit breaker for a URL's host (or a bare host)."""
+    host = urlparse(url_or_host).hostname if "://" in url_or_host else url_or_host
+    host = host or ""
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker()
+        return breaker
+
+
+def host_available(url_or_host: str) -> bool:
+    """False while a host's circuit breaker is open (known to be failing)."""
+    return get_breaker(url_or_host).state != "open"
+
+
+def breaker_states() -> Dict[str, str]:
+    """Current breaker state per host that has been contacted."""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {host: breaker.state for host, breaker in breakers.items()}
+
+
+# Keep-alive connection pool limits
+POOL_MAX_PER_HOST = 8
+POOL_IDLE_TIMEOUT = 60.0
+MAX_REDIRECTS = 5
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+_ssl_context = ssl.create_default_context()
+
+
+class ConnectionPool:
+    """Thread-safe pool of persistent HTTP(S) connections, keyed by host.
+
+    At most `max_per_host` connections (idle + in use) exist per host;
+    callers block until one is released. Idle connections older than
+    `idle_timeout` seconds are closed instead of being reused.
+    """
+
+    def __init__(self, max_per_host: int = POOL_MAX_PER_HOST, idle_timeout: float = POOL_IDLE_TIMEOUT):
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self._idle: Dict[Tuple, List[Tuple[http_client.HTTPConnection, float]]] = {}
+        self._in_use: Dict[Tuple, int] = {}
+        self._cond = threading.Condition()
+        self.created = 0
+        self.reused = 0
+
+    def _new_connection(self, key: Tuple, timeout: float) -> http_client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            return http_client.HTTPSConnection(host, port, timeout=timeout, context=_ssl_context)
+        return http_client.HTTPConnection(host, port, timeout=timeout)
+
+    def acquire(self, key: Tuple, timeout: float) -> Tuple[http_client.HTTPConnection, bool]:
+        """Get a connection for key.
+
+        Returns:
+            Tuple of (connection, reused)
+        """
+        with self._cond:
+            while True:
+                idle = self._idle.get(key, [])
+                now = time.monotonic()
+                while idle:
+                    conn, last_used = idle.pop()
+                    if now - last_used < self.idle_timeout:
+                        self._in_use[key] = self._in_use.get(key, 0) + 1
+                        self.reused += 1
+                        conn.timeout = timeout
+                        if conn.sock is not None:
+                            conn.sock.settimeout(timeout)
+                        return conn, True
+                    conn.close()
+                if self._in_use.get(key, 0) < self.max_per_host:
+                    self._in_use[key] = self._in_use.get(key, 0) + 1
+                    self.created += 1
+                    break
+                self._cond.wait()
+        return self._new_connection(key, timeout), False
+
+    def release(self, key: Tuple, conn: http_client.HTTPConnection, reusable: bool):
+        """Return a connection to the pool (or close it if not reusable)."""
+        with self._cond:
+            self._in_use[key] = max(0, self._in_use.get(key, 0) - 1)
+            if reusable:
+                self._idle.setdefault(key, []).append((conn, time.monotonic()))
+            else:
+                conn.close()
+            self._cond.notify()
+
+    def close_all(self):
+        """Close every idle connection."""
+        with self._cond:
+            for conns in self._idle.values():
+                for conn, _ in conns:
+                    conn.close()
+            self._idle.clear()
+
+
+_pool = ConnectionPool()
+
+
+def get_pool() -> ConnectionPool:
+    """Get the shared connection pool."""
+    return _pool
+
+
+def _uses_proxy(url: str) -> bool:
+    """Check if urllib would route this URL through a configured proxy."""
+    parsed = urlparse(url)
+    proxies = urllib.request.getproxies()
+    if parsed.scheme not in proxies:
+        return False
+    return not urllib.request.proxy_bypass(parsed.hostname or "")
+
+
+_transfer_stats = {"responses": 0, "wire_bytes": 0, "body_bytes": 0}
+_transfer_lock = threading.Lock()
+
+
+def _read_body(response, encoding: Optional[str]) -> bytes:
+    """Read a response body, decompressing gzip/deflate while streaming.
+
+    Args:
+        response: http.client.HTTPResponse (or anything with read(n))
+        encoding: The response's Content-Encoding header, if any
+
+    Returns:
+        Decoded body bytes
+
+    Raises:
+        zlib.error: If the body is not valid for its encoding or the
+            compressed stream is cut off
+    """
+    encoding = (encoding or "").strip().lower()
+    if encoding not in ("gzip", "x-gzip", "deflate"):
+        body = response.read()
+        _record_transfer(len(body), len(body))
+        return body
+
+    # 32 + MAX_WBITS accepts both gzip and zlib headers; some servers send
+    # "deflate" as a raw stream with neither, handled on the first chunk
+    decoder = zlib.decompressobj(32 + zlib.MAX_WBITS)
+    parts = []
+    wire_bytes = 0
+    while True:
+        chunk = response.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        try:
+            parts.append(decoder.decompress(chunk))
+        except zlib.error:
+            if wire_bytes or encoding != "deflate":
+                raise
+            decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+            parts.append(decoder.decompress(chunk))
+        wire_bytes += len(chunk)
+    parts.append(decoder.flush())
+    if not decoder.eof:
+        raise zlib.error(f"Truncated {encoding} stream after {wire_bytes} bytes")
+
+    body = b"".join(parts)
+    _record_transfer(wire_bytes, len(body))
+    log(f"Decoded {encoding} body: {wire_bytes} -> {len(body)} bytes")
+    return body
+
+
+def _record_transfer(wire_bytes: int, body_bytes: int):
+    with _transfer_lock:
+        _transfer_stats["responses"] += 1
+        _transfer_stats["wire_bytes"] += wire_bytes
+        _transfer_stats["body_bytes"] += body_bytes
+
+
+def transfer_stats() -> Dict[str, int]:
+    """Response count and bytes received (on the wire and decoded) so far."""
+    with _transfer_lock:
+        return dict(_transfer_stats)
+
+
+def log_transfer_stats():
+    """Log the run's compressed vs. uncompressed byte totals (debug output only)."""
+    stats = transfer_stats()
+    if not stats["responses"]:
+        return
+    saved = 1 - stats["wire_bytes"] / stats["body_bytes"] if stats["body_bytes"] else 0.0
+    log(f"Transfer: {stats['responses']} responses, {stats['wire_bytes']} bytes received, "
+        f"{stats['body_bytes']} bytes decoded ({saved:.0%} saved by compression)")
+
+
+def _pooled_open(
+    req: urllib.request.Request,
+    timeout: float,
+    hedge_attempt: Optional["_HedgeAttempt"] = None,
+) -> Tuple[int, bytes]:
+    """Send a request over a pooled keep-alive connection.
+
+    Follows redirects and raises urllib.error.HTTPError for error statuses,
+    mirroring urllib.request.urlopen. A connection used by a hedged
+    attempt that was abandoned is closed rather than pooled.
+    """
+    method = req.get_method()
+    url = req.full_url
+    data = req.data
+    headers = dict(req.header_items())
+
+    for _ in range(MAX_REDIRECTS + 1):
+        parsed = urlparse(url)
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        key = (parsed.scheme, parsed.hostname, port)
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+
+        conn, reused = _pool.acquire(key, timeout)
+        try:
+            if hedge_attempt is not None:
+                hedge_attempt.track(conn)
+            try:
+                conn.request(method, path, body=data, headers=headers)
+                response = conn.getresponse()
+            except (http_client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                if not reused or (hedge_attempt is not None and hedge_attempt.abandoned):
+                    raise
+                # The server closed an idle keep-alive connection; retry once fresh
+                conn.close()
+                conn.request(method, path, body=data, headers=headers)
+                response = conn.getresponse()
+            body = _read_body(response, response.getheader("Content-Encoding"))
+        except BaseException:
+            _pool.release(key, conn, False)
+            raise
+        finally:
+            if hedge_attempt is not None:
+                hedge_attempt.track(None)
+        abandoned = hedge_attempt is not None and hedge_attempt.abandoned
+        _pool.release(key, conn, not response.will_close and not abandoned)
+
+        status = response.status
+        _note_rate_limit(url, response.msg)
+        if status in REDIRECT_CODES and response.getheader("Location"):
+            url = urljoin(url, response.getheader("Location"))
+            if status == 303 or (status in (301, 302) and method == "POST"):
+                method, data = "GET", None
+                # header_items() capitalizes names as "Content-type"
+                headers = {
+                    name: value for name, value in headers.items()
+                    if name.lower() not in ("content-type", "content-length")
+                }
+            continue
+        if status >= 400:
+            raise urllib.error.HTTPError(url, status, response.reason, response.msg, io.BytesIO(body))
+        return status, body
+
+    raise urllib.error.HTTPError(url, status, "Too many redirects", response.msg, io.BytesIO(body))
+
+
+def _open(
+    req: urllib.request.Request,
+    timeout: float,
+    hedge_attempt: Optional["_HedgeAttempt"] = None,
+) -> Tuple[int, bytes]:
+    """Send a request and return (status, body bytes)."""
+    if _uses_proxy(req.full_url):
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                _note_rate_limit(req.full_url, response.headers)
+                return response.status, _read_body(response, response.headers.get("Content-Encoding"))
+        except urllib.error.HTTPError as e:
+            _note_rate_limit(req.full_url, e.headers)
+            body = _read_body(e, e.headers.get("Content-Encoding"))
+            raise urllib.error.HTTPError(e.url, e.code, e.msg, e.headers, io.BytesIO(body))
+    return _pooled_open(req, timeout, hedge_attempt)
+
+
+# Request hedging (opt-in, see set_hedging): a hedgeable GET that hasn't
+# answered within the host's recent HEDGE_PERCENTILE latency gets a
+# duplicate, and whichever response arrives first wins
+HEDGE_PERCENTILE = 0.95
+HEDGE_MIN_SAMPLES = 20      # Latencies needed before a threshold is trusted
+HEDGE_WINDOW = 200          # Recent latencies kept per host
+HEDGE_MIN_DELAY = 0.05      # Never hedge sooner than this, in seconds
+HEDGE_MAX_FRACTION = 0.1    # Duplicates allowed per hedgeable request (global cap)
+
+_hedging_enabled = False
+_latencies: Dict[str, deque] = {}
+_hedge_stats = {"requests": 0, "hedged": 0, "wins": 0}
+_hedge_lock = threading.Lock()
+
+
+def set_hedging(enabled: bool):
+    """Turn request hedging on or off and reset its statistics."""
+    global _hedging_enabled
+    with _hedge_lock:
+        _hedging_enabled = enabled
+        _latencies.clear()
+        _hedge_stats.update(requests=0, hedged=0, wins=0)
+
+
+def record_latency(host: str, seconds: float):
+    """Add a response time to the host's hedging window."""
+    with _hedge_lock:
+        samples = _latencies.get(host)
+        if samples is None:
+            samples = _latencies[host] = deque(maxlen=HEDGE_WINDOW)
+        samples.append(seconds)
+
+
+def hedge_delay(host: str) -> Optional[float]:
+    """How long to wait before hedging a request to host.
+
+    Returns:
+        The HEDGE_PERCENTILE of recent latencies (at least HEDGE_MIN_DELAY),
+        or None until HEDGE_MIN_SAMPLES responses have been seen
+    """
+    with _hedge_lock:
+        samples = sorted(_latencies.get(host, ()))
+    if len(samples) < HEDGE_MIN_SAMPLES:
+        return None
+    return max(HEDGE_MIN_DELAY, samples[int(HEDGE_PERCENTILE * (len(samples) - 1))])
+
+
+def _claim_hedge() -> bool:
+    """Reserve one duplicate request if the global cap allows it."""
+    with _hedge_lock:
+        if _hedge_stats["hedged"] + 1 > HEDGE_MAX_FRACTION * _hedge_stats["requests"]:
+            return False
+        _hedge_stats["hedged"] += 1
+        return True
+
+
+def hedge_stats() -> Dict[str, int]:
+    """Counts of hedgeable requests, duplicates sent and duplicates that won."""
+    with _hedge_lock:
+        return dict(_hedge_stats)
+
+
+def log_hedge_stats():
+    """Log hedging counts and win rate (debug output only)."""
+    stats = hedge_stats()
+    if not stats["requests"]:
+        return
+    win_rate = stats["wins"] / stats["hedged"] if stats["hedged"] else 0.0
+    log(f"Hedging: {stats['hedged']} of {stats['requests']} requests hedged, "
+        f"{stats['wins']} hedges won ({win_rate:.0%})")
+
+
+class _HedgeAttempt:
+    """One attempt of a hedged request, which can be abandoned once the other wins.
+
+    Abandoning shuts down the socket the attempt is using, so its pending
+    read fails at once and the pool slot is freed, and keeps the
+    connection from being returned to the pool.
+    """
+
+    def __init__(self):
+        self.abandoned = False
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def track(self, conn: Optional[http_client.HTTPConnection]):
+        """Record the connection the attempt is currently using (or None)."""
+        with self._lock:
+            self._conn = conn
+            if conn is not None and self.abandoned:
+                self._shutdown(conn)
+
+    def abandon(self):
+        """Give up on the attempt and cut off its connection."""
+        with self._lock:
+            self.abandoned = True
+            if self._conn is not None:
+                self._shutdown(self._conn)
+
+    @staticmethod
+    def _shutdown(conn: http_client.HTTPConnection):
+        if conn.sock is not None:
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+def _hedged_open(req: urllib.request.Request, timeout: float) -> Tuple[int, bytes]:
+    """Like _open, but sends a duplicate if the first attempt is slow.
+
+    The duplicate goes through throttle() like any other request. Once
+    one attempt succeeds the other is abandoned (its connection is shut
+    down, not pooled). The whole call gives up after `timeout` seconds.
+    """
+    host = urlparse(req.full_url).hostname or ""
+    delay = hedge_delay(host)
+    with _hedge_lock:
+        _hedge_stats["requests"] += 1
+
+    start = time.monotonic()
+    if delay is None:
+        result = _open(req, timeout)
+        record_latency(host, time.monotonic() - start)
+        return result
+
+    results: "queue.Queue" = queue.Queue()
+    attempts = {False: _HedgeAttempt(), True: _HedgeAttempt()}
+    give_up_at = start + timeout
+
+    def attempt(is_hedge: bool):
+        try:
+            if is_hedge:
+                throttle(req.full_url)
+            results.put((is_hedge, _open(req, timeout, attempts[is_hedge]), None))
+        except BaseException as e:
+            results.put((is_hedge, None, e))
+
+    def next_result():
+        try:
+            return results.get(timeout=max(0.0, give_up_at - time.monotonic()))
+        except queue.Empty:
+            for pending_attempt in attempts.values():
+                pending_attempt.abandon()
+            raise TimeoutError(f"Hedged request to {host} timed out after {timeout}s") from None
+
+    threading.Thread(target=attempt, args=(False,), daemon=True).start()
+    pending = 1
+    try:
+        is_hedge, result, error = results.get(timeout=min(delay, timeout))
+        pending = 0
+    except queue.Empty:
+        if _claim_hedge():
+            log(f"Hedging slow request to {host} after {delay:.2f}s")
+            threading.Thread(target=attempt, args=(True,), daemon=True).start()
+            pending = 2
+        is_hedge, result, error = next_result()
+        pending -= 1
+
+    # The first attempt to finish failed; the other one may still succeed
+    if error is not None and pending:
+        is_hedge, result, error = next_result()
+        pending = 0
+    if pending:
+        attempts[not is_hedge].abandon()
+    if error is not None:
+        raise error
+
+    if is_hedge:
+        with _hedge_lock:
+            _hedge_stats["wins"] += 1
+    record_latency(host, time.monotonic() - start)
+    return result
+
 
 class HTTPError(Exception):
     """HTTP request error with status code."""
@@ -31,6 +699,28 @@ class HTTPError(Exception):
         self.body = body
 
 
+class CircuitOpenError(HTTPError):
+    """Request refused because the host's circuit breaker is open."""
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for a retry.
+
+    Args:
+        attempt: Zero-based number of the attempt that just failed
+
+    Returns:
+        Seconds to wait, uniform in [0, min(RETRY_MAX_DELAY, RETRY_DELAY * 2**attempt)]
+    """
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_DELAY * (2 ** attempt)))
+
+
+def _retry_sleep(delay: float):
+    """Wait before a retry, never past the run budget."""
+    left = budget.remaining()
+    time.sleep(delay if left is None else min(delay, left))
+
+
 def request(
     method: str,
     url: str,
@@ -38,9 +728,16 @@ def request(
     json_data: Optional[Dict[str, Any]] = None,
     timeout: int = DEFAULT_TIMEOUT,
     retries: int = MAX_RETRIES,
+    hedge: bool = False,
 ) -> Dict[str, Any]:
     """Make an HTTP request and return JSON response.
 
+    Retries 5xx, 429 and connection errors with jittered exponential
+    backoff. A 429 whose Retry-After (or x-ratelimit-reset) is short is
+    waited out; a longer one ends the retries. Every attempt is reported
+    to the host's circuit breaker, and while that is open the request
+    fails fast with CircuitOpenError.
+
     Args:
         method: HTTP method (GET, POST, etc.)
         url: Request URL
@@ -48,6 +745,8 @@ def request(
         json_data: Optional JSON body (for POST)
         timeout: Request timeout in seconds
         retries: Number of retries on failure
+        hedge: Allow hedging this request (idempotent GETs only, and
+            only while set_hedging(True) is in effect)
 
     Returns:
         Parsed JSON response
@@ -57,6 +756,7 @@ def request(
     """
     headers = headers or {}
     headers.setdefault("User-Agent", USER_AGENT)
+    headers.setdefault("Accept-Encoding", ACCEPT_ENCODING)
 
     data = None
     if json_data is not None:
@@ -64,6 +764,8 @@ def request(
         headers.setdefault("Content-Type", "application/json")
 
     req = urllib.request.Request(url, data=data, headers=headers, method=method)
+    breaker = get_breaker(url)
+    opener = _hedged_open if hedge and _hedging_enabled and method == "GET" else _open
 
     log(f"{method} {url}")
     if json_data:
@@ -71,11 +773,25 @@ def request(
 
     last_error = None
     for attempt in range(retries):
+        if budget.expired():
+            budget.mark_partial("run budget exhausted")
+            last_error = last_error or HTTPError("Run budget exhausted")
+            break
+        paused = host_pause_remaining(url)
+        if paused > RETRY_MAX_DELAY:
+            log(f"Rate limited for another {paused:.0f}s, giving up")
+            raise last_error or HTTPError(f"HTTP 429: rate limited for {paused:.0f}s", 429)
+        if not breaker.allow():
+            log(f"Circuit open for {urlparse(url).hostname}, failing fast")
+            raise CircuitOpenError(f"Circuit open for {urlparse(url).hostname}")
+        throttle(url)
+        delay = None
         try:
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                body = response.read().decode('utf-8')
-                log(f"Response: {response.status} ({len(body)} bytes)")
-                return json.loads(body) if body else {}
+            status, raw = opener(req, budget.clamp(timeout))
+            breaker.record_success()
+            body = raw.decode('utf-8')
+            log(f"Response: {status} ({len(body)} bytes)")
+            return json.loads(body) if body else {}
         except urllib.error.HTTPError as e:
             body = None
             try:
@@ -87,27 +803,43 @@ def request(
                 log(f"Error body: {body[:500]}")
             last_error = HTTPError(f"HTTP {e.code}: {e.reason}", e.code, body)
 
-            # Don't retry client errors (4xx) except rate limits
+            # Don't retry client errors (4xx) except rate limits; the host
+            # itself is healthy, so they don't count against the breaker
             if 400 <= e.code < 500 and e.code != 429:
+                breaker.record_success()
                 raise last_error
+            breaker.record_failure()
 
-            if attempt < retries - 1:
-                time.sleep(RETRY_DELAY * (attempt + 1))
+            # The host pause set from the headers is waited out by throttle()
+            if e.code == 429 and retry_after_seconds(e.headers) is not None:
+                delay = 0.0
         except urllib.error.URLError as e:
             log(f"URL Error: {e.reason}")
             last_error = HTTPError(f"URL Error: {e.reason}")
-            if attempt < retries - 1:
-                time.sleep(RETRY_DELAY * (attempt + 1))
+            breaker.record_failure()
         except json.JSONDecodeError as e:
             log(f"JSON decode error: {e}")
             last_error = HTTPError(f"Invalid JSON response: {e}")
             raise last_error
-        except (OSError, TimeoutError, ConnectionResetError) as e:
+        except zlib.error as e:
+            log(f"Decompression error: {e}")
+            last_error = HTTPError(f"Invalid compressed response: {e}")
+            breaker.record_failure()
+            raise last_error
+        except (OSError, TimeoutError, ConnectionResetError, http_client.HTTPException) as e:
             # Handle socket-level errors (connection reset, timeout, etc.)
+            # and broken responses (IncompleteRead, BadStatusLine, ...)
             log(f"Connection error: {type(e).__name__}: {e}")
             last_error = HTTPError(f"Connection error: {type(e).__name__}: {e}")
-            if attempt < retries - 1:
-                time.sleep(RETRY_DELAY * (attempt + 1))
+            breaker.record_failure()
+        except BaseException:
+            # Anything else still has to settle the attempt, or a failed
+            # half-open trial would leave the breaker refusing forever
+            breaker.record_failure()
+            raise
+
+        if attempt < retries - 1:
+            _retry_sleep(backoff_delay(attempt) if delay is None else delay)
 
     if last_error:
         raise last_error
@@ -124,11 +856,112 @@ def post(url: str, json_data: Dict[str, Any], headers: Optional[Dict[str, str]]
     return request("POST", url, headers=headers, json_data=json_data, **kwargs)
 
 
-def get_reddit_json(path: str) -> Dict[str, Any]:
-    """Fetch Reddit thread JSON.
+def post_stream(
+    url: str,
+    json_data: Dict[str, Any],
+    headers: Optional[Dict[str, str]] = None,
+    timeout: int = DEFAULT_TIMEOUT,
+    retries: int = MAX_RETRIES,
+) -> Iterator[bytes]:
+    """POST a JSON body and yield the response line by line as it arrives.
+
+    For server-sent event streams (see sse.py). The stream gets its own
+    connection rather than a pooled one, and the timeout applies to each
+    read rather than the whole response. Opening the stream is retried
+    like request() (5xx, 429 and connection errors, with backoff); once
+    lines have been handed out the request can't be transparently
+    repeated, so a stream that breaks later is not retried. Close the
+    generator to drop the connection early.
+
+    Args:
+        url: Request URL
+        json_data: JSON body
+        headers: Optional headers dict
+        timeout: Socket timeout in seconds
+        retries: Number of attempts at opening the stream
+
+    Yields:
+        Raw response lines
+
+    Raises:
+        HTTPError: On request failure
+    """
+    headers = dict(headers or {})
+    headers.setdefault("User-Agent", USER_AGENT)
+    headers.setdefault("Content-Type", "application/json")
+    headers["Accept"] = "text/event-stream"
+
+    breaker = get_breaker(url)
+    data = json.dumps(json_data).encode('utf-8')
+    req = urllib.request.Request(url, data=data, headers=headers, method="POST")
+    log(f"POST {url} (stream)")
+    log(f"Payload keys: {list(json_data.keys())}")
+
+    response = None
+    last_error = None
+    for attempt in range(retries):
+        if budget.expired():
+            budget.mark_partial("run budget exhausted")
+            raise last_error or HTTPError("Run budget exhausted")
+        paused = host_pause_remaining(url)
+        if paused > RETRY_MAX_DELAY:
+            log(f"Rate limited for another {paused:.0f}s, giving up")
+            raise last_error or HTTPError(f"HTTP 429: rate limited for {paused:.0f}s", 429)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {urlparse(url).hostname}")
+        throttle(url)
+        delay = None
+        try:
+            response = urllib.request.urlopen(req, timeout=budget.clamp(timeout))
+            break
+        except urllib.error.HTTPError as e:
+            _note_rate_limit(url, e.headers)
+            body = None
+            try:
+                body = e.read().decode('utf-8')
+            except Exception:
+                pass
+            log(f"HTTP Error {e.code}: {e.reason}")
+            last_error = HTTPError(f"HTTP {e.code}: {e.reason}", e.code, body)
+            if 400 <= e.code < 500 and e.code != 429:
+                breaker.record_success()
+                raise last_error
+            breaker.record_failure()
+            if e.code == 429 and retry_after_seconds(e.headers) is not None:
+                delay = 0.0
+        except (urllib.error.URLError, OSError, http_client.HTTPException) as e:
+            log(f"Connection error: {type(e).__name__}: {e}")
+            last_error = HTTPError(f"Connection error: {type(e).__name__}: {e}")
+            breaker.record_failure()
+        except BaseException:
+            breaker.record_failure()
+            raise
+
+        if attempt < retries - 1:
+            _retry_sleep(backoff_delay(attempt) if delay is None else delay)
+
+    if response is None:
+        raise last_error or HTTPError("Request failed with no error details")
+    breaker.record_success()
+
+    lines = 0
+    try:
+        with response:
+            for line in response:
+                lines += 1
+                yield line
+    except (OSError, http_client.HTTPException) as e:
+        breaker.record_failure()
+        raise HTTPError(f"Stream interrupted after {lines} lines: {type(e).__name__}: {e}")
+    log(f"Stream closed after {lines} lines")
+
+
+def get_reddit_json(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Fetch Reddit thread JSON (hedged when hedging is enabled).
 
     Args:
         path: Reddit path (e.g., /r/subreddit/comments/id/title)
+        params: Extra query parameters (e.g., {"limit": 30, "depth": 1})
 
     Returns:
         Parsed JSON response
@@ -142,11 +975,13 @@ def get_reddit_json(path: str) -> Dict[str, Any]:
     if not path.endswith('.json'):
         path = path + '.json'
 
-    url = f"https://www.reddit.com{path}?raw_json=1"
+    query = {"raw_json": 1}
+    query.update(params or {})
+    url = f"https://www.reddit.com{path}?{urlencode(query)}"
 
     headers = {
         "User-Agent": USER_AGENT,
         "Accept": "application/json",
     }
 
-    return get(url, headers=headers)
+    return get(url, headers=headers, hedge=True)
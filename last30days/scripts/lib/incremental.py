@@ -0,0 +1,129 @@
+"""Incremental refresh for last30days skill.
+
+With --incremental, the last complete report for a topic is kept as a
+baseline. The next run only searches from the baseline's end date
+onwards, refreshes engagement for the baseline's Reddit items that are
+still inside the window (bulk /api/info, no thread fetches), and merges
+both sets before the usual scoring and dedupe.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from . import cache, reddit_enrich, schema
+
+
+def baseline_key(topic: str, sources: str, depth: str) -> str:
+    """Cache key of a topic's baseline (independent of the date range)."""
+    key_data = f"{topic}|{sources}|{depth}"
+    return hashlib.sha256(key_data.encode()).hexdigest()[:16]
+
+
+def load_baseline(topic: str, sources: str, depth: str, from_date: str) -> Optional[schema.Report]:
+    """Load the stored report for a topic if it overlaps the new window.
+
+    Args:
+        topic: Research topic
+        sources: Source mode the baseline was made with
+        depth: Research depth the baseline was made with
+        from_date: Start of the new window (YYYY-MM-DD)
+
+    Returns:
+        The baseline report, or None if there is no usable one
+    """
+    data, _ = cache.load_entry("baseline", baseline_key(topic, sources, depth))
+    if not data:
+        return None
+    try:
+        report = schema.Report.from_dict(data)
+    except (KeyError, TypeError):
+        return None
+    if not report.range_to or report.range_to < from_date:
+        return None
+    return report
+
+
+def save_baseline(report: schema.Report, sources: str, depth: str):
+    """Store a complete report as the topic's baseline."""
+    cache.save_entry("baseline", baseline_key(report.topic, sources, depth), report.to_dict())
+
+
+def fetch_from(baseline: Optional[schema.Report], from_date: str) -> str:
+    """Start date for upstream searches.
+
+    The baseline's last day is searched again, since it was only partly
+    over when the baseline ran.
+    """
+    if baseline is None:
+        return from_date
+    return max(from_date, baseline.range_to)
+
+
+def carry_over(
+    baseline: schema.Report,
+    from_date: str,
+    refresh: bool = True,
+    stale: Optional[Set[str]] = None,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Baseline items still inside the window, as raw item dicts.
+
+    Reddit engagement (and dates) are refreshed with bulk info requests.
+    X has no equivalent cheap lookup, so X items keep their stored
+    engagement.
+
+    Args:
+        baseline: Report from load_baseline
+        from_date: Start of the new window (YYYY-MM-DD)
+        refresh: Whether to refresh Reddit engagement
+        stale: If given, the URLs of items whose engagement was not
+            refreshed (all X items, Reddit posts bulk info missed) are
+            added to it
+
+    Returns:
+        Tuple of (reddit_items, x_items) ready for normalize
+    """
+    reddit_items = [
+        item.to_dict() for item in baseline.reddit
+        if not item.date or item.date >= from_date
+    ]
+    x_items = [
+        item.to_dict() for item in baseline.x
+        if not item.date or item.date >= from_date
+    ]
+    info = {}
+    if refresh and reddit_items:
+        info = reddit_enrich.refresh_engagement(reddit_items)
+    if stale is not None:
+        stale.update(
+            item["url"] for item in reddit_items
+            if reddit_enrich.extract_post_id(item.get("url", "")) not in info
+        )
+        stale.update(item["url"] for item in x_items)
+    return reddit_items, x_items
+
+
+def _identity(item: Dict[str, Any]) -> str:
+    url = item.get("url", "")
+    return reddit_enrich.normalize_permalink(url) or url.rstrip("/").lower()
+
+
+def merge_items(new: List[Dict[str, Any]], stored: List[Dict[str, Any]], prefix: str) -> List[Dict[str, Any]]:
+    """Merge freshly fetched items with carried-over ones.
+
+    A fetched item replaces a stored one with the same URL. IDs are
+    renumbered ({prefix}1, {prefix}2, ...) since both sets were numbered
+    independently.
+
+    Args:
+        new: Items from this run's searches
+        stored: Items from carry_over
+        prefix: ID prefix ('R' or 'X')
+
+    Returns:
+        Merged items, fetched first
+    """
+    seen = {_identity(item) for item in new}
+    merged = list(new) + [item for item in stored if _identity(item) not in seen]
+    for i, item in enumerate(merged, 1):
+        item["id"] = f"{prefix}{i}"
+    return merged
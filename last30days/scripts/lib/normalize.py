@@ -1,5 +1,6 @@
 """Normalization of raw API data to canonical schema."""
 
+import sys
 from typing import Any, Dict, List, TypeVar, Union
 
 from . import dates, schema
@@ -7,6 +8,11 @@ from . import dates, schema
 T = TypeVar("T", schema.RedditItem, schema.XItem, schema.WebSearchItem)
 
 
+def _intern(value: Any) -> Any:
+    """Intern low-cardinality strings (subreddit, handle, date) shared by many items."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 def filter_by_date_range(
     items: List[T],
     from_date: str,
@@ -80,21 +86,21 @@ def normalize_reddit_items(
         for c in item.get("top_comments", []):
             top_comments.append(schema.Comment(
                 score=c.get("score", 0),
-                date=c.get("date"),
-                author=c.get("author", ""),
+                date=_intern(c.get("date")),
+                author=_intern(c.get("author", "")),
                 excerpt=c.get("excerpt", ""),
                 url=c.get("url", ""),
             ))
 
         # Determine date confidence
-        date_str = item.get("date")
+        date_str = _intern(item.get("date"))
         date_confidence = dates.get_date_confidence(date_str, from_date, to_date)
 
         normalized.append(schema.RedditItem(
             id=item.get("id", ""),
             title=item.get("title", ""),
             url=item.get("url", ""),
-            subreddit=item.get("subreddit", ""),
+            subreddit=_intern(item.get("subreddit", "")),
             date=date_str,
             date_confidence=date_confidence,
             engagement=engagement,
@@ -102,6 +108,7 @@ def normalize_reddit_items(
             comment_insights=item.get("comment_insights", []),
             relevance=item.get("relevance", 0.5),
             why_relevant=item.get("why_relevant", ""),
+            link_url=item.get("link_url"),
         ))
 
     return normalized
@@ -137,14 +144,14 @@ def normalize_x_items(
             )
 
         # Determine date confidence
-        date_str = item.get("date")
+        date_str = _intern(item.get("date"))
         date_confidence = dates.get_date_confidence(date_str, from_date, to_date)
 
         normalized.append(schema.XItem(
             id=item.get("id", ""),
             text=item.get("text", ""),
             url=item.get("url", ""),
-            author_handle=item.get("author_handle", ""),
+            author_handle=_intern(item.get("author_handle", "")),
             date=date_str,
             date_confidence=date_confidence,
             engagement=engagement,
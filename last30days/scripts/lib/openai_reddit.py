@@ -1,11 +1,12 @@
 """OpenAI Responses API client for Reddit discovery."""
 
+import contextlib
 import json
 import re
 import sys
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from . import http
+from . import fanout, http, sse
 
 # Fallback models when the selected model isn't accessible (e.g., org not verified for GPT-5)
 MODEL_FALLBACK_ORDER = ["gpt-4.1", "gpt-4o", "gpt-4o-mini"]
@@ -103,6 +104,16 @@ def _extract_core_subject(topic: str) -> str:
     return ' '.join(result[:3]) or topic  # Keep max 3 words
 
 
+# Topics at least this many words long tend to come back thin, so their
+# fallback queries are started alongside the primary search
+SPECULATIVE_MIN_WORDS = 5
+
+
+def _likely_thin_topic(topic: str) -> bool:
+    """Guess whether a topic is verbose enough that fallbacks will be needed."""
+    return len(topic.split()) >= SPECULATIVE_MIN_WORDS
+
+
 def _build_subreddit_query(topic: str) -> str:
     """Build a subreddit-targeted search query for fallback.
 
@@ -124,9 +135,14 @@ def search_reddit(
     depth: str = "default",
     mock_response: Optional[Dict] = None,
     _retry: bool = False,
+    on_item: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> Dict[str, Any]:
     """Search Reddit for relevant threads using OpenAI Responses API.
 
+    With on_item, the response is streamed and each item is passed to
+    on_item (cleaned as in parse_reddit_response) as soon as it is
+    complete, while the search is still running.
+
     Args:
         api_key: OpenAI API key
         model: Model to use
@@ -135,6 +151,7 @@ def search_reddit(
         to_date: End date (YYYY-MM-DD) - only include threads before this
         depth: Research depth - "quick", "default", or "deep"
         mock_response: Mock response for testing
+        on_item: Optional callback for streamed items
 
     Returns:
         Raw API response
@@ -182,7 +199,9 @@ def search_reddit(
         }
 
         try:
-            return http.post(OPENAI_RESPONSES_URL, payload, headers=headers, timeout=timeout)
+            if on_item is None:
+                return http.post(OPENAI_RESPONSES_URL, payload, headers=headers, timeout=timeout)
+            return _stream_search(payload, headers, timeout, on_item)
         except http.HTTPError as e:
             last_error = e
             if _is_model_access_error(e):
@@ -198,17 +217,42 @@ def search_reddit(
     raise http.HTTPError("No models available")
 
 
+def _stream_search(
+    payload: Dict[str, Any],
+    headers: Dict[str, str],
+    timeout: float,
+    on_item: Callable[[Dict[str, Any]], None],
+) -> Dict[str, Any]:
+    """Run a search with streaming, passing cleaned items to on_item."""
+    index = 0
+
+    def handle(raw_item):
+        nonlocal index
+        clean_item = _clean_item(raw_item, index)
+        index += 1
+        if clean_item:
+            on_item(clean_item)
+
+    stream = http.post_stream(OPENAI_RESPONSES_URL, {**payload, "stream": True}, headers=headers, timeout=timeout)
+    with contextlib.closing(stream):
+        return sse.consume_response_stream(stream, handle)
+
+
 def search_subreddits(
     subreddits: List[str],
     topic: str,
     from_date: str,
     to_date: str,
     count_per: int = 5,
+    max_workers: int = fanout.DEFAULT_MAX_WORKERS,
+    timeout: float = fanout.DEFAULT_REQUEST_TIMEOUT,
+    deadline: float = fanout.DEFAULT_DEADLINE,
 ) -> List[Dict[str, Any]]:
     """Search specific subreddits via Reddit's free JSON endpoint.
 
     No API key needed. Uses reddit.com/r/{sub}/search/.json endpoint.
     Used in Phase 2 supplemental search after entity extraction.
+    Subreddits are searched concurrently; results keep subreddit order.
 
     Args:
         subreddits: List of subreddit names (without r/)
@@ -216,61 +260,83 @@ def search_subreddits(
         from_date: Start date (YYYY-MM-DD)
         to_date: End date (YYYY-MM-DD)
         count_per: Results to request per subreddit
+        max_workers: Maximum concurrent subreddit searches
+        timeout: Per-request timeout in seconds
+        deadline: Overall time budget in seconds; slower subreddits are dropped
 
     Returns:
         List of raw item dicts (same format as parse_reddit_response output).
     """
-    all_items = []
     core = _extract_core_subject(topic)
+    subs = [sub.lstrip("r/") for sub in subreddits]
+    per_sub = fanout.fan_out(
+        lambda sub, t: _search_subreddit(sub, core, count_per, t),
+        subs,
+        max_workers=max_workers,
+        request_timeout=timeout,
+        deadline=deadline,
+    )
 
-    for sub in subreddits:
-        sub = sub.lstrip("r/")
-        try:
-            url = f"https://www.reddit.com/r/{sub}/search/.json"
-            params = f"q={_url_encode(core)}&restrict_sr=on&sort=new&limit={count_per}&raw_json=1"
-            full_url = f"{url}?{params}"
+    all_items = []
+    for items in per_sub:
+        all_items.extend(items or [])
 
-            headers = {
-                "User-Agent": http.USER_AGENT,
-                "Accept": "application/json",
-            }
+    # IDs are assigned after gathering so they don't depend on finish order
+    for i, item in enumerate(all_items):
+        item["id"] = f"RS{i+1}"
 
-            data = http.get(full_url, headers=headers, timeout=15)
-
-            # Reddit search returns {"data": {"children": [...]}}
-            children = data.get("data", {}).get("children", [])
-            for i, child in enumerate(children):
-                if child.get("kind") != "t3":  # t3 = link/submission
-                    continue
-                post = child.get("data", {})
-                permalink = post.get("permalink", "")
-                if not permalink:
-                    continue
-
-                item = {
-                    "id": f"RS{len(all_items)+1}",
-                    "title": str(post.get("title", "")).strip(),
-                    "url": f"https://www.reddit.com{permalink}",
-                    "subreddit": str(post.get("subreddit", sub)).strip(),
-                    "date": None,
-                    "why_relevant": f"Found in r/{sub} supplemental search",
-                    "relevance": 0.65,  # Slightly lower default for supplemental
-                }
+    return all_items
 
-                # Parse date from created_utc
-                created_utc = post.get("created_utc")
-                if created_utc:
-                    from . import dates as dates_mod
-                    item["date"] = dates_mod.timestamp_to_date(created_utc)
 
-                all_items.append(item)
+def _search_subreddit(sub: str, core: str, count_per: int, timeout: float) -> List[Dict[str, Any]]:
+    """Search one subreddit. Returns [] on any error."""
+    items = []
+    try:
+        url = f"https://www.reddit.com/r/{sub}/search/.json"
+        params = f"q={_url_encode(core)}&restrict_sr=on&sort=new&limit={count_per}&raw_json=1"
+        full_url = f"{url}?{params}"
+
+        headers = {
+            "User-Agent": http.USER_AGENT,
+            "Accept": "application/json",
+        }
 
-        except http.HTTPError as e:
-            _log_info(f"Subreddit search failed for r/{sub}: {e}")
-        except Exception as e:
-            _log_info(f"Subreddit search error for r/{sub}: {e}")
+        data = http.get(full_url, headers=headers, timeout=timeout)
 
-    return all_items
+        # Reddit search returns {"data": {"children": [...]}}
+        children = data.get("data", {}).get("children", [])
+        for child in children:
+            if child.get("kind") != "t3":  # t3 = link/submission
+                continue
+            post = child.get("data", {})
+            permalink = post.get("permalink", "")
+            if not permalink:
+                continue
+
+            item = {
+                "id": "",
+                "title": str(post.get("title", "")).strip(),
+                "url": f"https://www.reddit.com{permalink}",
+                "subreddit": str(post.get("subreddit", sub)).strip(),
+                "date": None,
+                "why_relevant": f"Found in r/{sub} supplemental search",
+                "relevance": 0.65,  # Slightly lower default for supplemental
+            }
+
+            # Parse date from created_utc
+            created_utc = post.get("created_utc")
+            if created_utc:
+                from . import dates as dates_mod
+                item["date"] = dates_mod.timestamp_to_date(created_utc)
+
+            items.append(item)
+
+    except http.HTTPError as e:
+        _log_info(f"Subreddit search failed for r/{sub}: {e}")
+    except Exception as e:
+        _log_info(f"Subreddit search error for r/{sub}: {e}")
+
+    return items
 
 
 def _url_encode(text: str) -> str:
@@ -344,28 +410,43 @@ def parse_reddit_response(response: Dict[str, Any]) -> List[Dict[str, Any]]:
     # Validate and clean items
     clean_items = []
     for i, item in enumerate(items):
-        if not isinstance(item, dict):
-            continue
-
-        url = item.get("url", "")
-        if not url or "reddit.com" not in url:
-            continue
-
-        clean_item = {
-            "id": f"R{i+1}",
-            "title": str(item.get("title", "")).strip(),
-            "url": url,
-            "subreddit": str(item.get("subreddit", "")).strip().lstrip("r/"),
-            "date": item.get("date"),
-            "why_relevant": str(item.get("why_relevant", "")).strip(),
-            "relevance": min(1.0, max(0.0, float(item.get("relevance", 0.5)))),
-        }
+        clean_item = _clean_item(item, i)
+        if clean_item:
+            clean_items.append(clean_item)
 
-        # Validate date format
-        if clean_item["date"]:
-            if not re.match(r'^\d{4}-\d{2}-\d{2}$', str(clean_item["date"])):
-                clean_item["date"] = None
+    return clean_items
 
-        clean_items.append(clean_item)
 
-    return clean_items
+def _clean_item(item: Any, index: int) -> Optional[Dict[str, Any]]:
+    """Validate one raw item from the model's JSON.
+
+    Args:
+        item: Element of the "items" array
+        index: Its position in the array (used for the item ID)
+
+    Returns:
+        Cleaned item dict, or None if it isn't a usable Reddit item
+    """
+    if not isinstance(item, dict):
+        return None
+
+    url = item.get("url", "")
+    if not url or "reddit.com" not in url:
+        return None
+
+    clean_item = {
+        "id": f"R{index+1}",
+        "title": str(item.get("title", "")).strip(),
+        "url": url,
+        "subreddit": str(item.get("subreddit", "")).strip().lstrip("r/"),
+        "date": item.get("date"),
+        "why_relevant": str(item.get("why_relevant", "")).strip(),
+        "relevance": min(1.0, max(0.0, float(item.get("relevance", 0.5)))),
+    }
+
+    # Validate date format
+    if clean_item["date"]:
+        if not re.match(r'^\d{4}-\d{2}-\d{2}$', str(clean_item["date"])):
+            clean_item["date"] = None
+
+    return clean_item
@@ -1,10 +1,62 @@
 """Reddit thread enrichment with real engagement metrics."""
 
+import hashlib
+import heapq
 import re
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urlparse
 
-from . import http, dates
+from . import cache, dates, http, runstate
+
+# Worker threads used to fetch thread JSON concurrently during enrichment.
+# Requests are still throttled by http.RATE_LIMITS (one bucket for all of reddit.com).
+DEFAULT_WORKERS = 8
+
+# Parsed thread data is cached per permalink so related topics researched
+# minutes apart don't refetch the same popular threads. 0 disables it
+# (set via LAST30DAYS_THREAD_CACHE_TTL, in minutes).
+THREAD_CACHE_TTL_MINUTES = cache.THREAD_CACHE_TTL_HOURS * 60
+
+# Reddit's /api/info.json accepts up to 100 fullnames per request
+INFO_BATCH_SIZE = 100
+INFO_URL = "https://www.reddit.com/api/info.json"
+
+# Full thread fetches (for comments) are limited to the items that will be
+# rendered with comment insights; render_compact shows 15 per source
+COMMENT_FETCH_LIMIT = 15
+
+# Enrichment budget: at most this many full thread fetches per run, taken
+# in priority order. Items beyond the budget keep unknown engagement and
+# get score.UNKNOWN_ENGAGEMENT_PENALTY. A time budget (seconds) is off by
+# default.
+DEFAULT_MAX_ITEMS = 2 * COMMENT_FETCH_LIMIT
+DEFAULT_TIME_BUDGET = None
+
+# Comments kept per thread (get_top_comments' default) and the trimmed
+# listing requested to find them: top-level only, best first. The extra
+# headroom covers deleted/removed comments that are filtered out.
+TOP_COMMENTS = 10
+THREAD_FETCH_PARAMS = {"limit": 30, "depth": 1, "sort": "top"}
+
+_cache_stats = {"hits": 0, "misses": 0}
+_cache_stats_lock = threading.Lock()
+
+# Long-running processes (the research service) can keep parsed threads in
+# memory in front of the on-disk thread cache; off by default
+MEMORY_CACHE_ENTRIES = 2000
+_memory_threads: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_memory_max_entries = 0
+_memory_lock = threading.Lock()
+
+# Thread fetches started while discovery is still streaming items in (see
+# prefetch_thread) are kept per run in runstate.RunState.prefetched, keyed
+# by permalink; get_parsed_thread picks them up. The pool is shared.
+_prefetch_pool: Optional[ThreadPoolExecutor] = None
+_prefetch_pool_lock = threading.Lock()
 
 
 def extract_reddit_path(url: str) -> Optional[str]:
@@ -25,6 +77,256 @@ def extract_reddit_path(url: str) -> Optional[str]:
         return None
 
 
+def normalize_permalink(url: str) -> Optional[str]:
+    """Normalize a Reddit thread URL to a canonical permalink.
+
+    Host, scheme, query, trailing slash, case and the title slug are
+    dropped, so old.reddit.com/r/X/comments/abc/title/?utm=1 and
+    https://www.reddit.com/r/x/comments/abc/ map to the same key.
+
+    Args:
+        url: Reddit URL
+
+    Returns:
+        Canonical path like /r/sub/comments/abc or None
+    """
+    path = extract_reddit_path(url)
+    if not path:
+        return None
+    match = re.match(r'^(/r/[^/]+/comments/[^/]+)', path)
+    if match:
+        return match.group(1).lower()
+    return path.rstrip('/').lower() or None
+
+
+def extract_post_id(url: str) -> Optional[str]:
+    """Extract the base-36 post ID from a Reddit thread URL.
+
+    Args:
+        url: Reddit URL
+
+    Returns:
+        Post ID like 'abc123' or None
+    """
+    permalink = normalize_permalink(url)
+    if not permalink:
+        return None
+    match = re.match(r'^/r/[^/]+/comments/([a-z0-9]+)$', permalink)
+    return match.group(1) if match else None
+
+
+def fetch_info(post_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch submission data for many posts via /api/info.json.
+
+    One request per INFO_BATCH_SIZE IDs. A failed batch is skipped, so
+    its posts are simply missing from the result.
+
+    Args:
+        post_ids: Base-36 post IDs (without the t3_ prefix)
+
+    Returns:
+        Dict mapping post ID to a submission dict shaped like
+        parse_thread_data()["submission"]
+    """
+    result = {}
+    unique_ids = list(dict.fromkeys(post_ids))
+    headers = {
+        "User-Agent": http.USER_AGENT,
+        "Accept": "application/json",
+    }
+
+    for start in range(0, len(unique_ids), INFO_BATCH_SIZE):
+        batch = unique_ids[start:start + INFO_BATCH_SIZE]
+        fullnames = ",".join(f"t3_{post_id}" for post_id in batch)
+        try:
+            data = http.get(f"{INFO_URL}?id={fullnames}&raw_json=1", headers=headers)
+        except http.HTTPError as e:
+            http.log(f"Reddit info batch failed: {e}")
+            continue
+
+        for child in data.get("data", {}).get("children", []):
+            if child.get("kind") != "t3":
+                continue
+            sub_data = child.get("data", {})
+            post_id = str(sub_data.get("id", "")).lower()
+            if post_id:
+                result[post_id] = _parse_submission(sub_data)
+
+    http.log(f"Reddit info: {len(result)}/{len(unique_ids)} posts in "
+             f"{(len(unique_ids) + INFO_BATCH_SIZE - 1) // INFO_BATCH_SIZE} requests")
+    return result
+
+
+def refresh_engagement(items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Refresh engagement and dates for all items with bulk info requests.
+
+    Args:
+        items: Reddit item dicts (modified in place)
+
+    Returns:
+        Dict mapping post ID to submission data for the posts that were found
+    """
+    ids = [extract_post_id(item.get("url", "")) for item in items]
+    info = fetch_info([post_id for post_id in ids if post_id])
+    for item, post_id in zip(items, ids):
+        if post_id in info:
+            apply_submission(item, info[post_id])
+    return info
+
+
+def _record_cache(hit: bool):
+    with _cache_stats_lock:
+        _cache_stats["hits" if hit else "misses"] += 1
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """Get thread cache hit/miss counts for this process."""
+    with _cache_stats_lock:
+        return dict(_cache_stats)
+
+
+def log_cache_stats():
+    """Write thread cache hit/miss counts to the debug log."""
+    stats = get_cache_stats()
+    http.log(f"Reddit thread cache: {stats['hits']} hits, {stats['misses']} misses")
+
+
+def enable_memory_cache(max_entries: int = MEMORY_CACHE_ENTRIES):
+    """Keep up to max_entries parsed threads in memory (0 turns it off).
+
+    Entries expire with THREAD_CACHE_TTL_MINUTES like the disk cache, and
+    the least recently used are dropped past max_entries.
+    """
+    global _memory_max_entries
+    with _memory_lock:
+        _memory_max_entries = max_entries
+        while len(_memory_threads) > max_entries:
+            _memory_threads.popitem(last=False)
+
+
+def _memory_get(cache_key: str) -> Optional[Dict[str, Any]]:
+    with _memory_lock:
+        entry = _memory_threads.get(cache_key)
+        if entry is None:
+            return None
+        stored_at, parsed = entry
+        if time.monotonic() - stored_at >= THREAD_CACHE_TTL_MINUTES * 60:
+            del _memory_threads[cache_key]
+            return None
+        _memory_threads.move_to_end(cache_key)
+        return parsed
+
+
+def _memory_put(cache_key: str, parsed: Dict[str, Any]):
+    with _memory_lock:
+        if not _memory_max_entries:
+            return
+        _memory_threads[cache_key] = (time.monotonic(), parsed)
+        _memory_threads.move_to_end(cache_key)
+        while len(_memory_threads) > _memory_max_entries:
+            _memory_threads.popitem(last=False)
+
+
+def get_parsed_thread(url: str, mock_data: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+    """Get parsed thread data, using the per-permalink cache when enabled.
+
+    Only the parse_thread_data() output is cached, never the raw listing.
+    A fetch already started by prefetch_thread is waited on rather than
+    repeated.
+
+    Args:
+        url: Reddit thread URL
+        mock_data: Mock data for testing (bypasses the cache)
+
+    Returns:
+        Parsed thread dict or None on failure
+    """
+    if mock_data is not None:
+        return parse_thread_data(mock_data, top_k=TOP_COMMENTS)
+
+    permalink = normalize_permalink(url)
+    run = runstate.current()
+    with run.lock:
+        future = run.prefetched.pop(permalink, None) if permalink else None
+    if future is not None:
+        try:
+            parsed = future.result()
+            if parsed:
+                return parsed
+        except Exception:
+            pass  # Fetch again below
+
+    return _load_parsed_thread(url)
+
+
+def _load_parsed_thread(url: str) -> Optional[Dict[str, Any]]:
+    """Load a parsed thread from the thread cache or fetch and parse it."""
+    permalink = normalize_permalink(url)
+    cache_key = None
+    if permalink and THREAD_CACHE_TTL_MINUTES > 0:
+        cache_key = hashlib.sha256(permalink.encode()).hexdigest()[:16]
+        cached = _memory_get(cache_key)
+        if cached is None:
+            cached, _ = cache.load_entry("thread", cache_key, THREAD_CACHE_TTL_MINUTES / 60)
+            if cached is not None:
+                _memory_put(cache_key, cached)
+        _record_cache(cached is not None)
+        if cached is not None:
+            return cached
+
+    thread_data = fetch_thread_data(url)
+    if not thread_data:
+        return None
+
+    parsed = parse_thread_data(thread_data, top_k=TOP_COMMENTS)
+    if cache_key and parsed.get("submission"):
+        cache.save_entry("thread", cache_key, parsed)
+        _memory_put(cache_key, parsed)
+    return parsed
+
+
+def prefetch_thread(url: str) -> bool:
+    """Start fetching a thread in the background, ahead of enrichment.
+
+    Used while discovery streams items in, so thread fetches overlap the
+    rest of the search. The result is claimed by get_parsed_thread.
+
+    Args:
+        url: Reddit thread URL
+
+    Returns:
+        True if a fetch was started (False for bad URLs and repeats)
+    """
+    global _prefetch_pool
+    permalink = normalize_permalink(url)
+    if not permalink:
+        return False
+    with _prefetch_pool_lock:
+        if _prefetch_pool is None:
+            _prefetch_pool = ThreadPoolExecutor(max_workers=DEFAULT_WORKERS, thread_name_prefix="reddit-prefetch")
+    run = runstate.current()
+    with run.lock:
+        if permalink in run.prefetched:
+            return False
+        run.prefetched[permalink] = _prefetch_pool.submit(runstate.bind(_load_parsed_thread), url)
+    return True
+
+
+def discard_prefetched() -> int:
+    """Drop the active run's prefetched threads that enrichment didn't claim.
+
+    Returns:
+        Number of prefetches discarded (still-queued ones are cancelled)
+    """
+    run = runstate.current()
+    with run.lock:
+        futures = list(run.prefetched.values())
+        run.prefetched.clear()
+    for future in futures:
+        future.cancel()
+    return len(futures)
+
+
 def fetch_thread_data(url: str, mock_data: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
     """Fetch Reddit thread JSON data.
 
@@ -43,17 +345,20 @@ def fetch_thread_data(url: str, mock_data: Optional[Dict] = None) -> Optional[Di
         return None
 
     try:
-        data = http.get_reddit_json(path)
+        data = http.get_reddit_json(path, THREAD_FETCH_PARAMS)
         return data
     except http.HTTPError:
         return None
 
 
-def parse_thread_data(data: Any) -> Dict[str, Any]:
+def parse_thread_data(data: Any, top_k: Optional[int] = None) -> Dict[str, Any]:
     """Parse Reddit thread JSON into structured data.
 
     Args:
         data: Raw Reddit JSON response
+        top_k: If set, keep only the top_k highest-scored comments from
+            live authors (what get_top_comments(..., top_k) would return),
+            selected with a bounded heap as the listing is walked
 
     Returns:
         Dict with submission and comments data
@@ -71,58 +376,98 @@ def parse_thread_data(data: Any) -> Dict[str, Any]:
     if isinstance(submission_listing, dict):
         children = submission_listing.get("data", {}).get("children", [])
         if children:
-            sub_data = children[0].get("data", {})
-            result["submission"] = {
-                "score": sub_data.get("score"),
-                "num_comments": sub_data.get("num_comments"),
-                "upvote_ratio": sub_data.get("upvote_ratio"),
-                "created_utc": sub_data.get("created_utc"),
-                "permalink": sub_data.get("permalink"),
-                "title": sub_data.get("title"),
-                "selftext": sub_data.get("selftext", "")[:500],  # Truncate
-            }
+            result["submission"] = _parse_submission(children[0].get("data", {}))
 
     # Second element is comments listing
     if len(data) >= 2:
         comments_listing = data[1]
         if isinstance(comments_listing, dict):
             children = comments_listing.get("data", {}).get("children", [])
-            for child in children:
-                if child.get("kind") != "t1":  # t1 = comment
-                    continue
-                c_data = child.get("data", {})
-                if not c_data.get("body"):
-                    continue
-
-                comment = {
-                    "score": c_data.get("score", 0),
-                    "created_utc": c_data.get("created_utc"),
-                    "author": c_data.get("author", "[deleted]"),
-                    "body": c_data.get("body", "")[:300],  # Truncate
-                    "permalink": c_data.get("permalink"),
-                }
-                result["comments"].append(comment)
+            comments = (_parse_comment(child) for child in children)
+            comments = (c for c in comments if c is not None)
+            if top_k is None:
+                result["comments"] = list(comments)
+            else:
+                result["comments"] = get_top_comments(comments, top_k)
 
     return result
 
 
-def get_top_comments(comments: List[Dict], limit: int = 10) -> List[Dict[str, Any]]:
+def _parse_comment(child: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Parse one comments-listing child, or None if it isn't a usable comment."""
+    if child.get("kind") != "t1":  # t1 = comment
+        return None
+    c_data = child.get("data", {})
+    if not c_data.get("body"):
+        return None
+
+    return {
+        "score": c_data.get("score", 0),
+        "created_utc": c_data.get("created_utc"),
+        "author": c_data.get("author", "[deleted]"),
+        "body": c_data.get("body", "")[:300],  # Truncate
+        "permalink": c_data.get("permalink"),
+    }
+
+
+def _parse_submission(sub_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick the submission fields used for enrichment from a t3 listing child."""
+    return {
+        "score": sub_data.get("score"),
+        "num_comments": sub_data.get("num_comments"),
+        "upvote_ratio": sub_data.get("upvote_ratio"),
+        "created_utc": sub_data.get("created_utc"),
+        "permalink": sub_data.get("permalink"),
+        "title": sub_data.get("title"),
+        "selftext": (sub_data.get("selftext") or "")[:500],  # Truncate
+        "link_url": sub_data.get("url_overridden_by_dest"),  # Link posts only
+    }
+
+
+def apply_submission(item: Dict[str, Any], submission: Dict[str, Any]) -> Dict[str, Any]:
+    """Update an item's engagement, date and link URL from submission data.
+
+    Args:
+        item: Reddit item dict (modified in place)
+        submission: Submission dict from parse_thread_data or fetch_info
+
+    Returns:
+        The updated item
+    """
+    item["engagement"] = {
+        "score": submission.get("score"),
+        "num_comments": submission.get("num_comments"),
+        "upvote_ratio": submission.get("upvote_ratio"),
+    }
+
+    # Update date from actual data
+    created_utc = submission.get("created_utc")
+    if created_utc:
+        item["date"] = dates.timestamp_to_date(created_utc)
+
+    # External link for link posts (used for cross-source dedupe)
+    link_url = submission.get("link_url")
+    if link_url and "reddit.com" not in link_url and "redd.it" not in link_url:
+        item["link_url"] = link_url
+
+    return item
+
+
+def get_top_comments(comments: Iterable[Dict], limit: int = TOP_COMMENTS) -> List[Dict[str, Any]]:
     """Get top comments sorted by score.
 
     Args:
-        comments: List of comment dicts
+        comments: Comment dicts (any iterable; consumed once)
         limit: Maximum number to return
 
     Returns:
         Top comments sorted by score
     """
     # Filter out deleted/removed
-    valid = [c for c in comments if c.get("author") not in ("[deleted]", "[removed]")]
-
-    # Sort by score descending
-    sorted_comments = sorted(valid, key=lambda c: c.get("score", 0), reverse=True)
+    valid = (c for c in comments if c.get("author") not in ("[deleted]", "[removed]"))
 
-    return sorted_comments[:limit]
+    # Bounded heap; same result and tie order as a full descending sort
+    return heapq.nlargest(limit, valid, key=lambda c: c.get("score", 0))
 
 
 def extract_comment_insights(comments: List[Dict], limit: int = 7) -> List[str]:
@@ -190,27 +535,17 @@ def enrich_reddit_item(
     """
     url = item.get("url", "")
 
-    # Fetch thread data
-    thread_data = fetch_thread_data(url, mock_thread_data)
-    if not thread_data:
+    # Fetch (or load cached) thread data
+    parsed = get_parsed_thread(url, mock_thread_data)
+    if not parsed:
         return item
 
-    parsed = parse_thread_data(thread_data)
     submission = parsed.get("submission")
     comments = parsed.get("comments", [])
 
     # Update engagement metrics
     if submission:
-        item["engagement"] = {
-            "score": submission.get("score"),
-            "num_comments": submission.get("num_comments"),
-            "upvote_ratio": submission.get("upvote_ratio"),
-        }
-
-        # Update date from actual data
-        created_utc = submission.get("created_utc")
-        if created_utc:
-            item["date"] = dates.timestamp_to_date(created_utc)
+        apply_submission(item, submission)
 
     # Get top comments
     top_comments = get_top_comments(comments)
@@ -9,9 +9,9 @@ from . import schema
 OUTPUT_DIR = Path.home() / ".local" / "share" / "last30days" / "out"
 
 
-def ensure_output_dir():
+def ensure_output_dir(output_dir: Optional[Path] = None):
     """Ensure output directory exists."""
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    (output_dir or OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
 
 
 def _assess_data_freshness(report: schema.Report) -> dict:
@@ -77,6 +77,11 @@ def render_compact(report: schema.Report, limit: int = 15, missing_keys: str = "
         lines.append(f"**⚡ CACHED RESULTS** ({age_str}) - use `--refresh` for fresh data")
         lines.append("")
 
+    # Budget indicator
+    if report.partial_reasons:
+        lines.append(f"**⚠️ PARTIAL RESULTS** - {'; '.join(report.partial_reasons)}")
+        lines.append("")
+
     lines.append(f"**Date Range:** {report.range_from} to {report.range_to}")
     lines.append(f"**Mode:** {report.mode}")
     if report.openai_model_used:
@@ -133,6 +138,7 @@ def render_compact(report: schema.Report, limit: int = 15, missing_keys: str = "
                 for insight in item.comment_insights[:3]:
                     lines.append(f"    - {insight}")
 
+            _render_cross_refs(item, lines)
             lines.append("")
 
     # X items
@@ -168,6 +174,7 @@ def render_compact(report: schema.Report, limit: int = 15, missing_keys: str = "
             lines.append(f"  {item.text[:200]}...")
             lines.append(f"  {item.url}")
             lines.append(f"  *{item.why_relevant}*")
+            _render_cross_refs(item, lines)
             lines.append("")
 
     # Web items (if any - populated by Claude)
@@ -188,11 +195,35 @@ def render_compact(report: schema.Report, limit: int = 15, missing_keys: str = "
             lines.append(f"  {item.url}")
             lines.append(f"  {item.snippet[:150]}...")
             lines.append(f"  *{item.why_relevant}*")
+            _render_cross_refs(item, lines)
             lines.append("")
 
     return "\n".join(lines)
 
 
+CROSS_REF_LABELS = {"reddit": "Reddit", "x": "X", "web": "Web"}
+CROSS_REF_ENGAGEMENT = (("score", "pts"), ("num_comments", "cmt"), ("likes", "likes"), ("reposts", "rt"))
+
+
+def _render_cross_refs(item, lines: List[str]):
+    """Append an 'Also on' block for duplicates merged from other sources."""
+    if not item.cross_refs:
+        return
+    lines.append("  Also on:")
+    for ref in item.cross_refs:
+        eng_str = ""
+        if ref.get("engagement"):
+            parts = [
+                f"{ref['engagement'][field]}{suffix}"
+                for field, suffix in CROSS_REF_ENGAGEMENT
+                if ref["engagement"].get(field) is not None
+            ]
+            if parts:
+                eng_str = f" [{', '.join(parts)}]"
+        label = CROSS_REF_LABELS.get(ref.get("source"), ref.get("source"))
+        lines.append(f"    - {label}: {ref.get('url')}{eng_str}")
+
+
 def render_context_snippet(report: schema.Report) -> str:
     """Render reusable context snippet.
 
@@ -250,6 +281,8 @@ def render_full_report(report: schema.Report) -> str:
     lines.append(f"**Generated:** {report.generated_at}")
     lines.append(f"**Date Range:** {report.range_from} to {report.range_to}")
     lines.append(f"**Mode:** {report.mode}")
+    if report.partial_reasons:
+        lines.append(f"**Partial:** {'; '.join(report.partial_reasons)}")
     lines.append("")
 
     # Models
@@ -341,6 +374,7 @@ def write_outputs(
     raw_openai: Optional[dict] = None,
     raw_xai: Optional[dict] = None,
     raw_reddit_enriched: Optional[list] = None,
+    output_dir: Optional[Path] = None,
 ):
     """Write all output files.
 
@@ -349,32 +383,56 @@ def write_outputs(
         raw_openai: Raw OpenAI API response
         raw_xai: Raw xAI API response
         raw_reddit_enriched: Raw enriched Reddit thread data
+        output_dir: Directory to write to (default: OUTPUT_DIR)
     """
-    ensure_output_dir()
+    output_dir = output_dir or OUTPUT_DIR
+    ensure_output_dir(output_dir)
 
     # report.json
-    with open(OUTPUT_DIR / "report.json", 'w') as f:
+    with open(output_dir / "report.json", 'w') as f:
         json.dump(report.to_dict(), f, indent=2)
 
     # report.md
-    with open(OUTPUT_DIR / "report.md", 'w') as f:
+    with open(output_dir / "report.md", 'w') as f:
         f.write(render_full_report(report))
 
     # last30days.context.md
-    with open(OUTPUT_DIR / "last30days.context.md", 'w') as f:
+    with open(output_dir / "last30days.context.md", 'w') as f:
         f.write(render_context_snippet(report))
 
-    # Raw responses
+    write_raw_outputs(raw_openai, raw_xai, raw_reddit_enriched, output_dir=output_dir)
+
+
+def write_raw_outputs(
+    raw_openai: Optional[dict] = None,
+    raw_xai: Optional[dict] = None,
+    raw_reddit_enriched: Optional[list] = None,
+    output_dir: Optional[Path] = None,
+):
+    """Write raw API responses.
+
+    Called as soon as normalization is done so the caller can drop the
+    raw dicts instead of holding them until the report is written.
+
+    Args:
+        raw_openai: Raw OpenAI API response
+        raw_xai: Raw xAI API response
+        raw_reddit_enriched: Raw enriched Reddit thread data
+        output_dir: Directory to write to (default: OUTPUT_DIR)
+    """
+    output_dir = output_dir or OUTPUT_DIR
+    ensure_output_dir(output_dir)
+
     if raw_openai:
-        with open(OUTPUT_DIR / "raw_openai.json", 'w') as f:
+        with open(output_dir / "raw_openai.json", 'w') as f:
             json.dump(raw_openai, f, indent=2)
 
     if raw_xai:
-        with open(OUTPUT_DIR / "raw_xai.json", 'w') as f:
+        with open(output_dir / "raw_xai.json", 'w') as f:
             json.dump(raw_xai, f, indent=2)
 
     if raw_reddit_enriched:
-        with open(OUTPUT_DIR / "raw_reddit_threads_enriched.json", 'w') as f:
+        with open(output_dir / "raw_reddit_threads_enriched.json", 'w') as f:
             json.dump(raw_reddit_enriched, f, indent=2)
 
 
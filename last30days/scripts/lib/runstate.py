@@ -0,0 +1,76 @@
+"""Per-run state for last30days skill.
+
+One process can research several topics at once (--batch, --serve), so
+state that belongs to a single research run lives in a RunState rather
+than in module globals: the run's deadline, the reasons its report is
+partial, and the Reddit threads prefetched for its enrichment.
+
+research_topic activates a fresh RunState for each topic. Code running
+on other threads on the run's behalf must be wrapped with bind() so it
+sees the same state; without an active state, calls fall back to the
+process-wide default (set up by budget.start for single-topic runs).
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class RunState:
+    """Deadline, partial-report reasons and prefetches of one research run."""
+
+    def __init__(self, deadline: Optional[float] = None):
+        self.deadline = deadline              # time.monotonic() value, or None
+        self.partial: List[str] = []
+        self.prefetched: Dict[str, Future] = {}  # Permalink -> thread fetch
+        self.lock = threading.Lock()
+
+    @classmethod
+    def with_budget(cls, seconds: Optional[float]) -> "RunState":
+        """State whose deadline is `seconds` from now (None for no deadline)."""
+        return cls(time.monotonic() + seconds if seconds is not None else None)
+
+    def child(self) -> "RunState":
+        """Fresh state for one topic, sharing this state's deadline."""
+        return RunState(self.deadline)
+
+
+_default = RunState()
+_current: contextvars.ContextVar = contextvars.ContextVar("last30days_run")
+
+
+def current() -> RunState:
+    """The active run's state (the process-wide default if none is active)."""
+    return _current.get(_default)
+
+
+def set_default(state: RunState):
+    """Replace the process-wide default state."""
+    global _default
+    _default = state
+
+
+@contextmanager
+def activate(state: RunState) -> Iterator[RunState]:
+    """Make state the active run state for the current thread/context."""
+    token = _current.set(state)
+    try:
+        yield state
+    finally:
+        _current.reset(token)
+
+
+def bind(fn: Callable[..., T]) -> Callable[..., T]:
+    """Wrap fn to run under the caller's run state (for worker threads)."""
+    state = current()
+
+    def bound(*args, **kwargs):
+        with activate(state):
+            return fn(*args, **kwargs)
+
+    return bound
@@ -1,11 +1,16 @@
 """Data schemas for last30days skill."""
 
+import sys
 from dataclasses import dataclass, field, asdict
 from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
 
+# Item types are created per search result, so they use __slots__ (no
+# per-instance __dict__) where dataclasses support it (Python 3.10+).
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class Engagement:
     """Engagement metrics."""
     # Reddit fields
@@ -38,7 +43,7 @@ class Engagement:
         return d if d else None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Comment:
     """Reddit comment."""
     score: int
@@ -57,7 +62,7 @@ class Comment:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class SubScores:
     """Component scores."""
     relevance: int = 0
@@ -72,7 +77,7 @@ class SubScores:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class RedditItem:
     """Normalized Reddit item."""
     id: str
@@ -88,6 +93,8 @@ class RedditItem:
     why_relevant: str = ""
     subs: SubScores = field(default_factory=SubScores)
     score: int = 0
+    link_url: Optional[str] = None  # External link of a link post
+    cross_refs: List[Dict[str, Any]] = field(default_factory=list)  # Same story on other sources
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -104,10 +111,12 @@ class RedditItem:
             'why_relevant': self.why_relevant,
             'subs': self.subs.to_dict(),
             'score': self.score,
+            'link_url': self.link_url,
+            'cross_refs': self.cross_refs,
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class XItem:
     """Normalized X item."""
     id: str
@@ -121,6 +130,7 @@ class XItem:
     why_relevant: str = ""
     subs: SubScores = field(default_factory=SubScores)
     score: int = 0
+    cross_refs: List[Dict[str, Any]] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -135,10 +145,11 @@ class XItem:
             'why_relevant': self.why_relevant,
             'subs': self.subs.to_dict(),
             'score': self.score,
+            'cross_refs': self.cross_refs,
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class WebSearchItem:
     """Normalized web search item (no engagement metrics)."""
     id: str
@@ -152,6 +163,7 @@ class WebSearchItem:
     why_relevant: str = ""
     subs: SubScores = field(default_factory=SubScores)
     score: int = 0
+    cross_refs: List[Dict[str, Any]] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -166,6 +178,7 @@ class WebSearchItem:
             'why_relevant': self.why_relevant,
             'subs': self.subs.to_dict(),
             'score': self.score,
+            'cross_refs': self.cross_refs,
         }
 
 
@@ -189,6 +202,8 @@ class Report:
     reddit_error: Optional[str] = None
     x_error: Optional[str] = None
     web_error: Optional[str] = None
+    # Parts skipped or cut short by the run budget (--budget)
+    partial_reasons: List[str] = field(default_factory=list)
     # Cache info
     from_cache: bool = False
     cache_age_hours: Optional[float] = None
@@ -217,6 +232,9 @@ class Report:
             d['x_error'] = self.x_error
         if self.web_error:
             d['web_error'] = self.web_error
+        if self.partial_reasons:
+            d['partial'] = True
+            d['partial_reasons'] = self.partial_reasons
         if self.from_cache:
             d['from_cache'] = self.from_cache
         if self.cache_age_hours is not None:
@@ -253,6 +271,8 @@ class Report:
                 why_relevant=r.get('why_relevant', ''),
                 subs=subs,
                 score=r.get('score', 0),
+                link_url=r.get('link_url'),
+                cross_refs=r.get('cross_refs', []),
             ))
 
         # Reconstruct X items
@@ -274,6 +294,7 @@ class Report:
                 why_relevant=x.get('why_relevant', ''),
                 subs=subs,
                 score=x.get('score', 0),
+                cross_refs=x.get('cross_refs', []),
             ))
 
         # Reconstruct Web items
@@ -292,6 +313,7 @@ class Report:
                 why_relevant=w.get('why_relevant', ''),
                 subs=subs,
                 score=w.get('score', 0),
+                cross_refs=w.get('cross_refs', []),
             ))
 
         return cls(
@@ -311,6 +333,7 @@ class Report:
             reddit_error=data.get('reddit_error'),
             x_error=data.get('x_error'),
             web_error=data.get('web_error'),
+            partial_reasons=data.get('partial_reasons', []),
             from_cache=data.get('from_cache', False),
             cache_age_hours=data.get('cache_age_hours'),
         )
@@ -1,7 +1,7 @@
 """Popularity-aware scoring for last30days skill."""
 
 import math
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
 from . import dates, schema
 
@@ -23,6 +23,13 @@ WEBSEARCH_NO_DATE_PENALTY = 20  # Heavy penalty for no date signals (low confide
 DEFAULT_ENGAGEMENT = 35
 UNKNOWN_ENGAGEMENT_PENALTY = 3
 
+# Engagement velocity (history.HistoryStore.velocity, raw engagement units
+# per day) blended into the recency subscore when available: an item still
+# gaining engagement is "recent" even if it was posted weeks ago.
+# VELOCITY_FULL_SCORE units/day map to 100.
+VELOCITY_RECENCY_WEIGHT = 0.5
+VELOCITY_FULL_SCORE = 1.0
+
 
 def log1p_safe(x: Optional[int]) -> float:
     """Safe log1p that handles None and negative values."""
@@ -101,36 +108,123 @@ def normalize_to_100(values: List[float], default: float = 50) -> List[float]:
     return result
 
 
-def score_reddit_items(items: List[schema.RedditItem]) -> List[schema.RedditItem]:
-    """Compute scores for Reddit items.
+# Confidence penalties for Reddit/X items
+DATE_CONFIDENCE_PENALTY = {"low": 5, "med": 2}
+
+
+def _log1p_column(values: List[Optional[int]]) -> List[float]:
+    """log1p_safe over a column, computing each distinct value once."""
+    memo = {}
+    out = []
+    for v in values:
+        r = memo.get(v)
+        if r is None:
+            r = memo[v] = log1p_safe(v)
+        out.append(r)
+    return out
+
+
+def _engagement_column(engagements: List[Optional[schema.Engagement]], name: str) -> List[Optional[int]]:
+    return [getattr(e, name) if e is not None else None for e in engagements]
+
+
+def reddit_engagement_raw_batch(engagements: List[Optional[schema.Engagement]]) -> List[Optional[float]]:
+    """Columnar compute_reddit_engagement_raw: one pass per field, same results."""
+    scores = _engagement_column(engagements, "score")
+    comments = _engagement_column(engagements, "num_comments")
+    ratios = _engagement_column(engagements, "upvote_ratio")
+    log_scores = _log1p_column(scores)
+    log_comments = _log1p_column(comments)
+    return [
+        None if (s is None and c is None)
+        else 0.55 * ls + 0.40 * lc + 0.05 * ((r or 0.5) * 10)
+        for s, c, r, ls, lc in zip(scores, comments, ratios, log_scores, log_comments)
+    ]
+
+
+def x_engagement_raw_batch(engagements: List[Optional[schema.Engagement]]) -> List[Optional[float]]:
+    """Columnar compute_x_engagement_raw: one pass per field, same results."""
+    likes = _engagement_column(engagements, "likes")
+    reposts = _engagement_column(engagements, "reposts")
+    log_likes = _log1p_column(likes)
+    log_reposts = _log1p_column(reposts)
+    log_replies = _log1p_column(_engagement_column(engagements, "replies"))
+    log_quotes = _log1p_column(_engagement_column(engagements, "quotes"))
+    return [
+        None if (lk is None and rp is None)
+        else 0.55 * a + 0.25 * b + 0.15 * c + 0.05 * d
+        for lk, rp, a, b, c, d in zip(likes, reposts, log_likes, log_reposts, log_replies, log_quotes)
+    ]
+
+
+def recency_scores(date_strs: List[Optional[str]]) -> List[int]:
+    """dates.recency_score for a column, parsing each distinct date once."""
+    by_date = {d: dates.recency_score(d) for d in set(date_strs)}
+    return [by_date[d] for d in date_strs]
+
+
+def priority_scores(items: List[dict]) -> List[float]:
+    """Pre-score raw item dicts from relevance and recency alone.
+
+    Used to order enrichment before engagement is known. Same weights as
+    the final score, without the engagement term.
 
     Args:
-        items: List of Reddit items
+        items: Raw item dicts with 'relevance' and 'date'
 
     Returns:
-        Items with updated scores
+        Priority per item (higher first)
     """
-    if not items:
-        return items
+    rec_scores = recency_scores([item.get("date") for item in items])
+    return [
+        WEIGHT_RELEVANCE * int((item.get("relevance") or 0.5) * 100) + WEIGHT_RECENCY * rec
+        for item, rec in zip(items, rec_scores)
+    ]
+
+
+def velocity_score(velocity: float) -> int:
+    """Map engagement velocity (raw units per day) to 0-100."""
+    return max(0, min(100, int(100 * velocity / VELOCITY_FULL_SCORE)))
+
+
+def _blend_velocity(items: List, rec_scores: List[int], velocity: Optional[Dict[str, float]]) -> List[int]:
+    """Blend engagement velocity into recency for items that have one."""
+    if not velocity:
+        return rec_scores
+    blended = []
+    for item, rec in zip(items, rec_scores):
+        v = velocity.get(item.url)
+        if v is not None:
+            rec = int((1 - VELOCITY_RECENCY_WEIGHT) * rec + VELOCITY_RECENCY_WEIGHT * velocity_score(v))
+        blended.append(rec)
+    return blended
+
+
+def _score_engagement_items(
+    items: List,
+    eng_raw: List[Optional[float]],
+    velocity: Optional[Dict[str, float]] = None,
+) -> List:
+    """Shared Reddit/X scoring over precomputed raw engagement.
 
-    # Compute raw engagement scores
-    eng_raw = [compute_reddit_engagement_raw(item.engagement) for item in items]
+    Args:
+        items: Reddit or X items
+        eng_raw: Raw engagement per item (None if unknown)
+        velocity: Optional engagement velocity by URL, blended into recency
 
+    Returns:
+        Items with updated subscores and scores
+    """
     # Normalize engagement to 0-100
     eng_normalized = normalize_to_100(eng_raw)
+    rec_scores = _blend_velocity(items, recency_scores([item.date for item in items]), velocity)
 
-    for i, item in enumerate(items):
+    for item, raw, norm, rec_score in zip(items, eng_raw, eng_normalized, rec_scores):
         # Relevance subscore (model-provided, convert to 0-100)
         rel_score = int(item.relevance * 100)
 
-        # Recency subscore
-        rec_score = dates.recency_score(item.date)
-
         # Engagement subscore
-        if eng_normalized[i] is not None:
-            eng_score = int(eng_normalized[i])
-        else:
-            eng_score = DEFAULT_ENGAGEMENT
+        eng_score = int(norm) if norm is not None else DEFAULT_ENGAGEMENT
 
         # Store subscores
         item.subs = schema.SubScores(
@@ -147,78 +241,53 @@ def score_reddit_items(items: List[schema.RedditItem]) -> List[schema.RedditItem
         )
 
         # Apply penalty for unknown engagement
-        if eng_raw[i] is None:
+        if raw is None:
             overall -= UNKNOWN_ENGAGEMENT_PENALTY
 
         # Apply penalty for low date confidence
-        if item.date_confidence == "low":
-            overall -= 5
-        elif item.date_confidence == "med":
-            overall -= 2
+        overall -= DATE_CONFIDENCE_PENALTY.get(item.date_confidence, 0)
 
         item.score = max(0, min(100, int(overall)))
 
     return items
 
 
-def score_x_items(items: List[schema.XItem]) -> List[schema.XItem]:
-    """Compute scores for X items.
+def score_reddit_items(
+    items: List[schema.RedditItem],
+    velocity: Optional[Dict[str, float]] = None,
+) -> List[schema.RedditItem]:
+    """Compute scores for Reddit items.
 
     Args:
-        items: List of X items
+        items: List of Reddit items
+        velocity: Optional engagement velocity by URL (see history.py)
 
     Returns:
         Items with updated scores
     """
     if not items:
         return items
+    eng_raw = reddit_engagement_raw_batch([item.engagement for item in items])
+    return _score_engagement_items(items, eng_raw, velocity)
 
-    # Compute raw engagement scores
-    eng_raw = [compute_x_engagement_raw(item.engagement) for item in items]
-
-    # Normalize engagement to 0-100
-    eng_normalized = normalize_to_100(eng_raw)
-
-    for i, item in enumerate(items):
-        # Relevance subscore (model-provided, convert to 0-100)
-        rel_score = int(item.relevance * 100)
-
-        # Recency subscore
-        rec_score = dates.recency_score(item.date)
-
-        # Engagement subscore
-        if eng_normalized[i] is not None:
-            eng_score = int(eng_normalized[i])
-        else:
-            eng_score = DEFAULT_ENGAGEMENT
-
-        # Store subscores
-        item.subs = schema.SubScores(
-            relevance=rel_score,
-            recency=rec_score,
-            engagement=eng_score,
-        )
 
-        # Compute overall score
-        overall = (
-            WEIGHT_RELEVANCE * rel_score +
-            WEIGHT_RECENCY * rec_score +
-            WEIGHT_ENGAGEMENT * eng_score
-        )
-
-        # Apply penalty for unknown engagement
-        if eng_raw[i] is None:
-            overall -= UNKNOWN_ENGAGEMENT_PENALTY
-
-        # Apply penalty for low date confidence
-        if item.date_confidence == "low":
-            overall -= 5
-        elif item.date_confidence == "med":
-            overall -= 2
+def score_x_items(
+    items: List[schema.XItem],
+    velocity: Optional[Dict[str, float]] = None,
+) -> List[schema.XItem]:
+    """Compute scores for X items.
 
-        item.score = max(0, min(100, int(overall)))
+    Args:
+        items: List of X items
+        velocity: Optional engagement velocity by URL (see history.py)
 
-    return items
+    Returns:
+        Items with updated scores
+    """
+    if not items:
+        return items
+    eng_raw = x_engagement_raw_batch([item.engagement for item in items])
+    return _score_engagement_items(items, eng_raw, velocity)
 
 
 def score_websearch_items(items: List[schema.WebSearchItem]) -> List[schema.WebSearchItem]:
@@ -241,13 +310,12 @@ def score_websearch_items(items: List[schema.WebSearchItem]) -> List[schema.WebS
     if not items:
         return items
 
-    for item in items:
+    rec_scores = recency_scores([item.date for item in items])
+
+    for item, rec_score in zip(items, rec_scores):
         # Relevance subscore (model-provided, convert to 0-100)
         rel_score = int(item.relevance * 100)
 
-        # Recency subscore
-        rec_score = dates.recency_score(item.date)
-
         # Store subscores (engagement is 0 for WebSearch - no data)
         item.subs = schema.SubScores(
             relevance=rel_score,
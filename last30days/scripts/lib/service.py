@@ -0,0 +1,209 @@
+"""Local JSON-over-HTTP service plumbing for last30days skill.
+
+`last30days.py --serve` runs research in one long-lived process so
+connection pools, model selection and caches stay warm between requests.
+This module holds the transport: a threaded stdlib HTTP server that maps
+routes to functions taking and returning JSON, single-flight coalescing
+of identical in-flight requests, and graceful shutdown (stop accepting,
+let in-flight requests finish).
+"""
+
+import json
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+
+def _log(msg: str):
+    sys.stderr.write(f"[SERVICE] {msg}\n")
+    sys.stderr.flush()
+
+
+class ServiceError(Exception):
+    """Error reported to the client with an HTTP status."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Dict[str, Any]] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn, or wait for the identical call already in flight.
+
+        Args:
+            key: Identity of the call
+            fn: Work to run if no call with this key is in flight
+
+        Returns:
+            Tuple of (result, shared) where shared is True for callers
+            that waited on another caller's execution
+
+        Raises:
+            Whatever fn raised, for the leader and every waiter
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event(), "result": None, "error": None}
+
+        if not leader:
+            call["done"].wait()
+        else:
+            try:
+                call["result"] = fn()
+            except BaseException as e:
+                call["error"] = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call["done"].set()
+
+        if call["error"] is not None:
+            raise call["error"]
+        return call["result"], not leader
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running."""
+        with self._lock:
+            return len(self._calls)
+
+
+Route = Callable[[Dict[str, Any]], Any]
+
+
+class JSONService(ThreadingHTTPServer):
+    """Threaded HTTP server dispatching JSON requests to route functions.
+
+    GET routes are called with an empty dict, POST routes with the
+    decoded JSON body. GET /health and POST /shutdown are built in.
+    Handler threads are joined on close, so shutdown() followed by
+    server_close() lets in-flight requests finish.
+    """
+
+    daemon_threads = False
+    block_on_close = True
+
+    def __init__(self, address: Tuple[str, int], routes: Dict[Tuple[str, str], Route]):
+        super().__init__(address, _Handler)
+        self.routes = dict(routes)
+        self.started = time.monotonic()
+        self.active = 0
+        self.active_lock = threading.Lock()
+        self.stopping = threading.Event()
+
+    def request_shutdown(self):
+        """Stop accepting requests (safe to call from a handler or signal)."""
+        if not self.stopping.is_set():
+            self.stopping.set()
+            threading.Thread(target=self.shutdown, daemon=True).start()
+
+    def health(self) -> Dict[str, Any]:
+        with self.active_lock:
+            active = self.active
+        return {
+            "status": "stopping" if self.stopping.is_set() else "ok",
+            "active_requests": active,
+            "uptime_seconds": round(time.monotonic() - self.started, 1),
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.0 (one request per connection) so idle keep-alive clients
+    # can't hold a handler thread open and stall shutdown
+    server: JSONService
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str):
+        path = self.path.split("?", 1)[0]
+        try:
+            body = self._read_json() if method == "POST" else {}
+            if (method, path) == ("GET", "/health"):
+                result = self.server.health()
+            elif (method, path) == ("POST", "/shutdown"):
+                self.server.request_shutdown()
+                result = {"status": "stopping"}
+            else:
+                route = self.server.routes.get((method, path))
+                if route is None:
+                    raise ServiceError(f"No route for {method} {path}", 404)
+                if self.server.stopping.is_set():
+                    raise ServiceError("Service is shutting down", 503)
+                with self.server.active_lock:
+                    self.server.active += 1
+                try:
+                    result = route(body)
+                finally:
+                    with self.server.active_lock:
+                        self.server.active -= 1
+            self._send(200, result)
+        except ServiceError as e:
+            self._send(e.status, {"error": str(e)})
+        except Exception as e:
+            _log(f"{method} {path} failed: {type(e).__name__}: {e}")
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise ServiceError("Request body too large", 413)
+        raw = self.rfile.read(length) if length else b"{}"
+        try:
+            body = json.loads(raw)
+        except ValueError:
+            raise ServiceError("Request body must be JSON") from None
+        if not isinstance(body, dict):
+            raise ServiceError("Request body must be a JSON object")
+        return body
+
+    def _send(self, status: int, payload: Any):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args):
+        _log(format % args)
+
+
+def serve(service: JSONService):
+    """Serve until POST /shutdown, SIGINT or SIGTERM, then drain and close."""
+    def on_signal(signum, frame):
+        _log(f"Received signal {signum}, shutting down")
+        service.request_shutdown()
+
+    previous = {}
+    if threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous[signum] = signal.signal(signum, on_signal)
+
+    host, port = service.server_address[:2]
+    _log(f"Listening on http://{host}:{port}")
+    try:
+        service.serve_forever()
+    finally:
+        _log("Waiting for in-flight requests")
+        service.server_close()
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+        _log("Stopped")
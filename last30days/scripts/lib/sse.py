@@ -0,0 +1,175 @@
+"""Server-sent events and incremental item parsing for streamed Responses API calls.
+
+With "stream": true, the OpenAI and xAI Responses APIs send the model's
+output as a series of text deltas. Both prompts ask for a single
+{"items": [...]} JSON object, so each array element can be parsed and
+handed downstream as soon as its closing brace arrives instead of after
+the whole response.
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+from . import budget, http
+
+_ITEMS_START = re.compile(r'"items"\s*:\s*\[')
+
+
+def iter_events(lines: Iterable[Union[bytes, str]]) -> Iterator[Tuple[str, str]]:
+    """Parse a server-sent event stream.
+
+    Args:
+        lines: Raw lines of the stream (with or without line endings)
+
+    Yields:
+        (event name, data) per event; the name defaults to "message"
+    """
+    event, data = "", []
+    for raw in lines:
+        line = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+        line = line.rstrip("\r\n")
+        if not line:
+            if data:
+                yield event or "message", "\n".join(data)
+            event, data = "", []
+            continue
+        if line.startswith(":"):
+            continue  # Comment / keep-alive
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "event":
+            event = value
+        elif field == "data":
+            data.append(value)
+    if data:
+        yield event or "message", "\n".join(data)
+
+
+class ItemStreamParser:
+    """Pulls complete elements out of a streamed {"items": [...]} JSON text."""
+
+    def __init__(self):
+        self.text = ""
+        self.pos = 0            # Next character to scan
+        self.in_items = False   # Inside the items array
+        self.done = False       # Items array closed
+        self.depth = 0          # Nesting inside the current element
+        self.start = None       # Offset where the current element began
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Add streamed text and return the elements it completed.
+
+        Args:
+            chunk: Next piece of the model's output text
+
+        Returns:
+            Elements of the items array (dicts) completed by this chunk
+        """
+        if self.done:
+            return []
+        self.text += chunk
+        if not self.in_items:
+            match = _ITEMS_START.search(self.text)
+            if not match:
+                return []
+            self.in_items = True
+            self.pos = match.end()
+
+        completed = []
+        text = self.text
+        for i in range(self.pos, len(text)):
+            ch = text[i]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch in "{[":
+                if self.depth == 0:
+                    self.start = i
+                self.depth += 1
+            elif ch in "}]":
+                if self.depth == 0:
+                    self.done = True  # The items array itself closed
+                    break
+                self.depth -= 1
+                if self.depth == 0:
+                    try:
+                        element = json.loads(text[self.start:i + 1])
+                    except ValueError:
+                        element = None
+                    if isinstance(element, dict):
+                        completed.append(element)
+                    self.start = None
+        self.pos = len(text)
+        return completed
+
+
+def consume_response_stream(
+    lines: Iterable[Union[bytes, str]],
+    on_item: Callable[[Dict[str, Any]], None],
+) -> Dict[str, Any]:
+    """Read a streamed Responses API call, handing out items as they complete.
+
+    Args:
+        lines: Raw lines of the event stream (see http.post_stream)
+        on_item: Called with each raw element of the items array, in order
+
+    Returns:
+        The final response object, as the non-streaming call would return
+        it. An incomplete response (e.g. cut off at max_output_tokens) is
+        returned too, but marks the run partial so the report isn't cached.
+
+    Raises:
+        http.HTTPError: On an error event, a failed response, or a stream
+            that ends without a final response
+    """
+    parser = ItemStreamParser()
+    for event, data in iter_events(lines):
+        if data == "[DONE]":
+            break
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            continue
+        if not isinstance(payload, dict):
+            continue
+
+        kind = payload.get("type", event)
+        if kind == "response.output_text.delta":
+            for item in parser.feed(payload.get("delta") or ""):
+                on_item(item)
+        elif kind == "response.completed":
+            response = payload.get("response")
+            if not isinstance(response, dict):
+                raise http.HTTPError("Stream completed without a response object")
+            return response
+        elif kind == "response.incomplete":
+            response = payload.get("response")
+            if not isinstance(response, dict):
+                raise http.HTTPError("Stream ended incomplete without a response object")
+            reason = (response.get("incomplete_details") or {}).get("reason") or "unknown reason"
+            budget.mark_partial(f"Streamed search response incomplete ({reason})")
+            return response
+        elif kind == "response.failed":
+            response = payload.get("response") or {}
+            raise http.HTTPError(f"Streamed response failed: {_error_message(response.get('error'))}")
+        elif kind == "error":
+            raise http.HTTPError(f"Stream error: {_error_message(payload.get('error') or payload)}")
+
+    raise http.HTTPError("Stream ended before the response completed")
+
+
+def _error_message(error: Any) -> str:
+    """Readable message from an API error object."""
+    if isinstance(error, dict):
+        return str(error.get("message") or error.get("code") or error)
+    return str(error or "unknown error")
@@ -1,11 +1,12 @@
 """xAI API client for X (Twitter) discovery."""
 
+import contextlib
 import json
 import re
 import sys
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from . import http
+from . import http, sse
 
 
 def _log_error(msg: str):
@@ -63,9 +64,13 @@ def search_x(
     to_date: str,
     depth: str = "default",
     mock_response: Optional[Dict] = None,
+    on_item: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> Dict[str, Any]:
     """Search X for relevant posts using xAI API with live search.
 
+    With on_item, the response is streamed and each item is passed to
+    on_item (cleaned as in parse_x_response) as soon as it is complete.
+
     Args:
         api_key: xAI API key
         model: Model to use
@@ -74,6 +79,7 @@ def search_x(
         to_date: End date (YYYY-MM-DD)
         depth: Research depth - "quick", "default", or "deep"
         mock_response: Mock response for testing
+        on_item: Optional callback for streamed items
 
     Returns:
         Raw API response
@@ -111,7 +117,21 @@ def search_x(
         ],
     }
 
-    return http.post(XAI_RESPONSES_URL, payload, headers=headers, timeout=timeout)
+    if on_item is None:
+        return http.post(XAI_RESPONSES_URL, payload, headers=headers, timeout=timeout)
+
+    index = 0
+
+    def handle(raw_item):
+        nonlocal index
+        clean_item = _clean_item(raw_item, index)
+        index += 1
+        if clean_item:
+            on_item(clean_item)
+
+    stream = http.post_stream(XAI_RESPONSES_URL, {**payload, "stream": True}, headers=headers, timeout=timeout)
+    with contextlib.closing(stream):
+        return sse.consume_response_stream(stream, handle)
 
 
 def parse_x_response(response: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -178,40 +198,55 @@ def parse_x_response(response: Dict[str, Any]) -> List[Dict[str, Any]]:
     # Validate and clean items
     clean_items = []
     for i, item in enumerate(items):
-        if not isinstance(item, dict):
-            continue
-
-        url = item.get("url", "")
-        if not url:
-            continue
-
-        # Parse engagement
-        engagement = None
-        eng_raw = item.get("engagement")
-        if isinstance(eng_raw, dict):
-            engagement = {
-                "likes": int(eng_raw.get("likes", 0)) if eng_raw.get("likes") else None,
-                "reposts": int(eng_raw.get("reposts", 0)) if eng_raw.get("reposts") else None,
-                "replies": int(eng_raw.get("replies", 0)) if eng_raw.get("replies") else None,
-                "quotes": int(eng_raw.get("quotes", 0)) if eng_raw.get("quotes") else None,
-            }
+        clean_item = _clean_item(item, i)
+        if clean_item:
+            clean_items.append(clean_item)
+
+    return clean_items
+
 
-        clean_item = {
-            "id": f"X{i+1}",
-            "text": str(item.get("text", "")).strip()[:500],  # Truncate long text
-            "url": url,
-            "author_handle": str(item.get("author_handle", "")).strip().lstrip("@"),
-            "date": item.get("date"),
-            "engagement": engagement,
-            "why_relevant": str(item.get("why_relevant", "")).strip(),
-            "relevance": min(1.0, max(0.0, float(item.get("relevance", 0.5)))),
+def _clean_item(item: Any, index: int) -> Optional[Dict[str, Any]]:
+    """Validate one raw item from the model's JSON.
+
+    Args:
+        item: Element of the "items" array
+        index: Its position in the array (used for the item ID)
+
+    Returns:
+        Cleaned item dict, or None if it has no URL
+    """
+    if not isinstance(item, dict):
+        return None
+
+    url = item.get("url", "")
+    if not url:
+        return None
+
+    # Parse engagement
+    engagement = None
+    eng_raw = item.get("engagement")
+    if isinstance(eng_raw, dict):
+        engagement = {
+            "likes": int(eng_raw.get("likes", 0)) if eng_raw.get("likes") else None,
+            "reposts": int(eng_raw.get("reposts", 0)) if eng_raw.get("reposts") else None,
+            "replies": int(eng_raw.get("replies", 0)) if eng_raw.get("replies") else None,
+            "quotes": int(eng_raw.get("quotes", 0)) if eng_raw.get("quotes") else None,
         }
 
-        # Validate date format
-        if clean_item["date"]:
-            if not re.match(r'^\d{4}-\d{2}-\d{2}$', str(clean_item["date"])):
-                clean_item["date"] = None
+    clean_item = {
+        "id": f"X{index+1}",
+        "text": str(item.get("text", "")).strip()[:500],  # Truncate long text
+        "url": url,
+        "author_handle": str(item.get("author_handle", "")).strip().lstrip("@"),
+        "date": item.get("date"),
+        "engagement": engagement,
+        "why_relevant": str(item.get("why_relevant", "")).strip(),
+        "relevance": min(1.0, max(0.0, float(item.get("relevance", 0.5)))),
+    }
 
-        clean_items.append(clean_item)
+    # Validate date format
+    if clean_item["date"]:
+        if not re.match(r'^\d{4}-\d{2}-\d{2}$', str(clean_item["date"])):
+            clean_item["date"] = None
 
-    return clean_items
+    return clean_item
@@ -0,0 +1,139 @@
+"""Tests for --batch mode in last30days.py."""
+
+import argparse
+import io
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import last30days
+from lib import budget, schema
+
+
+class TestReadBatch(unittest.TestCase):
+    def test_plain_and_ndjson_lines(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write('claude code\n\n# skipped\n{"topic": "rust", "days": 7, "depth": "quick"}\n')
+        self.addCleanup(Path(f.name).unlink)
+        self.assertEqual(last30days.read_batch(f.name), [
+            {"topic": "claude code"},
+            {"topic": "rust", "days": 7, "depth": "quick"},
+        ])
+
+    def test_stdin(self):
+        with mock.patch.object(sys, "stdin", io.StringIO("a\nb\n")):
+            self.assertEqual(last30days.read_batch("-"), [{"topic": "a"}, {"topic": "b"}])
+
+    def test_entry_without_topic_rejected(self):
+        with mock.patch.object(sys, "stdin", io.StringIO('{"days": 3}\n')):
+            with self.assertRaises(ValueError):
+                last30days.read_batch("-")
+
+
+class TestTopicDirName(unittest.TestCase):
+    def test_slug(self):
+        self.assertEqual(last30days.topic_dir_name("  Claude Code: Skills & Tips! "), "claude-code-skills-tips")
+        self.assertEqual(last30days.topic_dir_name("???"), "topic")
+
+
+class _FakeContext:
+    def __init__(self):
+        self.args = argparse.Namespace(sources="auto", days=30)
+
+    def resolve_sources(self, requested):
+        if requested == "x":
+            return None, "X requires an xAI key"
+        return "both", None
+
+
+class TestRunBatch(unittest.TestCase):
+    def test_concurrency_limit_and_per_topic_dirs(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+        calls = []
+
+        def fake_research_topic(ctx, topic, sources, depth, days, progress=None, output_dir=None):
+            with lock:
+                active.append(topic)
+                peak.append(len(active))
+                calls.append((topic, depth, days, output_dir.name))
+            time.sleep(0.05)
+            with lock:
+                active.remove(topic)
+            report = schema.create_report(topic, "2026-01-01", "2026-01-31", "both")
+            return report, False, "2026-01-01", "2026-01-31"
+
+        entries = [{"topic": f"topic {i}"} for i in range(6)]
+        entries += [{"topic": "topic 0", "depth": "quick", "days": 7}, {"topic": "bad", "sources": "x"}]
+        out = io.StringIO()
+        with mock.patch.object(last30days, "research_topic", fake_research_topic), redirect_stdout(out):
+            failures = last30days.run_batch(_FakeContext(), entries, "default", Path("/tmp/out"), concurrency=2)
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(failures, 1)
+        self.assertEqual(len(lines), len(entries))
+        self.assertLessEqual(max(peak), 2)
+        self.assertIn(("topic 0", "quick", 7, "topic-0-2"), calls)
+        self.assertIn(("topic 0", "default", 30, "topic-0"), calls)
+        errors = [line for line in lines if line["status"] == "error"]
+        self.assertEqual([e["topic"] for e in errors], ["bad"])
+
+    def test_invalid_depth_and_days_reported_per_topic(self):
+        calls = []
+
+        def fake_research_topic(ctx, topic, sources, depth, days, progress=None, output_dir=None):
+            calls.append(topic)
+            return schema.create_report(topic, "2026-01-01", "2026-01-31", "both"), False, "", ""
+
+        entries = [
+            {"topic": "ok"},
+            {"topic": "deeper", "depth": "extreme"},
+            {"topic": "forever", "days": 365},
+            {"topic": "someday", "days": "soon"},
+        ]
+        out = io.StringIO()
+        with mock.patch.object(last30days, "research_topic", fake_research_topic), redirect_stdout(out):
+            failures = last30days.run_batch(_FakeContext(), entries, "default", Path("/tmp/out"))
+
+        errors = {line["topic"]: line["error"] for line in map(json.loads, out.getvalue().splitlines())
+                  if line["status"] == "error"}
+        self.assertEqual(failures, 3)
+        self.assertEqual(calls, ["ok"])
+        self.assertIn("Invalid depth", errors["deeper"])
+        self.assertIn("between 1 and 30", errors["forever"])
+        self.assertIn("must be an integer", errors["someday"])
+
+    def test_partial_reasons_stay_with_their_topic(self):
+        both_running = threading.Barrier(2, timeout=5)
+
+        def fake_run_topic(ctx, topic, sources, depth, from_date, to_date, progress, output_dir, cache_key):
+            if topic == "slow":
+                budget.mark_partial("Phase 2 supplemental search skipped (run budget)")
+            both_running.wait()
+            report = schema.create_report(topic, from_date, to_date, "both")
+            report.partial_reasons = budget.partial_reasons()
+            return report, False
+
+        ctx = _FakeContext()
+        ctx.args.mock = True
+        out = io.StringIO()
+        with mock.patch.object(last30days, "_run_topic", fake_run_topic), redirect_stdout(out):
+            last30days.run_batch(ctx, [{"topic": "slow"}, {"topic": "fast"}], "default", Path("/tmp/out"))
+
+        partial = {line["topic"]: line["partial"] for line in map(json.loads, out.getvalue().splitlines())}
+        self.assertEqual(partial, {"slow": True, "fast": False})
+        self.assertEqual(budget.partial_reasons(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
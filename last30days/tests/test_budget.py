@@ -0,0 +1,109 @@
+"""Tests for budget module."""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import budget, fanout, http, render, runstate, schema
+
+
+class BudgetTestCase(unittest.TestCase):
+    def tearDown(self):
+        budget.start(None)
+
+
+class TestBudget(BudgetTestCase):
+    def test_no_budget_is_unbounded(self):
+        budget.start(None)
+        self.assertIsNone(budget.remaining())
+        self.assertEqual(budget.clamp(30), 30)
+        self.assertTrue(budget.allows("phase2"))
+
+    def test_clamp_to_remaining(self):
+        budget.start(5)
+        self.assertLessEqual(budget.clamp(30), 5)
+        self.assertEqual(budget.clamp(2), 2)
+
+    def test_clamp_never_below_minimum(self):
+        budget.start(0)
+        self.assertEqual(budget.clamp(30), budget.MIN_TIMEOUT)
+        self.assertTrue(budget.expired())
+
+    def test_allows_checks_phase_minimum(self):
+        budget.start(budget.PHASE_MIN_SECONDS["enrichment"] + 1)
+        self.assertTrue(budget.allows("enrichment"))
+        self.assertFalse(budget.allows("fallback"))
+
+    def test_partial_reasons_dedupe_and_reset(self):
+        budget.start(10)
+        budget.mark_partial("a")
+        budget.mark_partial("a")
+        budget.mark_partial("b")
+        self.assertEqual(budget.partial_reasons(), ["a", "b"])
+        budget.start(10)
+        self.assertEqual(budget.partial_reasons(), [])
+
+    def test_partial_reasons_are_per_run(self):
+        budget.start(10)
+        with runstate.activate(runstate.current().child()) as run:
+            budget.mark_partial("a")
+            self.assertEqual(budget.partial_reasons(), ["a"])
+            self.assertEqual(run.deadline, runstate.current().deadline)
+        self.assertEqual(budget.partial_reasons(), [])
+
+
+class TestBudgetPropagation(BudgetTestCase):
+    def test_http_request_stops_when_expired(self):
+        budget.start(0)
+        with mock.patch.object(http, "_open") as opener:
+            with self.assertRaises(http.HTTPError):
+                http.get("https://example.com/")
+        opener.assert_not_called()
+        self.assertIn("run budget exhausted", budget.partial_reasons())
+
+    def test_http_timeout_clamped(self):
+        budget.start(3)
+        with mock.patch.object(http, "_open", return_value=(200, b"{}")) as opener:
+            http.get("https://example.com/", timeout=30)
+        self.assertLessEqual(opener.call_args[0][1], 3)
+
+    def test_fanout_deadline_capped(self):
+        budget.start(0.1)
+        start = time.monotonic()
+        result = fanout.fan_out(lambda arg, t: time.sleep(1) or arg, [1], deadline=30)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(result, [None])
+
+    def test_fanout_workers_see_the_run(self):
+        run = runstate.RunState()
+        with runstate.activate(run):
+            fanout.fan_out(lambda arg, t: budget.mark_partial(arg), ["a", "b"])
+        self.assertEqual(sorted(run.partial), ["a", "b"])
+        self.assertEqual(budget.partial_reasons(), [])
+
+
+class TestPartialReport(unittest.TestCase):
+    def test_partial_round_trip_and_render(self):
+        report = schema.create_report("t", "2026-01-01", "2026-01-31", "both")
+        report.partial_reasons = ["Phase 2 supplemental search skipped"]
+        data = report.to_dict()
+        self.assertTrue(data["partial"])
+        restored = schema.Report.from_dict(data)
+        self.assertEqual(restored.partial_reasons, report.partial_reasons)
+        self.assertIn("PARTIAL RESULTS", render.render_compact(restored))
+
+    def test_banner_shows_recorded_reasons_only(self):
+        report = schema.create_report("t", "2026-01-01", "2026-01-31", "both")
+        report.partial_reasons = ["Reddit enrichment skipped (reddit.com failing)"]
+        banner = [line for line in render.render_compact(report).splitlines() if "PARTIAL" in line][0]
+        self.assertIn("reddit.com failing", banner)
+        self.assertNotIn("budget", banner)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,20 @@
 """Tests for cache module."""
 
+import os
+import subprocess
 import sys
+import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
+from unittest import mock
 
 # Add lib to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
 from lib import cache
+from lib.cache_db import SQLiteCache
 
 
 class TestGetCacheKey(unittest.TestCase):
@@ -25,6 +32,11 @@ class TestGetCacheKey(unittest.TestCase):
         key2 = cache.get_cache_key("topic b", "2026-01-01", "2026-01-31", "both")
         self.assertNotEqual(key1, key2)
 
+    def test_different_for_different_depth(self):
+        key1 = cache.get_cache_key("topic", "2026-01-01", "2026-01-31", "both", "quick")
+        key2 = cache.get_cache_key("topic", "2026-01-01", "2026-01-31", "both", "deep")
+        self.assertNotEqual(key1, key2)
+
     def test_key_length(self):
         key = cache.get_cache_key("test", "2026-01-01", "2026-01-31", "both")
         self.assertEqual(len(key), 16)
@@ -55,5 +67,250 @@ class TestModelCache(unittest.TestCase):
         self.assertTrue(result is None or isinstance(result, str))
 
 
+class TestSQLiteCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "cache.sqlite3"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip(self):
+        store = SQLiteCache(self.path)
+        store.set("report", "abc", {"topic": "test", "items": [1, 2, 3]})
+        data, age = store.get("report", "abc")
+        self.assertEqual(data, {"topic": "test", "items": [1, 2, 3]})
+        self.assertLess(age, 0.01)
+
+    def test_missing_entry(self):
+        store = SQLiteCache(self.path)
+        self.assertEqual(store.get("report", "nope"), (None, None))
+
+    def test_namespaces_are_separate(self):
+        store = SQLiteCache(self.path)
+        store.set("report", "k", {"a": 1})
+        store.set("thread", "k", {"b": 2})
+        self.assertEqual(store.get("report", "k")[0], {"a": 1})
+        self.assertEqual(store.get("thread", "k")[0], {"b": 2})
+        store.clear("thread")
+        self.assertIsNone(store.get("thread", "k")[0])
+        self.assertIsNotNone(store.get("report", "k")[0])
+
+    def test_namespace_ttl(self):
+        store = SQLiteCache(self.path, ttl_hours={"thread": 0})
+        store.set("thread", "k", {"b": 2})
+        self.assertIsNone(store.get("thread", "k")[0])
+        self.assertIsNotNone(store.get("thread", "k", ttl_hours=1)[0])
+
+    def test_entries_are_compressed(self):
+        store = SQLiteCache(self.path)
+        store.set("report", "k", {"text": "reddit " * 1000})
+        self.assertLess(store.total_bytes(), 1000)
+
+    def test_lru_eviction(self):
+        store = SQLiteCache(self.path)
+        store.touch_seconds = 0
+        for i in range(3):
+            store.set("report", f"k{i}", {"n": i})
+            time.sleep(0.01)
+        store.get("report", "k0")  # k0 becomes most recently used
+        store.max_bytes = store.total_bytes()
+        store.set("report", "k3", {"n": 3})
+        self.assertIsNotNone(store.get("report", "k0")[0])
+        self.assertIsNone(store.get("report", "k1")[0])
+        self.assertIsNotNone(store.get("report", "k3")[0])
+        self.assertLessEqual(store.total_bytes(), store.max_bytes)
+
+    def test_running_total_tracks_writes_and_deletes(self):
+        store = SQLiteCache(self.path)
+        store.set("report", "a", {"n": "x" * 100})
+        store.set("report", "a", {"n": 1})  # Replaced, not added
+        store.set("thread", "b", {"n": 2})
+        store.delete("thread", "b")
+        store.set("thread", "c", {"n": 3})
+        store.clear("report")
+        conn = store._connect()
+        actual = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        self.assertEqual(store.total_bytes(), actual)
+        self.assertGreater(actual, 0)
+
+    def test_total_initialized_for_existing_store(self):
+        store = SQLiteCache(self.path)
+        store.set("report", "a", {"n": 1})
+        expected = store.total_bytes()
+        store._connect().execute("DROP TABLE stats")
+        self.assertEqual(SQLiteCache(self.path).total_bytes(), expected)
+
+    def test_reads_only_touch_stale_access_times(self):
+        store = SQLiteCache(self.path)
+        store.set("report", "k", {"n": 1})
+        conn = store._connect()
+        accessed = lambda: conn.execute("SELECT accessed FROM entries").fetchone()[0]
+        before = accessed()
+        store.get("report", "k")
+        self.assertEqual(accessed(), before)
+        conn.execute("UPDATE entries SET accessed = accessed - ?", (store.touch_seconds + 1,))
+        store.get("report", "k")
+        self.assertGreaterEqual(accessed(), before)
+
+    def test_expiry_uses_namespace_created_index(self):
+        conn = SQLiteCache(self.path)._connect()
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN DELETE FROM entries WHERE namespace = ? AND created < ?", ("thread", 0),
+        ).fetchall()
+        self.assertIn("entries_namespace_created", " ".join(str(row) for row in plan))
+
+    def test_shared_between_instances(self):
+        SQLiteCache(self.path).set("model", "selection", {"openai": "gpt-5"})
+        data, _ = SQLiteCache(self.path).get("model", "selection")
+        self.assertEqual(data, {"openai": "gpt-5"})
+
+
+class TestJsonPrune(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = (cache.CACHE_DIR, cache.CACHE_BACKEND, dict(cache._last_sweep))
+        cache.CACHE_DIR = Path(self.tmp.name)
+        cache.CACHE_BACKEND = "json"
+
+    def tearDown(self):
+        cache.CACHE_DIR, cache.CACHE_BACKEND, sweeps = self.saved
+        cache._last_sweep.clear()
+        cache._last_sweep.update(sweeps)
+        self.tmp.cleanup()
+
+    def test_drops_expired_then_oldest(self):
+        now = time.time()
+        for i in range(4):
+            cache.save_entry("thread", f"k{i}", {"n": i})
+            os.utime(cache.get_cache_path(f"k{i}", "thread"), (now - i * 60, now - i * 60))
+        expired = cache.get_cache_path("old", "thread")
+        cache.save_entry("thread", "old", {})
+        os.utime(expired, (now - 30 * 24 * 3600, now - 30 * 24 * 3600))
+
+        self.assertEqual(cache.prune_entries("thread", max_entries=2), 3)
+        remaining = sorted(p.stem for p in (cache.CACHE_DIR / "thread").iterdir())
+        self.assertEqual(remaining, ["k0", "k1"])
+
+    def test_write_sweeps_at_most_once_per_interval(self):
+        with mock.patch.object(cache, "prune_entries") as prune:
+            cache.save_entry("thread", "a", {})
+            cache.save_entry("thread", "b", {})
+        self.assertEqual(prune.call_count, 1)
+
+
+class TestReportCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = (cache.CACHE_DIR, cache.LOCK_DIR, cache.CACHE_BACKEND, cache.LOCK_POLL_SECONDS)
+        cache.CACHE_DIR = Path(self.tmp.name)
+        cache.LOCK_DIR = cache.CACHE_DIR / "locks"
+        cache.CACHE_BACKEND = "json"
+        cache.LOCK_POLL_SECONDS = 0.02
+
+    def tearDown(self):
+        cache.CACHE_DIR, cache.LOCK_DIR, cache.CACHE_BACKEND, cache.LOCK_POLL_SECONDS = self.saved
+        self.tmp.cleanup()
+
+    def test_atomic_write_leaves_no_temp_files(self):
+        cache.save_cache("k", {"n": 1})
+        cache.save_cache("k", {"n": 2})
+        self.assertEqual(cache.load_cache("k"), {"n": 2})
+        self.assertEqual([p.name for p in cache.CACHE_DIR.iterdir()], ["k.json"])
+
+    def test_lock_is_exclusive(self):
+        first, second = cache.ReportLock("k"), cache.ReportLock("k")
+        self.assertTrue(first.try_acquire())
+        self.assertFalse(second.try_acquire())
+        first.release()
+        self.assertTrue(second.try_acquire())
+        second.release()
+        self.assertFalse(second.path.exists())
+
+    def test_lock_of_dead_process_is_free(self):
+        cache.LOCK_DIR.mkdir(parents=True)
+        lock = cache.ReportLock("k")
+        # A process that takes the lock and dies without releasing it
+        script = (
+            "import fcntl, os, sys; fd = os.open(sys.argv[1], os.O_CREAT | os.O_RDWR); "
+            "fcntl.flock(fd, fcntl.LOCK_EX); os._exit(0)"
+        ) if cache.fcntl else (
+            "import msvcrt, os, sys; fd = os.open(sys.argv[1], os.O_CREAT | os.O_RDWR); "
+            "msvcrt.locking(fd, msvcrt.LK_NBLCK, 1); os._exit(0)"
+        )
+        subprocess.run([sys.executable, "-c", script, str(lock.path)], check=True)
+        self.assertTrue(lock.path.exists())
+        self.assertTrue(lock.try_acquire())
+        lock.release()
+
+    def test_waiters_racing_on_leftover_lock(self):
+        cache.LOCK_DIR.mkdir(parents=True)
+        (cache.LOCK_DIR / "k.lock").write_text("")  # Left behind by a crashed holder
+        locks = [cache.ReportLock("k") for _ in range(8)]
+        barrier = threading.Barrier(len(locks))
+        results = [None] * len(locks)
+
+        def race(i):
+            barrier.wait()
+            results[i] = locks[i].try_acquire()
+
+        threads = [threading.Thread(target=race, args=(i,)) for i in range(len(locks))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results.count(True), 1)
+        holder = locks[results.index(True)]
+        holder.release()
+        self.assertFalse(holder.path.exists())
+
+    @unittest.skipUnless(cache.fcntl, "open files can't be deleted on Windows")
+    def test_lock_on_deleted_file_is_not_held(self):
+        holder = cache.ReportLock("k")
+        self.assertTrue(holder.try_acquire())
+        stale_fd = os.open(str(holder.path), os.O_RDWR)  # Opened before release
+        holder.release()
+        self.assertTrue(cache._lock_file(stale_fd))  # Lock on the deleted inode...
+        try:
+            taker = cache.ReportLock("k")
+            self.assertTrue(taker.try_acquire())  # ...doesn't block the new file
+            taker.release()
+        finally:
+            cache._unlock_file(stale_fd)
+            os.close(stale_fd)
+
+    def test_waiter_picks_up_holders_report(self):
+        cache.save_cache("k", {"n": "old"})  # Older than the wait: ignored
+        time.sleep(0.05)
+        holder = cache.ReportLock("k")
+        self.assertTrue(holder.try_acquire())
+
+        def finish():
+            time.sleep(0.2)
+            cache.save_cache("k", {"n": "fresh"})
+            holder.release()
+
+        threading.Thread(target=finish).start()
+        lock, data, age = cache.claim_report("k", wait_seconds=5)
+        self.assertIsNone(lock)
+        self.assertEqual(data, {"n": "fresh"})
+
+    def test_waiter_takes_over_when_holder_fails(self):
+        cache.save_cache("k", {"n": "old"})
+        holder = cache.ReportLock("k")
+        self.assertTrue(holder.try_acquire())
+        threading.Timer(0.1, holder.release).start()
+        lock, data, _ = cache.claim_report("k", wait_seconds=5)
+        self.assertIsNotNone(lock)
+        self.assertIsNone(data)
+        lock.release()
+
+    def test_wait_times_out(self):
+        holder = cache.ReportLock("k")
+        self.assertTrue(holder.try_acquire())
+        self.assertEqual(cache.claim_report("k", wait_seconds=0.1), (None, None, None))
+        holder.release()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -79,6 +79,94 @@ class TestFindDuplicates(unittest.TestCase):
         self.assertEqual(result[0], (0, 1))
 
 
+class TestMinHash(unittest.TestCase):
+    def test_signature_is_deterministic(self):
+        ngrams = dedupe.get_ngrams("Claude Code skills")
+        self.assertEqual(dedupe.minhash_signature(ngrams), dedupe.minhash_signature(set(ngrams)))
+        self.assertEqual(len(dedupe.minhash_signature(ngrams)), dedupe.MINHASH_BANDS * dedupe.MINHASH_ROWS)
+
+    def test_identical_sets_are_candidates(self):
+        sig = dedupe.minhash_signature(dedupe.get_ngrams("same title here"))
+        self.assertEqual(dedupe.lsh_candidate_pairs([sig, sig]), {(0, 1)})
+
+    def test_minhash_matches_exact(self):
+        titles = [
+            "Best practices for Claude Code skills",
+            "Best practices for Claude Code skills guide",
+            "Completely different topic A",
+            "Another unrelated subject B",
+            "Claude Code skills: best practices",
+            "Another unrelated subject B!",
+        ]
+        items = [
+            schema.RedditItem(id=f"R{i}", title=t, url="", subreddit="")
+            for i, t in enumerate(titles)
+        ]
+        self.assertEqual(
+            dedupe.find_duplicates(items, method="minhash"),
+            dedupe.find_duplicates(items, method="exact"),
+        )
+
+
+class TestCanonicalizeUrl(unittest.TestCase):
+    def test_strips_tracking_and_subdomains(self):
+        self.assertEqual(
+            dedupe.canonicalize_url("https://www.Example.com/post/?utm_source=x&id=3#top"),
+            dedupe.canonicalize_url("http://example.com/post?id=3"),
+        )
+
+    def test_twitter_maps_to_x(self):
+        self.assertEqual(
+            dedupe.canonicalize_url("https://mobile.twitter.com/user/status/123?s=20"),
+            "x.com/status/123",
+        )
+
+    def test_reddit_thread_slug_dropped(self):
+        self.assertEqual(
+            dedupe.canonicalize_url("https://old.reddit.com/r/Python/comments/abc/some_slug/"),
+            "reddit.com/r/python/comments/abc",
+        )
+
+    def test_rejects_non_web(self):
+        self.assertIsNone(dedupe.canonicalize_url("mailto:a@b.c"))
+
+
+class TestDedupeCrossSource(unittest.TestCase):
+    def test_shared_link_merges_into_best(self):
+        r = schema.RedditItem(
+            id="R1", title="New release is out", url="https://reddit.com/r/a/comments/1/x",
+            subreddit="a", link_url="https://blog.example.com/release?utm_source=reddit", score=80,
+        )
+        x = schema.XItem(
+            id="X1", text="Read this https://blog.example.com/release", url="https://x.com/u/status/9",
+            author_handle="u", score=60,
+        )
+        w = schema.WebSearchItem(
+            id="W1", title="Release notes", url="https://www.blog.example.com/release/",
+            source_domain="blog.example.com", snippet="", score=70,
+        )
+        reddit, xs, web = dedupe.dedupe_cross_source([r], [x], [w])
+        self.assertEqual([i.id for i in reddit], ["R1"])
+        self.assertEqual(xs, [])
+        self.assertEqual(web, [])
+        self.assertEqual({ref["id"] for ref in r.cross_refs}, {"X1", "W1"})
+        self.assertEqual(next(ref for ref in r.cross_refs if ref["id"] == "X1")["source"], "x")
+
+    def test_similar_text_across_sources(self):
+        r = schema.RedditItem(id="R1", title="Claude Code skills best practices", url="", subreddit="a", score=40)
+        x = schema.XItem(id="X1", text="Claude Code skills best practices", url="", author_handle="u", score=90)
+        reddit, xs, _ = dedupe.dedupe_cross_source([r], [x])
+        self.assertEqual(reddit, [])
+        self.assertEqual([i.id for i in xs], ["X1"])
+        self.assertEqual(x.cross_refs[0]["id"], "R1")
+
+    def test_same_source_not_merged_by_text(self):
+        a = schema.RedditItem(id="R1", title="Same title", url="", subreddit="a", score=40)
+        b = schema.RedditItem(id="R2", title="Same title", url="", subreddit="b", score=30)
+        reddit, _, _ = dedupe.dedupe_cross_source([a, b], [])
+        self.assertEqual([i.id for i in reddit], ["R1", "R2"])
+
+
 class TestDedupeItems(unittest.TestCase):
     def test_keeps_higher_scored(self):
         items = [
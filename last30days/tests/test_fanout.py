@@ -0,0 +1,69 @@
+"""Tests for fanout module."""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import fanout, http, openai_reddit
+
+
+class TestFanOut(unittest.TestCase):
+    def test_results_keep_input_order(self):
+        def slow_first(arg, timeout):
+            time.sleep(0.1 if arg == 0 else 0)
+            return arg * 10
+
+        self.assertEqual(fanout.fan_out(slow_first, [0, 1, 2]), [0, 10, 20])
+
+    def test_runs_concurrently(self):
+        start = time.monotonic()
+        fanout.fan_out(lambda arg, timeout: time.sleep(0.2), range(5), max_workers=5)
+        self.assertLess(time.monotonic() - start, 0.6)
+
+    def test_deadline_drops_stragglers(self):
+        def work(arg, timeout):
+            time.sleep(arg)
+            return arg
+
+        start = time.monotonic()
+        result = fanout.fan_out(work, [0, 0.5], deadline=0.2)
+        self.assertLess(time.monotonic() - start, 0.45)
+        self.assertEqual(result, [0, None])
+
+    def test_timeout_clamped_to_deadline(self):
+        result = fanout.fan_out(lambda arg, timeout: timeout, [None], request_timeout=15, deadline=2)
+        self.assertLessEqual(result[0], 2)
+
+    def test_exception_yields_none(self):
+        def work(arg, timeout):
+            if arg:
+                raise ValueError("boom")
+            return "ok"
+
+        self.assertEqual(fanout.fan_out(work, [False, True]), ["ok", None])
+
+
+class TestSearchSubreddits(unittest.TestCase):
+    def test_ids_follow_subreddit_order(self):
+        def fake_get(url, headers=None, timeout=None):
+            sub = url.split("/r/")[1].split("/")[0]
+            time.sleep(0.1 if sub == "first" else 0)
+            return {"data": {"children": [
+                {"kind": "t3", "data": {"title": f"{sub} {i}", "permalink": f"/r/{sub}/comments/{i}/x/"}}
+                for i in range(2)
+            ]}}
+
+        with mock.patch.object(http, "get", fake_get):
+            items = openai_reddit.search_subreddits(["first", "second"], "topic", "2026-01-01", "2026-01-31")
+
+        self.assertEqual([i["id"] for i in items], ["RS1", "RS2", "RS3", "RS4"])
+        self.assertEqual([i["subreddit"] for i in items], ["first", "first", "second", "second"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Tests for the engagement history store and velocity scoring."""
+
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import history, schema, score
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+def reddit_item(url, upvotes, comments, date="2026-01-10"):
+    return schema.RedditItem(
+        id="R1", title="Post", url=url, subreddit="test", date=date,
+        engagement=schema.Engagement(score=upvotes, num_comments=comments, upvote_ratio=0.9),
+        relevance=0.8,
+    )
+
+
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = history.HistoryStore(Path(self.tmp.name) / "history.sqlite3")
+        self.now = time.time()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_record_and_query_by_topic_and_day(self):
+        x_item = schema.XItem(
+            id="X1", text="post", url="https://x.com/u/status/1", author_handle="u",
+            engagement=schema.Engagement(likes=5, reposts=1),
+        )
+        no_engagement = schema.RedditItem(id="R2", title="t", url="https://reddit.com/r/a/comments/2/t", subreddit="a")
+        written = self.store.record(
+            "Claude Code ", [reddit_item("https://reddit.com/r/a/comments/1/t", 10, 2), no_engagement], [x_item],
+            captured=self.now - 2 * DAY,
+        )
+        self.assertEqual(written, 2)
+        self.store.record("claude code", [reddit_item("https://reddit.com/r/a/comments/1/t", 20, 4)], captured=self.now)
+
+        day = lambda t: time.strftime("%Y-%m-%d", time.gmtime(t))
+        all_rows = self.store.snapshots("claude code", day(self.now - 3 * DAY), day(self.now))
+        self.assertEqual([(r["source"], r["score"] or r["likes"]) for r in all_rows],
+                         [("reddit", 10), ("x", 5), ("reddit", 20)])
+        latest = self.store.snapshots("claude code", day(self.now), day(self.now))
+        self.assertEqual(len(latest), 1)
+        self.assertEqual(self.store.snapshots("other topic", "2000-01-01", "2100-01-01"), [])
+
+    def test_velocity_uses_most_recent_snapshot_old_enough(self):
+        url = "https://reddit.com/r/a/comments/1/t"
+        self.store.record("t", [reddit_item(url, 10, 1)], captured=self.now - 2 * DAY)
+        self.store.record("t", [reddit_item(url, 100, 10)], captured=self.now - 1 * DAY)
+        self.store.record("t", [reddit_item(url, 200, 20)], captured=self.now - HOUR)  # Too close
+        self.store.record("t", [reddit_item(url, 1000, 100)], captured=self.now)
+
+        velocity = self.store.velocity([url, "https://reddit.com/r/a/comments/9/none"], now=self.now)
+        raw = score.reddit_engagement_raw_batch([
+            schema.Engagement(score=100, num_comments=10, upvote_ratio=0.9),
+            schema.Engagement(score=1000, num_comments=100, upvote_ratio=0.9),
+        ])
+        self.assertEqual(list(velocity), [url])
+        self.assertAlmostEqual(velocity[url], raw[1] - raw[0], places=6)
+
+    def test_single_snapshot_has_no_velocity(self):
+        url = "https://reddit.com/r/a/comments/1/t"
+        self.store.record("t", [reddit_item(url, 10, 1)], captured=self.now)
+        self.assertEqual(self.store.velocity([url], now=self.now), {})
+
+
+class TestVelocityScoring(unittest.TestCase):
+    def test_velocity_raises_recency_of_growing_item(self):
+        rising = reddit_item("https://reddit.com/r/a/comments/1/t", 10, 1, date="2026-01-01")
+        flat = reddit_item("https://reddit.com/r/a/comments/2/t", 10, 1, date="2026-01-01")
+        score.score_reddit_items([rising, flat], velocity={rising.url: score.VELOCITY_FULL_SCORE})
+        self.assertGreater(rising.subs.recency, flat.subs.recency)
+        self.assertGreater(rising.score, flat.score)
+
+    def test_without_velocity_scores_are_unchanged(self):
+        a = reddit_item("https://reddit.com/r/a/comments/1/t", 10, 1)
+        b = reddit_item("https://reddit.com/r/a/comments/1/t", 10, 1)
+        score.score_reddit_items([a])
+        score.score_reddit_items([b], velocity={})
+        self.assertEqual((a.score, a.subs), (b.score, b.subs))
+
+
+if __name__ == "__main__":
+    unittest.main()
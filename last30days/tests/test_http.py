@@ -0,0 +1,467 @@
+"""Tests for http module."""
+
+import gzip
+import json
+import sys
+import threading
+import time
+import unittest
+import urllib.request
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import http
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith("/missing"):
+            self._send(404, {"error": "not found"})
+        elif self.path.startswith("/fail"):
+            self.server.hits += 1
+            self._send(503, {"error": "unavailable"})
+        elif self.path.startswith("/limited"):
+            # Rate limited on the first hit only
+            self.server.hits += 1
+            if self.server.hits == 1:
+                retry_after = "120" if "long" in self.path else "0.2"
+                self._send(429, {"error": "slow down"}, {"Retry-After": retry_after})
+            else:
+                self._send(200, {"path": self.path})
+        elif self.path.startswith("/slow-once"):
+            # Only the first request is slow
+            self.server.hits += 1
+            if self.server.hits == 1:
+                time.sleep(1.0)
+            self._send(200, {"hit": self.server.hits})
+        elif self.path.startswith("/compressed/"):
+            encoding = self.path.rsplit("/", 1)[1]
+            self.server.accept_encoding = self.headers.get("Accept-Encoding")
+            body = json.dumps({"data": "x" * 10000}).encode()
+            if encoding == "gzip":
+                body = gzip.compress(body)
+            elif encoding == "deflate":
+                body = zlib.compress(body)
+            elif encoding == "raw-deflate":
+                compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+                body = compressor.compress(body) + compressor.flush()
+                encoding = "deflate"
+            elif encoding == "broken":
+                body, encoding = b"not gzip at all", "gzip"
+            elif encoding == "truncated":
+                body, encoding = gzip.compress(body)[:-20], "gzip"
+            self.send_response(200)
+            self.send_header("Content-Encoding", encoding)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path.startswith("/redirect"):
+            self.send_response(302)
+            self.send_header("Location", "/ok")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path.startswith("/headers"):
+            self._send(200, {"path": self.path, "content_type": self.headers.get("Content-Type")})
+        else:
+            self._send(200, {"path": self.path})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        if self.path.startswith("/see-other"):
+            self.send_response(303)
+            self.send_header("Location", "/headers")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send(200, payload)
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+    hits = 0
+
+    def get_request(self):
+        self.connections += 1
+        return super().get_request()
+
+    def handle_error(self, request, client_address):
+        pass  # Clients that hang up early (abandoned hedges) are expected
+
+
+class LocalServerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = _CountingServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        http.get_pool().close_all()
+        http._breakers.clear()
+        http._host_pauses.clear()
+        self._retry_delay = http.RETRY_DELAY
+        http.RETRY_DELAY = 0.01
+
+    def tearDown(self):
+        http.RETRY_DELAY = self._retry_delay
+        http._breakers.clear()
+        http._host_pauses.clear()
+        http.get_pool().close_all()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_is_immediate(self):
+        bucket = http.TokenBucket(rate=1.0, capacity=3)
+        start = time.monotonic()
+        for _ in range(3):
+            bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.1)
+
+    def test_blocks_when_empty(self):
+        bucket = http.TokenBucket(rate=20.0, capacity=1)
+        bucket.acquire()
+        start = time.monotonic()
+        bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.03)
+
+
+class TestThrottle(unittest.TestCase):
+    def test_unlimited_host_does_not_block(self):
+        start = time.monotonic()
+        for _ in range(50):
+            http.throttle("https://api.openai.com/v1/responses")
+        self.assertLess(time.monotonic() - start, 0.1)
+
+
+    def test_reddit_aliases_share_one_bucket(self):
+        self.assertEqual(
+            {http.rate_limit_key(h) for h in ("www.reddit.com", "reddit.com", "old.reddit.com", "WWW.Reddit.com")},
+            {"reddit.com"},
+        )
+        self.assertEqual(http.rate_limit_key("notreddit.com"), "notreddit.com")
+
+        http._buckets.clear()
+        self.addCleanup(http._buckets.clear)
+        rate, burst = http.RATE_LIMITS["reddit.com"]
+        urls = ["https://www.reddit.com/a.json", "https://old.reddit.com/b.json"]
+        start = time.monotonic()
+        for i in range(burst + 2):
+            http.throttle(urls[i % 2])
+        # Two requests past the shared burst wait for refills at the single rate
+        self.assertGreaterEqual(time.monotonic() - start, 1.5 / rate)
+        self.assertEqual(list(http._buckets), ["reddit.com"])
+
+    def test_pause_applies_to_all_aliases(self):
+        self.addCleanup(http._host_pauses.clear)
+        http.pause_host("www.reddit.com", 30)
+        self.assertGreater(http.host_pause_remaining("https://old.reddit.com/x.json"), 0)
+        self.assertEqual(http.host_pause_remaining("https://example.com/"), 0)
+
+
+class TestConnectionPool(LocalServerTestCase):
+    def test_reuses_connection(self):
+        for i in range(5):
+            result = http.get(f"{self.base}/item/{i}")
+            self.assertEqual(result, {"path": f"/item/{i}"})
+        self.assertEqual(self.server.connections, 1)
+
+    def test_post_json(self):
+        result = http.post(f"{self.base}/echo", {"a": 1})
+        self.assertEqual(result, {"a": 1})
+
+    def test_post_see_other_redirect_drops_body_headers(self):
+        result = http.post(f"{self.base}/see-other", {"a": 1})
+        self.assertEqual(result, {"path": "/headers", "content_type": None})
+
+    def test_follows_redirect(self):
+        result = http.get(f"{self.base}/redirect")
+        self.assertEqual(result, {"path": "/ok"})
+
+    def test_client_error_raises(self):
+        with self.assertRaises(http.HTTPError) as ctx:
+            http.get(f"{self.base}/missing")
+        self.assertEqual(ctx.exception.status_code, 404)
+
+    def test_caps_connections_per_host(self):
+        pool = http.ConnectionPool(max_per_host=2)
+        key = ("http", "127.0.0.1", self.server.server_address[1])
+        conn1, _ = pool.acquire(key, 5)
+        conn2, _ = pool.acquire(key, 5)
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire(key, 5)))
+        waiter.start()
+        waiter.join(0.1)
+        self.assertEqual(acquired, [])
+        pool.release(key, conn1, True)
+        waiter.join(1)
+        self.assertEqual(acquired[0], (conn1, True))
+        pool.release(key, conn2, False)
+
+    def test_created_count_under_concurrency(self):
+        pool = http.ConnectionPool(max_per_host=4)
+        key = ("http", "127.0.0.1", self.server.server_address[1])
+        conns = []
+        threads = [threading.Thread(target=lambda: conns.append(pool.acquire(key, 5)[0])) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(1)
+        self.assertEqual(pool.created, 4)
+        for conn in conns:
+            pool.release(key, conn, False)
+
+    def test_expired_idle_connection_not_reused(self):
+        pool = http.ConnectionPool(idle_timeout=0)
+        key = ("http", "127.0.0.1", self.server.server_address[1])
+        conn, _ = pool.acquire(key, 5)
+        pool.release(key, conn, True)
+        _, reused = pool.acquire(key, 5)
+        self.assertFalse(reused)
+
+
+class TestBackoff(unittest.TestCase):
+    def test_delay_within_exponential_cap(self):
+        for attempt in range(10):
+            cap = min(http.RETRY_MAX_DELAY, http.RETRY_DELAY * 2 ** attempt)
+            for _ in range(20):
+                self.assertTrue(0 <= http.backoff_delay(attempt) <= cap)
+
+    def test_retry_after_seconds(self):
+        self.assertEqual(http.retry_after_seconds({"Retry-After": "7"}), 7.0)
+
+    def test_retry_after_http_date(self):
+        wait = http.retry_after_seconds({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        self.assertEqual(wait, 0.0)  # In the past
+
+    def test_ratelimit_headers_only_when_exhausted(self):
+        exhausted = {"x-ratelimit-remaining": "0.0", "x-ratelimit-reset": "42"}
+        available = {"x-ratelimit-remaining": "57.0", "x-ratelimit-reset": "42"}
+        self.assertEqual(http.retry_after_seconds(exhausted), 42.0)
+        self.assertIsNone(http.retry_after_seconds(available))
+        self.assertIsNone(http.retry_after_seconds({}))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_threshold(self):
+        breaker = http.CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        for _ in range(2):
+            breaker.record_failure()
+        self.assertEqual(breaker.state, "closed")
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow())
+
+    def test_success_resets_count(self):
+        breaker = http.CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "closed")
+
+    def test_half_open_allows_one_trial(self):
+        breaker = http.CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, "half-open")
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+
+    def test_half_open_success_closes(self):
+        breaker = http.CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+
+
+class TestRetries(LocalServerTestCase):
+    def test_server_errors_open_breaker(self):
+        for _ in range(2):
+            with self.assertRaises(http.HTTPError):
+                http.get(f"{self.base}/fail", retries=3)
+        self.assertEqual(self.server.hits, http.BREAKER_FAILURE_THRESHOLD)
+        self.assertFalse(http.host_available(self.base))
+        self.assertEqual(http.breaker_states(), {"127.0.0.1": "open"})
+
+        with self.assertRaises(http.CircuitOpenError):
+            http.get(f"{self.base}/ok")
+        self.assertEqual(self.server.hits, http.BREAKER_FAILURE_THRESHOLD)
+
+    def test_client_error_does_not_trip_breaker(self):
+        for _ in range(http.BREAKER_FAILURE_THRESHOLD + 1):
+            with self.assertRaises(http.HTTPError):
+                http.get(f"{self.base}/missing")
+        self.assertTrue(http.host_available(self.base))
+
+    def test_short_retry_after_is_waited_out(self):
+        start = time.monotonic()
+        result = http.get(f"{self.base}/limited")
+        self.assertEqual(result, {"path": "/limited"})
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+        self.assertEqual(self.server.hits, 2)
+
+    def test_long_retry_after_gives_up(self):
+        with self.assertRaises(http.HTTPError) as ctx:
+            http.get(f"{self.base}/limited-long")
+        self.assertEqual(ctx.exception.status_code, 429)
+        self.assertEqual(self.server.hits, 1)
+
+    def _half_open_breaker(self):
+        breaker = http.get_breaker(self.base)
+        breaker.reset_timeout = 0.05
+        for _ in range(http.BREAKER_FAILURE_THRESHOLD):
+            breaker.record_failure()
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, "half-open")
+        return breaker
+
+    def test_failed_trial_with_broken_response_reopens(self):
+        breaker = self._half_open_breaker()
+
+        def truncated(req, timeout):
+            raise http.http_client.IncompleteRead(b"{", 10)
+
+        with mock.patch.object(http, "_open", truncated):
+            with self.assertRaises(http.HTTPError):
+                http.get(f"{self.base}/ok", retries=1)
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.trial_in_flight)
+
+        # Once the reset timeout passes again, a new trial gets through
+        time.sleep(0.06)
+        self.assertEqual(http.get(f"{self.base}/ok"), {"path": "/ok"})
+        self.assertEqual(breaker.state, "closed")
+
+    def test_failed_trial_with_unexpected_error_reopens(self):
+        breaker = self._half_open_breaker()
+
+        def broken(req, timeout):
+            raise RuntimeError("boom")
+
+        with mock.patch.object(http, "_open", broken):
+            with self.assertRaises(RuntimeError):
+                http.get(f"{self.base}/ok", retries=1)
+        self.assertFalse(breaker.trial_in_flight)
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+
+
+class TestCompression(LocalServerTestCase):
+    def test_decodes_compressed_bodies(self):
+        for encoding in ("gzip", "deflate", "raw-deflate"):
+            before = http.transfer_stats()
+            result = http.get(f"{self.base}/compressed/{encoding}")
+            self.assertEqual(result, {"data": "x" * 10000})
+            after = http.transfer_stats()
+            wire = after["wire_bytes"] - before["wire_bytes"]
+            decoded = after["body_bytes"] - before["body_bytes"]
+            self.assertLess(wire, 500)
+            self.assertEqual(decoded, len(json.dumps(result)))
+        self.assertEqual(self.server.accept_encoding, http.ACCEPT_ENCODING)
+
+    def test_connection_reused_after_compressed_body(self):
+        http.get(f"{self.base}/compressed/gzip")
+        http.get(f"{self.base}/compressed/gzip")
+        self.assertEqual(self.server.connections, 1)
+
+    def test_corrupt_body_raises_http_error(self):
+        with self.assertRaises(http.HTTPError):
+            http.get(f"{self.base}/compressed/broken")
+
+    def test_truncated_body_raises_and_counts_as_failure(self):
+        with self.assertRaises(http.HTTPError) as ctx:
+            http.get(f"{self.base}/compressed/truncated")
+        self.assertIn("compressed", str(ctx.exception))
+        self.assertEqual(http.get_breaker(self.base).failures, 1)
+
+
+class TestHedging(LocalServerTestCase):
+    def setUp(self):
+        super().setUp()
+        http.set_hedging(True)
+        for _ in range(http.HEDGE_MIN_SAMPLES):
+            http.record_latency("127.0.0.1", 0.01)
+        self._max_fraction = http.HEDGE_MAX_FRACTION
+
+    def tearDown(self):
+        http.HEDGE_MAX_FRACTION = self._max_fraction
+        http.set_hedging(False)
+        super().tearDown()
+
+    def test_slow_request_is_hedged(self):
+        http.HEDGE_MAX_FRACTION = 1.0
+        start = time.monotonic()
+        result = http.get(f"{self.base}/slow-once", hedge=True)
+        self.assertLess(time.monotonic() - start, 0.8)
+        self.assertEqual(result, {"hit": 2})
+        self.assertEqual(http.hedge_stats(), {"requests": 1, "hedged": 1, "wins": 1})
+
+    def test_losing_attempt_is_cut_off_and_not_pooled(self):
+        http.HEDGE_MAX_FRACTION = 1.0
+        http.get(f"{self.base}/slow-once", hedge=True)
+        key = ("http", "127.0.0.1", self.server.server_address[1])
+        pool = http.get_pool()
+        deadline = time.monotonic() + 0.5
+        while pool._in_use.get(key) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(pool._in_use.get(key), 0)  # Freed well before the slow response
+        self.assertEqual(len(pool._idle[key]), 1)  # Only the winner's connection
+
+    def test_waits_are_bounded_by_timeout(self):
+        http.HEDGE_MAX_FRACTION = 1.0
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def stuck(req, timeout, hedge_attempt=None):
+            release.wait(5)
+            return 200, b"{}"
+
+        req = urllib.request.Request(f"{self.base}/ok")
+        start = time.monotonic()
+        with mock.patch.object(http, "_open", stuck):
+            with self.assertRaises(TimeoutError):
+                http._hedged_open(req, 0.3)
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_global_cap_blocks_hedge(self):
+        http.HEDGE_MAX_FRACTION = 0.0
+        result = http.get(f"{self.base}/slow-once", hedge=True)
+        self.assertEqual(result, {"hit": 1})
+        self.assertEqual(http.hedge_stats()["hedged"], 0)
+
+    def test_not_hedged_unless_requested(self):
+        http.HEDGE_MAX_FRACTION = 1.0
+        http.get(f"{self.base}/ok")
+        self.assertEqual(http.hedge_stats()["requests"], 0)
+
+    def test_no_threshold_without_samples(self):
+        self.assertIsNone(http.hedge_delay("example.com"))
+        self.assertAlmostEqual(http.hedge_delay("127.0.0.1"), http.HEDGE_MIN_DELAY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""Tests for incremental refresh (lib/incremental.py and --incremental)."""
+
+import argparse
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import last30days
+from lib import cache, dates, history, incremental, schema
+
+
+def make_report(range_from, range_to, reddit=(), x=()):
+    report = schema.create_report("topic", range_from, range_to, "both")
+    report.reddit = list(reddit)
+    report.x = list(x)
+    return report
+
+
+def reddit_item(item_id, post_id, date):
+    return schema.RedditItem(
+        id=item_id,
+        title=f"Post {post_id}",
+        url=f"https://www.reddit.com/r/test/comments/{post_id}/post/",
+        subreddit="test",
+        date=date,
+        engagement=schema.Engagement(score=10, num_comments=2, upvote_ratio=0.9),
+        relevance=0.8,
+    )
+
+
+class CacheDirTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = (cache.CACHE_DIR, cache.LOCK_DIR, cache.CACHE_BACKEND)
+        cache.CACHE_DIR = Path(self.tmp.name)
+        cache.LOCK_DIR = cache.CACHE_DIR / "locks"
+        cache.CACHE_BACKEND = "json"
+
+    def tearDown(self):
+        cache.CACHE_DIR, cache.LOCK_DIR, cache.CACHE_BACKEND = self.saved
+        self.tmp.cleanup()
+
+
+class TestBaseline(CacheDirTestCase):
+    def test_roundtrip(self):
+        incremental.save_baseline(make_report("2026-01-01", "2026-01-31"), "both", "default")
+        baseline = incremental.load_baseline("topic", "both", "default", "2026-01-02")
+        self.assertEqual(baseline.range_to, "2026-01-31")
+        self.assertIsNone(incremental.load_baseline("topic", "reddit", "default", "2026-01-02"))
+
+    def test_ignored_when_outside_window(self):
+        incremental.save_baseline(make_report("2026-01-01", "2026-01-31"), "both", "default")
+        self.assertIsNone(incremental.load_baseline("topic", "both", "default", "2026-02-05"))
+
+    def test_fetch_from(self):
+        baseline = make_report("2026-01-01", "2026-01-31")
+        self.assertEqual(incremental.fetch_from(None, "2026-01-02"), "2026-01-02")
+        self.assertEqual(incremental.fetch_from(baseline, "2026-01-02"), "2026-01-31")
+
+
+class TestCarryOver(unittest.TestCase):
+    def test_drops_expired_and_refreshes_reddit(self):
+        baseline = make_report("2026-01-01", "2026-01-31", reddit=[
+            reddit_item("R1", "aaa111", "2026-01-30"),
+            reddit_item("R2", "bbb222", "2026-01-01"),
+        ], x=[
+            schema.XItem(id="X1", text="old", url="https://x.com/u/status/1", author_handle="u", date="2026-01-01"),
+            schema.XItem(id="X2", text="new", url="https://x.com/u/status/2", author_handle="u", date="2026-01-30"),
+        ])
+        requested = []
+
+        def fake_fetch_info(post_ids):
+            requested.extend(post_ids)
+            return {"aaa111": {"score": 99, "num_comments": 40, "upvote_ratio": 0.95}}
+
+        with mock.patch.object(incremental.reddit_enrich, "fetch_info", fake_fetch_info):
+            reddit, x = incremental.carry_over(baseline, "2026-01-02")
+
+        self.assertEqual(requested, ["aaa111"])
+        self.assertEqual([item["id"] for item in reddit], ["R1"])
+        self.assertEqual(reddit[0]["engagement"]["score"], 99)
+        self.assertEqual([item["id"] for item in x], ["X2"])
+
+
+class TestMergeItems(unittest.TestCase):
+    def test_fetched_item_replaces_stored_and_ids_renumber(self):
+        new = [{"id": "R1", "url": "https://reddit.com/r/test/comments/aaa111/post", "title": "fresh"}]
+        stored = [
+            {"id": "R1", "url": "https://www.reddit.com/r/test/comments/aaa111/post/", "title": "stored"},
+            {"id": "R2", "url": "https://www.reddit.com/r/test/comments/bbb222/post/", "title": "other"},
+        ]
+        merged = incremental.merge_items(new, stored, "R")
+        self.assertEqual([item["title"] for item in merged], ["fresh", "other"])
+        self.assertEqual([item["id"] for item in merged], ["R1", "R2"])
+
+
+class TestIncrementalRun(CacheDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.output_dir = Path(self.tmp.name) / "out"
+        args = argparse.Namespace(
+            incremental=True, mock=False, enrich_workers=1, enrich_max_items=None,
+            enrich_time_budget=None, stream=False, history=False,
+        )
+        self.ctx = SimpleNamespace(args=args, config={}, x_source="xai", selected_models=lambda: {})
+
+    def run_topic(self, found, from_date, to_date, found_x=()):
+        searched = []
+
+        def fake_run_research(topic, sources, config, models, search_from, search_to, *args, **kwargs):
+            searched.append(search_from)
+            return [dict(item) for item in found], [dict(item) for item in found_x], \
+                False, None, None, [], None, None
+
+        with mock.patch.object(last30days, "run_research", fake_run_research), \
+             mock.patch.object(incremental.reddit_enrich, "fetch_info", lambda ids: {}):
+            report, _ = last30days._run_topic(
+                self.ctx, "topic", "both" if found_x else "reddit", "default", from_date, to_date,
+                None, self.output_dir, "key",
+            )
+        return report, searched
+
+    def test_second_run_fetches_only_new_items_and_merges(self):
+        today = dates.get_date_range(30)[1]
+        first = {"id": "R1", "title": "First", "url": "https://www.reddit.com/r/test/comments/aaa111/first/",
+                 "subreddit": "test", "date": today, "relevance": 0.9,
+                 "engagement": {"score": 50, "num_comments": 10, "upvote_ratio": 0.9}}
+        second = dict(first, title="Second", url="https://www.reddit.com/r/test/comments/bbb222/second/")
+
+        from_date, to_date = dates.get_date_range(30)
+        report, searched = self.run_topic([first], from_date, to_date)
+        self.assertEqual(searched, [from_date])
+        self.assertEqual(len(report.reddit), 1)
+
+        report, searched = self.run_topic([second], from_date, to_date)
+        self.assertEqual(searched, [to_date])
+        self.assertEqual(sorted(item.title for item in report.reddit), ["First", "Second"])
+
+    def test_history_skips_items_not_refetched(self):
+        today = dates.get_date_range(30)[1]
+        reddit = {"id": "R1", "title": "Post", "url": "https://www.reddit.com/r/test/comments/aaa111/post/",
+                  "subreddit": "test", "date": today, "relevance": 0.9,
+                  "engagement": {"score": 50, "num_comments": 10, "upvote_ratio": 0.9}}
+        post = {"id": "X1", "text": "unrelated thoughts on rust compile times", "url": "https://x.com/u/status/1", "author_handle": "u",
+                "date": today, "relevance": 0.9, "engagement": {"likes": 5, "reposts": 1}}
+        new_post = dict(post, id="X2", text="a release announcement", url="https://x.com/u/status/2")
+        store = history.HistoryStore(Path(self.tmp.name) / "history.sqlite3")
+        self.ctx.args.history = True
+        from_date, to_date = dates.get_date_range(30)
+
+        with mock.patch.object(history, "get_store", lambda: store):
+            self.run_topic([reddit], from_date, to_date, found_x=[post])
+            # Second run: both stored items are carried over without new
+            # engagement (bulk info finds nothing); only X2 is fetched
+            report, _ = self.run_topic([], from_date, to_date, found_x=[new_post])
+
+        self.assertEqual(len(report.x), 2)
+        recorded = [row["url"] for row in store.snapshots("topic", "2000-01-01", "2100-01-01")]
+        self.assertEqual(sorted(recorded), sorted([reddit["url"], post["url"], new_post["url"]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
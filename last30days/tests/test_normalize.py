@@ -70,6 +70,17 @@ class TestNormalizeRedditItems(unittest.TestCase):
         self.assertEqual(result[0].engagement.score, 100)
         self.assertEqual(result[0].engagement.num_comments, 50)
 
+    def test_interns_shared_strings(self):
+        items = [
+            {"id": f"R{i}", "title": "T", "url": "", "subreddit": "".join("python"), "date": "".join("2026-01-15")}
+            for i in range(2)
+        ]
+
+        result = normalize.normalize_reddit_items(items, "2026-01-01", "2026-01-31")
+
+        self.assertIs(result[0].subreddit, result[1].subreddit)
+        self.assertIs(result[0].date, result[1].date)
+
 
 class TestNormalizeXItems(unittest.TestCase):
     def test_normalizes_basic_item(self):
@@ -0,0 +1,353 @@
+"""Tests for the run_research pipeline in last30days.py."""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import last30days
+from lib import budget, cache, dates, schema
+
+
+class TestRunResearchOverlap(unittest.TestCase):
+    def test_enrichment_starts_before_x_search_finishes(self):
+        x_done = threading.Event()
+        enrich_saw_x_done = []
+
+        def fake_search_reddit(*args):
+            return [{"url": "https://reddit.com/r/a/comments/1/x"}], {}, None
+
+        def fake_search_x(*args):
+            time.sleep(0.3)
+            x_done.set()
+            return [{"url": "https://x.com/u/status/1"}], {}, None
+
+        def fake_enrich(items, *args, **kwargs):
+            enrich_saw_x_done.append(x_done.is_set())
+            return list(items)
+
+        with mock.patch.object(last30days, "_search_reddit", fake_search_reddit), \
+             mock.patch.object(last30days, "_search_x", fake_search_x), \
+             mock.patch.object(last30days, "_enrich_reddit", fake_enrich):
+            result = last30days.run_research(
+                "topic", "both", {}, {}, "2026-01-01", "2026-01-31", mock=True,
+            )
+
+        reddit_items, x_items = result[0], result[1]
+        self.assertEqual(enrich_saw_x_done, [False])
+        self.assertEqual(len(reddit_items), 1)
+        self.assertEqual(len(x_items), 1)
+
+    def test_reddit_failure_does_not_drop_x(self):
+        def failing_search_reddit(*args):
+            raise RuntimeError("boom")
+
+        def fake_search_x(*args):
+            return [{"url": "https://x.com/u/status/1"}], {}, None
+
+        with mock.patch.object(last30days, "_search_reddit", failing_search_reddit), \
+             mock.patch.object(last30days, "_search_x", fake_search_x):
+            result = last30days.run_research(
+                "topic", "both", {}, {}, "2026-01-01", "2026-01-31", mock=True,
+            )
+
+        self.assertEqual(result[0], [])
+        self.assertEqual(len(result[1]), 1)
+        self.assertEqual(result[6], "RuntimeError: boom")
+
+    def test_source_with_open_breaker_is_skipped(self):
+        called = []
+
+        def fake_search_reddit(*args):
+            called.append("reddit")
+            return [], {}, None
+
+        def fake_search_x(*args):
+            called.append("x")
+            return [{"url": "https://x.com/u/status/1"}], {}, None
+
+        def fake_host_available(url):
+            return "openai" not in url
+
+        with mock.patch.object(last30days, "_search_reddit", fake_search_reddit), \
+             mock.patch.object(last30days, "_search_x", fake_search_x), \
+             mock.patch.object(last30days.http, "host_available", fake_host_available):
+            result = last30days.run_research(
+                "topic", "both", {}, {}, "2026-01-01", "2026-01-31", depth="quick",
+            )
+
+        self.assertEqual(called, ["x"])
+        self.assertIn("circuit open", result[6])
+        self.assertEqual(len(result[1]), 1)
+
+    def test_streamed_items_prefetch_threads(self):
+        streamed = [
+            {"url": "https://www.reddit.com/r/a/comments/1/x/", "date": "2026-01-10"},
+            {"url": "https://www.reddit.com/r/a/comments/2/x/", "date": "2025-12-01"},  # Out of range
+            {"url": "https://www.reddit.com/r/a/comments/3/x/", "date": None},
+        ]
+        prefetched = []
+
+        def fake_search_reddit(*args):
+            on_item = args[7]
+            for item in streamed:
+                on_item(item)
+            return list(streamed), {}, None
+
+        def fake_prefetch(url):
+            prefetched.append(url)
+            return True
+
+        with mock.patch.object(last30days, "_search_reddit", fake_search_reddit), \
+             mock.patch.object(last30days.reddit_enrich, "prefetch_thread", fake_prefetch), \
+             mock.patch.object(last30days, "_enrich_reddit", lambda items, *a, **kw: list(items)):
+            last30days.run_research(
+                "topic", "reddit", {}, {}, "2026-01-01", "2026-01-31", depth="quick", stream=True,
+            )
+
+        self.assertEqual(prefetched, [streamed[0]["url"], streamed[2]["url"]])
+
+
+class TestEnrichRedditTiers(unittest.TestCase):
+    def test_full_fetch_only_for_top_items_and_misses(self):
+        items = [
+            {"id": f"R{i}", "url": f"https://www.reddit.com/r/a/comments/p{i}/x/", "title": f"T{i}",
+             "relevance": i / 20}
+            for i in range(20)
+        ]
+        fetched = []
+
+        def fake_fetch_info(ids):
+            # p0 is missing from the bulk response
+            return {post_id: {"score": 5, "num_comments": 1} for post_id in ids if post_id != "p0"}
+
+        def fake_enrich_item(item):
+            fetched.append(item["id"])
+            return item
+
+        with mock.patch.object(last30days.reddit_enrich, "fetch_info", fake_fetch_info), \
+             mock.patch.object(last30days.reddit_enrich, "enrich_reddit_item", fake_enrich_item):
+            result = last30days._enrich_reddit(
+                items, False, from_date="2026-01-01", to_date="2026-01-31", comment_limit=3,
+            )
+
+        # Top 3 by relevance, plus the item bulk info missed
+        self.assertEqual(sorted(fetched), ["R0", "R17", "R18", "R19"])
+        self.assertEqual(result[5]["engagement"]["score"], 5)
+
+
+class TestEnrichRedditBudget(unittest.TestCase):
+    def tearDown(self):
+        budget.start(None)
+
+    def make_items(self):
+        # Bulk info unavailable: every item is a candidate, none has engagement
+        return [
+            {"id": f"R{i}", "url": f"https://www.reddit.com/r/a/comments/p{i}/x/", "title": f"T{i}",
+             "relevance": i / 10, "engagement": {"score": 1}}
+            for i in range(10)
+        ]
+
+    def run_enrich(self, items, delay=0, **kwargs):
+        fetched = []
+
+        def fake_enrich_item(item):
+            fetched.append(item["id"])
+            time.sleep(delay)
+            item["engagement"] = {"score": 99}
+            return item
+
+        with mock.patch.object(last30days.reddit_enrich, "fetch_info", lambda ids: {}), \
+             mock.patch.object(last30days.reddit_enrich, "enrich_reddit_item", fake_enrich_item):
+            last30days._enrich_reddit(
+                items, False, max_workers=1, from_date="2026-01-01", to_date="2026-01-31", **kwargs,
+            )
+        return fetched
+
+    def test_item_budget_takes_highest_priority(self):
+        items = self.make_items()
+        fetched = self.run_enrich(items, max_items=3)
+        self.assertEqual(fetched, ["R9", "R8", "R7"])
+        # Over-budget items are marked so the unknown-engagement penalty applies
+        self.assertIsNone(items[0]["engagement"])
+        self.assertEqual(items[9]["engagement"], {"score": 99})
+        self.assertEqual(budget.partial_reasons(),
+                         ["Reddit enrichment capped at 3 threads (7 items without engagement)"])
+
+    def test_time_budget_stops_new_fetches(self):
+        items = self.make_items()
+        fetched = self.run_enrich(items, max_items=None, time_budget=0.05, delay=0.03)
+        self.assertLess(len(fetched), 10)
+        self.assertEqual(fetched, [f"R{i}" for i in range(9, 9 - len(fetched), -1)])
+        self.assertIsNone(items[0]["engagement"])
+        self.assertEqual(budget.partial_reasons(), [])  # No run budget, no cap
+
+
+class TestSearchRedditSpeculative(unittest.TestCase):
+    TOPIC = "best tips for using claude code skills"
+
+    def run_search(self, results_by_query, delay=0.2):
+        started = []
+
+        def fake_search(api_key, model, query, from_date, to_date, depth="default", on_item=None):
+            started.append(query)
+            time.sleep(delay)
+            return {"items": results_by_query.get(query, [])}
+
+        with mock.patch.object(last30days.openai_reddit, "search_reddit", fake_search), \
+             mock.patch.object(last30days.openai_reddit, "parse_reddit_response",
+                               lambda raw: list(raw.get("items", []))):
+            start = time.monotonic()
+            items, _, error = last30days._search_reddit(
+                self.TOPIC, {"OPENAI_API_KEY": "k"}, {"openai": "m"},
+                "2026-01-01", "2026-01-31", "default", False,
+            )
+            elapsed = time.monotonic() - start
+        return items, error, started, elapsed
+
+    def test_thin_primary_merges_fallbacks_in_parallel(self):
+        core = last30days.openai_reddit._extract_core_subject(self.TOPIC)
+        sub = last30days.openai_reddit._build_subreddit_query(self.TOPIC)
+        items, error, started, elapsed = self.run_search({
+            self.TOPIC: [{"url": "a"}],
+            core: [{"url": "a"}, {"url": "b"}],
+            sub: [{"url": "c"}],
+        })
+        self.assertIsNone(error)
+        self.assertEqual([i["url"] for i in items], ["a", "b", "c"])
+        self.assertEqual(len(started), 3)
+        self.assertLess(elapsed, 0.5)  # Not three 0.2s calls in a row
+
+    def test_full_primary_discards_fallbacks(self):
+        core = last30days.openai_reddit._extract_core_subject(self.TOPIC)
+        items, _, _, _ = self.run_search({
+            self.TOPIC: [{"url": str(i)} for i in range(5)],
+            core: [{"url": "extra"}],
+        })
+        self.assertEqual([i["url"] for i in items], ["0", "1", "2", "3", "4"])
+
+    def test_short_topic_not_speculative(self):
+        self.TOPIC = "rust"
+        _, _, started, _ = self.run_search({"rust": [{"url": str(i)} for i in range(5)]}, delay=0)
+        self.assertEqual(started, ["rust"])
+
+
+class TestProcessItems(unittest.TestCase):
+    STORY = "Claude Code adds background agents for long running refactors"
+
+    def setUp(self):
+        self.from_date, self.to_date = dates.get_date_range(30)
+
+    def reddit(self, date):
+        return schema.RedditItem(
+            id="R1", title=self.STORY, url="https://www.reddit.com/r/a/comments/r1/story/", subreddit="a",
+            date=date, engagement=schema.Engagement(score=50, num_comments=10, upvote_ratio=0.9), relevance=0.9,
+        )
+
+    def x(self):
+        return schema.XItem(
+            id="X1", text=self.STORY, url="https://x.com/u/status/1", author_handle="u", date=self.to_date,
+            engagement=schema.Engagement(likes=500, reposts=50), relevance=0.9,
+        )
+
+    def test_web_items_clustered_across_sources(self):
+        web = schema.WebSearchItem(
+            id="W1", title=self.STORY, url="https://blog.example.com/background-agents",
+            source_domain="blog.example.com", snippet="", date=self.to_date, relevance=0.9,
+        )
+        reddit, x, web_items = last30days.process_items(
+            [self.reddit(self.to_date)], [], self.from_date, self.to_date, normalized_web=[web],
+        )
+        self.assertEqual([item.id for item in reddit], ["R1"])
+        self.assertEqual(web_items, [])
+        self.assertEqual(len(reddit[0].cross_refs), 1)
+
+    def test_minimum_reddit_results_do_not_reintroduce_duplicates(self):
+        # The only Reddit item is outside the window, so the guarantee keeps it;
+        # it's the same story as the X post, so only one copy survives
+        stale = self.reddit(dates.get_date_range(60)[0])
+        reddit, x, _ = last30days.process_items([stale], [self.x()], self.from_date, self.to_date)
+        self.assertEqual(len(reddit) + len(x), 1)
+
+
+class TestReportCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = (cache.CACHE_DIR, cache.LOCK_DIR, cache.CACHE_BACKEND)
+        cache.CACHE_DIR = Path(self.tmp.name)
+        cache.LOCK_DIR = cache.CACHE_DIR / "locks"
+        cache.CACHE_BACKEND = "json"
+        self.runs = []
+        self.refreshes = []
+
+    def tearDown(self):
+        cache.CACHE_DIR, cache.LOCK_DIR, cache.CACHE_BACKEND = self.saved
+        self.tmp.cleanup()
+
+    def save_report(self, days_back, label):
+        to_date = date.fromisoformat(dates.get_date_range(30)[1]) - timedelta(days=days_back)
+        from_date = to_date - timedelta(days=30)
+        report = schema.create_report(label, from_date.isoformat(), to_date.isoformat(), "both")
+        key = cache.get_cache_key("topic", from_date.isoformat(), to_date.isoformat(), "both", "default")
+        cache.save_cache(key, report.to_dict())
+
+    def research(self, **flags):
+        args = argparse.Namespace(mock=False, no_cache=False, refresh=False, stale_while_revalidate=False)
+        vars(args).update(flags)
+        ctx = SimpleNamespace(args=args)
+
+        def fake_run_topic(ctx, topic, sources, depth, from_date, to_date, progress, output_dir, cache_key):
+            self.runs.append(cache_key)
+            return schema.create_report("fresh", from_date, to_date, "both"), False
+
+        with mock.patch.object(last30days, "_run_topic", fake_run_topic), \
+             mock.patch.object(last30days, "_spawn_background_refresh", lambda: self.refreshes.append(1)), \
+             mock.patch.object(last30days.render, "write_outputs", lambda *a, **kw: None):
+            report, _, from_date, to_date = last30days.research_topic(ctx, "topic", "both", "default", 30)
+        return report
+
+    def test_fresh_hit_is_served(self):
+        self.save_report(0, "today")
+        report = self.research(stale_while_revalidate=True)
+        self.assertEqual(report.topic, "today")
+        self.assertTrue(report.from_cache)
+        self.assertEqual((self.runs, self.refreshes), ([], []))
+
+    def test_stale_hit_is_served_and_refreshed(self):
+        self.save_report(2, "two days ago")
+        report = self.research(stale_while_revalidate=True)
+        self.assertEqual(report.topic, "two days ago")
+        self.assertEqual((self.runs, self.refreshes), ([], [1]))
+
+    def test_earlier_window_ignored_without_swr(self):
+        self.save_report(1, "yesterday")
+        self.assertEqual(self.research().topic, "fresh")
+        self.assertEqual(len(self.runs), 1)
+
+    def test_too_old_report_is_not_served(self):
+        self.save_report(int(cache.STALE_TTL_HOURS // 24) + 1, "too old")
+        self.assertEqual(self.research(stale_while_revalidate=True).topic, "fresh")
+        self.assertEqual(self.refreshes, [])
+
+    def test_refresh_bypasses_cache(self):
+        self.save_report(0, "today")
+        self.assertEqual(self.research(refresh=True).topic, "fresh")
+        self.assertIsNotNone(self.runs[0])
+
+    def test_no_cache_neither_reads_nor_writes(self):
+        self.save_report(0, "today")
+        self.assertEqual(self.research(no_cache=True).topic, "fresh")
+        self.assertEqual(self.runs, [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+"""Tests for reddit_enrich module."""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import cache, reddit_enrich, runstate
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "reddit_thread_sample.json"
+
+
+class TestNormalizePermalink(unittest.TestCase):
+    def test_strips_slug_query_and_host(self):
+        a = reddit_enrich.normalize_permalink(
+            "https://old.reddit.com/r/ClaudeAI/comments/abc123/some_title/?utm_source=x"
+        )
+        b = reddit_enrich.normalize_permalink("https://www.reddit.com/r/claudeai/comments/abc123/")
+        self.assertEqual(a, "/r/claudeai/comments/abc123")
+        self.assertEqual(a, b)
+
+    def test_non_reddit_url(self):
+        self.assertIsNone(reddit_enrich.normalize_permalink("https://example.com/r/x/comments/1"))
+
+
+def _info_listing(ids):
+    return {"data": {"children": [
+        {"kind": "t3", "data": {"id": post_id, "score": 10, "num_comments": 2,
+                                "upvote_ratio": 0.9, "created_utc": 1768478400}}
+        for post_id in ids
+    ]}}
+
+
+class TestBulkInfo(unittest.TestCase):
+    def test_extract_post_id(self):
+        self.assertEqual(
+            reddit_enrich.extract_post_id("https://www.reddit.com/r/Python/comments/Abc12/title/"),
+            "abc12",
+        )
+        self.assertIsNone(reddit_enrich.extract_post_id("https://www.reddit.com/r/Python/"))
+
+    def test_fetch_info_batches_by_100(self):
+        calls = []
+
+        def fake_get(url, headers=None, **kwargs):
+            ids = url.split("id=")[1].split("&")[0].replace("t3_", "").split(",")
+            calls.append(len(ids))
+            return _info_listing(ids)
+
+        with mock.patch.object(reddit_enrich.http, "get", fake_get):
+            info = reddit_enrich.fetch_info([f"p{i}" for i in range(150)])
+
+        self.assertEqual(calls, [100, 50])
+        self.assertEqual(len(info), 150)
+        self.assertEqual(info["p0"]["score"], 10)
+
+    def test_refresh_engagement_updates_items(self):
+        items = [
+            {"url": "https://www.reddit.com/r/a/comments/p1/x/"},
+            {"url": "https://www.reddit.com/r/a/comments/gone/x/"},
+        ]
+        with mock.patch.object(reddit_enrich.http, "get", lambda url, **kw: _info_listing(["p1"])):
+            info = reddit_enrich.refresh_engagement(items)
+
+        self.assertEqual(set(info), {"p1"})
+        self.assertEqual(items[0]["engagement"]["num_comments"], 2)
+        self.assertEqual(items[0]["date"], "2026-01-15")
+        self.assertNotIn("engagement", items[1])
+
+
+class TestTopComments(unittest.TestCase):
+    COMMENTS = [
+        {"score": 5, "author": "a", "body": "1"},
+        {"score": 9, "author": "[deleted]", "body": "2"},
+        {"score": 5, "author": "b", "body": "3"},
+        {"score": 7, "author": "c", "body": "4"},
+        {"score": 1, "author": "[removed]", "body": "5"},
+    ]
+
+    def test_matches_full_sort_including_ties(self):
+        valid = [c for c in self.COMMENTS if c["author"] not in ("[deleted]", "[removed]")]
+        expected = sorted(valid, key=lambda c: c["score"], reverse=True)[:2]
+        self.assertEqual(reddit_enrich.get_top_comments(iter(self.COMMENTS), limit=2), expected)
+
+    def test_parse_top_k_matches_untrimmed(self):
+        data = json.loads(FIXTURE.read_text())
+        full = reddit_enrich.parse_thread_data(data)
+        trimmed = reddit_enrich.parse_thread_data(data, top_k=2)
+        self.assertEqual(trimmed["comments"], reddit_enrich.get_top_comments(full["comments"], 2))
+        self.assertEqual(trimmed["submission"], full["submission"])
+
+    def test_fetch_requests_trimmed_listing(self):
+        urls = []
+
+        def fake_get(url, headers=None, **kwargs):
+            urls.append(url)
+            return []
+
+        with mock.patch.object(reddit_enrich.http, "get", fake_get):
+            reddit_enrich.fetch_thread_data("https://www.reddit.com/r/a/comments/abc/title/")
+
+        self.assertEqual(
+            urls,
+            ["https://www.reddit.com/r/a/comments/abc/title.json?raw_json=1&limit=30&depth=1&sort=top"],
+        )
+
+
+class TestThreadCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patches = [
+            mock.patch.object(cache, "CACHE_DIR", Path(self.tmp.name)),
+            mock.patch.object(cache, "CACHE_BACKEND", "json"),
+            mock.patch.object(reddit_enrich, "THREAD_CACHE_TTL_MINUTES", 60),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        with open(FIXTURE) as f:
+            self.thread = json.load(f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_second_fetch_is_cached(self):
+        url = "https://www.reddit.com/r/test/comments/abc123/title/"
+        with mock.patch.object(reddit_enrich, "fetch_thread_data", return_value=self.thread) as fetch:
+            first = reddit_enrich.get_parsed_thread(url)
+            second = reddit_enrich.get_parsed_thread(url.replace("www.", "old.") + "?ref=share")
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(set(second), {"submission", "comments"})
+
+    def test_disabled_when_ttl_zero(self):
+        url = "https://www.reddit.com/r/test/comments/abc123/title/"
+        with mock.patch.object(reddit_enrich, "THREAD_CACHE_TTL_MINUTES", 0), \
+                mock.patch.object(reddit_enrich, "fetch_thread_data", return_value=self.thread) as fetch:
+            reddit_enrich.get_parsed_thread(url)
+            reddit_enrich.get_parsed_thread(url)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_memory_cache_skips_disk(self):
+        url = "https://www.reddit.com/r/test/comments/mem123/title/"
+        reddit_enrich.enable_memory_cache(10)
+        self.addCleanup(reddit_enrich.enable_memory_cache, 0)
+        with mock.patch.object(reddit_enrich, "fetch_thread_data", return_value=self.thread), \
+                mock.patch.object(cache, "load_entry", wraps=cache.load_entry) as load:
+            first = reddit_enrich.get_parsed_thread(url)
+            second = reddit_enrich.get_parsed_thread(url)
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(first, second)
+
+    def test_counts_hits_and_misses(self):
+        url = "https://www.reddit.com/r/test/comments/xyz789/title/"
+        before = reddit_enrich.get_cache_stats()
+        with mock.patch.object(reddit_enrich, "fetch_thread_data", return_value=self.thread):
+            reddit_enrich.get_parsed_thread(url)
+            reddit_enrich.get_parsed_thread(url)
+        after = reddit_enrich.get_cache_stats()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+
+
+class TestPrefetch(unittest.TestCase):
+    def setUp(self):
+        with open(FIXTURE) as f:
+            self.thread = json.load(f)
+        self.addCleanup(reddit_enrich.discard_prefetched)
+
+    def test_prefetched_thread_is_not_fetched_again(self):
+        url = "https://www.reddit.com/r/test/comments/pre123/title/"
+        with mock.patch.object(reddit_enrich, "THREAD_CACHE_TTL_MINUTES", 0), \
+                mock.patch.object(reddit_enrich, "fetch_thread_data", return_value=self.thread) as fetch:
+            self.assertTrue(reddit_enrich.prefetch_thread(url))
+            self.assertFalse(reddit_enrich.prefetch_thread(url))
+            parsed = reddit_enrich.get_parsed_thread(url)
+        self.assertEqual(fetch.call_count, 1)
+        self.assertIn("submission", parsed)
+        self.assertEqual(reddit_enrich.discard_prefetched(), 0)
+
+    def test_unclaimed_prefetches_are_discarded(self):
+        with mock.patch.object(reddit_enrich, "THREAD_CACHE_TTL_MINUTES", 0), \
+                mock.patch.object(reddit_enrich, "fetch_thread_data", return_value=self.thread):
+            reddit_enrich.prefetch_thread("https://www.reddit.com/r/test/comments/un1/a/")
+            reddit_enrich.prefetch_thread("https://example.com/not-reddit")
+            self.assertEqual(reddit_enrich.discard_prefetched(), 1)
+
+    def test_prefetches_are_per_run(self):
+        url = "https://www.reddit.com/r/test/comments/run1/a/"
+        with mock.patch.object(reddit_enrich, "THREAD_CACHE_TTL_MINUTES", 0), \
+                mock.patch.object(reddit_enrich, "fetch_thread_data", return_value=self.thread):
+            with runstate.activate(runstate.RunState()):
+                self.assertTrue(reddit_enrich.prefetch_thread(url))
+                with runstate.activate(runstate.RunState()):
+                    # Another topic's run neither sees nor discards it
+                    self.assertTrue(reddit_enrich.prefetch_thread(url))
+                    self.assertEqual(reddit_enrich.discard_prefetched(), 1)
+                self.assertEqual(reddit_enrich.discard_prefetched(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -138,6 +138,42 @@ class TestScoreXItems(unittest.TestCase):
         self.assertGreater(result[0].score, 0)
 
 
+class TestBatchEngagementRaw(unittest.TestCase):
+    def test_reddit_matches_per_item(self):
+        engagements = [
+            schema.Engagement(score=100, num_comments=20, upvote_ratio=0.9),
+            schema.Engagement(score=None, num_comments=5),
+            schema.Engagement(upvote_ratio=0.8),
+            None,
+            schema.Engagement(score=100, num_comments=0),
+        ]
+        self.assertEqual(
+            score.reddit_engagement_raw_batch(engagements),
+            [score.compute_reddit_engagement_raw(e) for e in engagements],
+        )
+
+    def test_x_matches_per_item(self):
+        engagements = [
+            schema.Engagement(likes=100, reposts=25, replies=15, quotes=5),
+            schema.Engagement(likes=None, reposts=3),
+            schema.Engagement(replies=4),
+            None,
+        ]
+        self.assertEqual(
+            score.x_engagement_raw_batch(engagements),
+            [score.compute_x_engagement_raw(e) for e in engagements],
+        )
+
+    def test_recency_scores_repeated_dates(self):
+        today = datetime.now(timezone.utc).date().isoformat()
+        self.assertEqual(score.recency_scores([today, None, today]), [100, 0, 100])
+
+    def test_priority_with_null_relevance(self):
+        missing, null, explicit = score.priority_scores([{}, {"relevance": None}, {"relevance": 0.5}])
+        self.assertEqual(missing, null)
+        self.assertEqual(null, explicit)
+
+
 class TestSortItems(unittest.TestCase):
     def test_sorts_by_score_descending(self):
         items = [
@@ -0,0 +1,193 @@
+"""Tests for service module."""
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import last30days
+from lib import budget, schema, service
+
+
+def _call(base, method, path, body=None):
+    data = json.dumps(body).encode() if body is not None else (b"{}" if method == "POST" else None)
+    req = urllib.request.Request(base + path, data=data, method=method)
+    try:
+        with urllib.request.urlopen(req, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_one_execution(self):
+        flights = service.SingleFlight()
+        runs = []
+        results = []
+
+        def work():
+            runs.append(1)
+            time.sleep(0.1)
+            return "done"
+
+        threads = [threading.Thread(target=lambda: results.append(flights.do("k", work))) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True, True, True])
+        self.assertTrue(all(result == "done" for result, _ in results))
+        self.assertEqual(flights.in_flight(), 0)
+
+    def test_error_propagates_and_key_is_released(self):
+        flights = service.SingleFlight()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            flights.do("k", fail)
+        self.assertEqual(flights.do("k", lambda: 1), (1, False))
+
+
+class TestJSONService(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+
+        def slow(body):
+            self.release.wait(5)
+            return {"slow": True}
+
+        def echo(body):
+            if "bad" in body:
+                raise service.ServiceError("bad input")
+            return {"echo": body}
+
+        self.server = service.JSONService(("127.0.0.1", 0), {
+            ("POST", "/echo"): echo,
+            ("POST", "/slow"): slow,
+        })
+        self.thread = threading.Thread(target=service.serve, args=(self.server,), daemon=True)
+        self.thread.start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.release.set()
+        self.server.request_shutdown()
+        self.thread.join(5)
+
+    def test_routes_and_errors(self):
+        self.assertEqual(_call(self.base, "POST", "/echo", {"a": 1}), (200, {"echo": {"a": 1}}))
+        self.assertEqual(_call(self.base, "POST", "/echo", {"bad": 1}), (400, {"error": "bad input"}))
+        self.assertEqual(_call(self.base, "GET", "/missing")[0], 404)
+        status, health = _call(self.base, "GET", "/health")
+        self.assertEqual((status, health["status"]), (200, "ok"))
+
+    def test_shutdown_waits_for_in_flight_requests(self):
+        slow_result = []
+        client = threading.Thread(target=lambda: slow_result.append(_call(self.base, "POST", "/slow")))
+        client.start()
+        time.sleep(0.1)
+
+        self.assertEqual(_call(self.base, "POST", "/shutdown"), (200, {"status": "stopping"}))
+        self.thread.join(0.3)
+        self.assertTrue(self.thread.is_alive())  # Still draining the slow request
+
+        self.release.set()
+        client.join(5)
+        self.thread.join(5)
+        self.assertFalse(self.thread.is_alive())
+        self.assertEqual(slow_result, [(200, {"slow": True})])
+
+
+class _FakeContext:
+    def __init__(self):
+        self.args = argparse.Namespace(sources="auto", days=30, mock=True)
+
+    def resolve_sources(self, requested):
+        return "both", None
+
+
+class TestResearchRoute(unittest.TestCase):
+    def test_concurrent_topics_keep_their_own_partial_reasons(self):
+        both_running = threading.Barrier(2, timeout=5)
+
+        def fake_run_topic(ctx, topic, sources, depth, from_date, to_date, progress, output_dir, cache_key):
+            if topic == "slow":
+                budget.mark_partial("Reddit enrichment cut short (run budget)")
+            both_running.wait()
+            report = schema.create_report(topic, from_date, to_date, "both")
+            report.partial_reasons = budget.partial_reasons()
+            return report, False
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        server = service.JSONService(
+            ("127.0.0.1", 0), last30days.service_routes(_FakeContext(), "default", Path(tmp.name)),
+        )
+        thread = threading.Thread(target=service.serve, args=(server,), daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(server.request_shutdown)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        results = {}
+        with mock.patch.object(last30days, "_run_topic", fake_run_topic):
+            clients = [
+                threading.Thread(target=lambda t=topic: results.update(
+                    {t: _call(base, "POST", "/research", {"topic": t})}))
+                for topic in ("slow", "fast")
+            ]
+            for client in clients:
+                client.start()
+            for client in clients:
+                client.join(10)
+
+        self.assertEqual(results["slow"][0], 200)
+        self.assertEqual(results["slow"][1]["report"]["partial_reasons"],
+                         ["Reddit enrichment cut short (run budget)"])
+        self.assertEqual(results["fast"][0], 200)
+        self.assertNotIn("partial", results["fast"][1]["report"])
+        self.assertEqual(budget.partial_reasons(), [])
+
+    def test_output_dirs_differ_per_request_key(self):
+        def fake_research_topic(ctx, topic, sources, depth, days, progress=None, output_dir=None):
+            return schema.create_report(topic, "2026-01-01", "2026-01-31", "both"), False, "", ""
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        research = last30days.service_routes(_FakeContext(), "default", Path(tmp.name))[("POST", "/research")]
+        with mock.patch.object(last30days, "research_topic", fake_research_topic):
+            dirs = [
+                research(body)["output_dir"]
+                for body in ({"topic": "Rust"}, {"topic": "Rust", "depth": "quick"},
+                             {"topic": "Rust", "days": 7}, {"topic": "rust!"}, {"topic": "Rust"})
+            ]
+        self.assertEqual(len(set(dirs[:4])), 4)
+        self.assertEqual(dirs[0], dirs[4])
+        self.assertTrue(all(Path(d).name.startswith("rust-") for d in dirs))
+
+    def test_process_accepts_web_results(self):
+        process = last30days.service_routes(_FakeContext(), "default", Path("/tmp"))[("POST", "/process")]
+        result = process({"topic": "t", "web": [
+            {"title": "A post", "url": "https://blog.example.com/a", "snippet": "about t"},
+            {"title": "Reddit copy", "url": "https://www.reddit.com/r/a/comments/1/x/", "snippet": "skipped"},
+        ]})
+        self.assertEqual([item["url"] for item in result["report"]["web"]], ["https://blog.example.com/a"])
+        with self.assertRaises(service.ServiceError):
+            process({"topic": "t", "web": "not a list"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+"""Tests for sse module and streamed Responses API searches."""
+
+import json
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import budget, http, openai_reddit, sse, xai_x
+
+REDDIT_TEXT = json.dumps({"items": [
+    {"title": "First {braces} \"quoted\"", "url": "https://www.reddit.com/r/a/comments/a1/first/",
+     "subreddit": "a", "date": "2026-10-01", "why_relevant": "x", "relevance": 0.9},
+    {"title": "Not reddit", "url": "https://example.com/x", "relevance": 0.5},
+    {"title": "Second [list]", "url": "https://www.reddit.com/r/b/comments/b2/second/",
+     "subreddit": "b", "date": "2026-10-02", "why_relevant": "y", "relevance": 0.7},
+]})
+
+X_TEXT = json.dumps({"items": [
+    {"text": "post", "url": "https://x.com/u/status/1", "author_handle": "@u",
+     "date": "2026-10-03", "engagement": {"likes": 3}, "relevance": 0.8},
+]})
+
+
+def _final_response(text):
+    return {"output": [{"type": "message", "content": [{"type": "output_text", "text": text}]}]}
+
+
+class _SSEHandler(BaseHTTPRequestHandler):
+    """Stand-in for the Responses API: streams the output text in small deltas."""
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.payloads.append(payload)
+        if self.server.fail_first:
+            self.server.fail_first -= 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        text = X_TEXT if "x_search" in json.dumps(payload.get("tools")) else REDDIT_TEXT
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        self._event("response.created", {"type": "response.created"})
+        self.wfile.write(b": keep-alive\n\n")
+        for i in range(0, len(text), 7):
+            self._event("response.output_text.delta",
+                        {"type": "response.output_text.delta", "delta": text[i:i + 7]})
+        # The final event arrives well after the last item
+        time.sleep(self.server.tail_delay)
+        self._event("response.completed", {"type": "response.completed", "response": _final_response(text)})
+
+    def _event(self, name, data):
+        self.wfile.write(f"event: {name}\ndata: {json.dumps(data)}\n\n".encode())
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestIterEvents(unittest.TestCase):
+    def test_parses_events_comments_and_multiline_data(self):
+        lines = [b"event: a\n", b"data: 1\n", b"\n", b": comment\n", b"data: x\r\n", b"data: y\r\n", b"\r\n", b"data: z"]
+        self.assertEqual(list(sse.iter_events(lines)), [("a", "1"), ("message", "x\ny"), ("message", "z")])
+
+
+class TestItemStreamParser(unittest.TestCase):
+    def test_any_chunking_yields_same_items(self):
+        expected = json.loads(REDDIT_TEXT)["items"]
+        for size in (1, 2, 5, 13, len(REDDIT_TEXT)):
+            parser = sse.ItemStreamParser()
+            items = []
+            for i in range(0, len(REDDIT_TEXT), size):
+                items.extend(parser.feed(REDDIT_TEXT[i:i + size]))
+            self.assertEqual(items, expected, f"chunk size {size}")
+
+    def test_items_complete_before_text_ends(self):
+        parser = sse.ItemStreamParser()
+        first_end = REDDIT_TEXT.index("}, {") + 1
+        self.assertEqual(len(parser.feed(REDDIT_TEXT[:first_end])), 1)
+
+    def test_ignores_preamble_and_trailing_text(self):
+        parser = sse.ItemStreamParser()
+        items = parser.feed('Here you go: {"items": [{"a": 1}]} and [{"b": 2}]')
+        self.assertEqual(items, [{"a": 1}])
+        self.assertEqual(parser.feed('{"c": 3}'), [])
+
+
+class TestConsumeResponseStream(unittest.TestCase):
+    def test_returns_final_response(self):
+        lines = [
+            'data: {"type": "response.output_text.delta", "delta": "{\\"items\\": [{\\"a\\": 1}]}"}', "",
+            'data: {"type": "response.completed", "response": {"id": "r1"}}', "",
+        ]
+        seen = []
+        self.assertEqual(sse.consume_response_stream(lines, seen.append), {"id": "r1"})
+        self.assertEqual(seen, [{"a": 1}])
+
+    def tearDown(self):
+        budget.start(None)
+
+    def test_truncated_stream_raises(self):
+        lines = ['data: {"type": "response.output_text.delta", "delta": "{\\"items\\": []}"}', ""]
+        with self.assertRaises(http.HTTPError):
+            sse.consume_response_stream(lines, lambda item: None)
+
+    def test_failed_response_and_error_event_raise(self):
+        failed = ['data: {"type": "response.failed", "response": {"error": {"message": "server_error"}}}', ""]
+        with self.assertRaisesRegex(http.HTTPError, "server_error"):
+            sse.consume_response_stream(failed, lambda item: None)
+        error = ['event: error', 'data: {"type": "error", "error": {"message": "overloaded"}}', ""]
+        with self.assertRaisesRegex(http.HTTPError, "overloaded"):
+            sse.consume_response_stream(error, lambda item: None)
+
+    def test_incomplete_response_marks_run_partial(self):
+        lines = [
+            'data: {"type": "response.incomplete", "response": '
+            '{"id": "r1", "incomplete_details": {"reason": "max_output_tokens"}}}', "",
+        ]
+        response = sse.consume_response_stream(lines, lambda item: None)
+        self.assertEqual(response["id"], "r1")
+        self.assertEqual(budget.partial_reasons(), ["Streamed search response incomplete (max_output_tokens)"])
+
+
+class TestStreamedSearch(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _SSEHandler)
+        self.server.daemon_threads = True
+        self.server.payloads = []
+        self.server.tail_delay = 0.3
+        self.server.fail_first = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/responses"
+        http._breakers.clear()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_reddit_items_arrive_before_response_completes(self):
+        arrivals = []
+
+        def on_item(item):
+            arrivals.append((time.monotonic(), item))
+
+        with mock.patch.object(openai_reddit, "OPENAI_RESPONSES_URL", self.url):
+            raw = openai_reddit.search_reddit("key", "gpt-test", "topic", "2026-09-18", "2026-10-18",
+                                              on_item=on_item)
+        done = time.monotonic()
+
+        self.assertTrue(self.server.payloads[0]["stream"])
+        self.assertEqual([item for _, item in arrivals], openai_reddit.parse_reddit_response(raw))
+        self.assertEqual([item["id"] for _, item in arrivals], ["R1", "R3"])
+        self.assertLess(arrivals[0][0], done - 0.2)
+
+    def test_x_items_streamed(self):
+        seen = []
+        with mock.patch.object(xai_x, "XAI_RESPONSES_URL", self.url):
+            raw = xai_x.search_x("key", "grok-test", "topic", "2026-09-18", "2026-10-18", on_item=seen.append)
+        self.assertEqual(seen, xai_x.parse_x_response(raw))
+        self.assertEqual(seen[0]["author_handle"], "u")
+
+    def test_stream_open_retried_after_server_error(self):
+        self.server.tail_delay = 0
+        self.server.fail_first = 1
+        seen = []
+        with mock.patch.object(xai_x, "XAI_RESPONSES_URL", self.url), \
+                mock.patch.object(http, "_retry_sleep"):
+            xai_x.search_x("key", "grok-test", "topic", "2026-09-18", "2026-10-18", on_item=seen.append)
+        self.assertEqual(len(self.server.payloads), 2)
+        self.assertEqual(len(seen), 1)
+
+    def test_not_streamed_without_callback(self):
+        self.server.tail_delay = 0
+        with mock.patch.object(openai_reddit, "OPENAI_RESPONSES_URL", self.url):
+            with self.assertRaises(http.HTTPError):
+                # The SSE body is not JSON, so the plain request fails to parse
+                openai_reddit.search_reddit("key", "gpt-test", "topic", "2026-09-18", "2026-10-18")
+        self.assertNotIn("stream", self.server.payloads[0])
+
+
+if __name__ == "__main__":
+    unittest.main()